@@ -12,6 +12,15 @@ from backend.routers.match import router as matches_router
 from backend.routers.action import router as events_router
 from backend.routers.playtime import router as playtime_router
 from backend.routers.auth import router as auth_router
+from backend.routers.spectate import router as spectate_router
+from backend.routers.match_events import router as match_events_router
+from backend.routers.scoring import router as scoring_router
+from backend.routers.journal import router as journal_router
+from backend.routers.replay import router as replay_router
+from backend.routers.heatmap import router as heatmap_router
+from backend.routers.player_rates import router as player_rates_router
+from backend.routers.lineup import router as lineup_router
+from backend.routers.aggregate import router as aggregate_router
 
 # Import pages
 from frontend.pages.teams import teams_page
@@ -20,6 +29,8 @@ from frontend.pages.live import live_page
 from frontend.pages.analysis import analysis_page
 from frontend.pages.login import login_page
 from frontend.pages.home import home_page
+from frontend.pages.spectate import spectate_page
+from frontend.storage import install_sqlite_storage
 
 
 @asynccontextmanager
@@ -48,6 +59,15 @@ app.include_router(matches_router, prefix="/api/v1")
 app.include_router(events_router, prefix="/api/v1")
 app.include_router(playtime_router, prefix="/api/v1")
 app.include_router(auth_router, prefix="/api/v1")
+app.include_router(spectate_router, prefix="/api/v1")
+app.include_router(match_events_router, prefix="/api/v1")
+app.include_router(scoring_router, prefix="/api/v1")
+app.include_router(journal_router, prefix="/api/v1")
+app.include_router(replay_router, prefix="/api/v1")
+app.include_router(heatmap_router, prefix="/api/v1")
+app.include_router(player_rates_router, prefix="/api/v1")
+app.include_router(lineup_router, prefix="/api/v1")
+app.include_router(aggregate_router, prefix="/api/v1")
 
 # ------------------------------------------------------------
 # Register NiceGUI pages
@@ -58,6 +78,8 @@ def index():
 
 # Mount the NiceGUI app onto the FastAPI app
 storage_secret = os.getenv("KORFBALL_STORAGE_SECRET", "dev-storage-secret-change-me")
+if os.getenv("KORFBALL_USER_STORAGE", "file") == "sqlite":
+    install_sqlite_storage()
 ui.run_with(
     app=app,
     mount_path='/',
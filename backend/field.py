@@ -0,0 +1,58 @@
+"""
+Geometry of the korfball field drawn in korfball_field.svg.
+
+Action coordinates are stored in metres on the 40 x 20 m field: x along the length from the
+left end line, y across from the top side line. The playfield image reports clicks in its own
+units (the SVG viewBox); these helpers convert between both.
+"""
+from typing import Tuple
+
+import numpy as np
+
+FIELD_LENGTH = 40.0  # metres
+FIELD_WIDTH = 20.0
+
+# the field outline in the image: 1133.858 units for 40 m, its top left corner at this offset
+IMAGE_UNITS_PER_METRE = 28.3465
+IMAGE_OFFSET_X = 2.117046
+IMAGE_OFFSET_Y = 1.56539
+IMAGE_WIDTH = 1135.9751
+IMAGE_HEIGHT = 568.49438
+
+# post centres as drawn, in metres
+POSTS: Tuple[Tuple[float, float], ...] = ((6.784, 9.988), (33.075, 10.0))
+
+
+def image_to_field(x: float, y: float) -> Tuple[float, float]:
+    """Metres on the field for a point of the playfield image."""
+    return (
+        round((x - IMAGE_OFFSET_X) / IMAGE_UNITS_PER_METRE, 3),
+        round((y - IMAGE_OFFSET_Y) / IMAGE_UNITS_PER_METRE, 3),
+    )
+
+
+def field_to_image(x: float, y: float) -> Tuple[float, float]:
+    """Point of the playfield image for a position in metres."""
+    return x * IMAGE_UNITS_PER_METRE + IMAGE_OFFSET_X, y * IMAGE_UNITS_PER_METRE + IMAGE_OFFSET_Y
+
+
+_POSTS_X = np.array([post[0] for post in POSTS])
+_POSTS_Y = np.array([post[1] for post in POSTS])
+# shooting towards the field centre: away from the left end line for the left post, and back
+_FACING = np.sign(FIELD_LENGTH / 2 - _POSTS_X)
+
+
+def shot_geometry(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distance in metres and angle in degrees of each shot to its nearest post.
+
+    The angle is 0 straight in front of the post (on the centre side), 90 level with it and 180
+    straight behind it; left and right of the post are not told apart.
+    """
+    dx = x[:, None] - _POSTS_X
+    dy = y[:, None] - _POSTS_Y
+    distances = np.hypot(dx, dy)
+    nearest = distances.argmin(axis=1)
+    rows = np.arange(len(x))
+    angle = np.degrees(np.arctan2(np.abs(dy[rows, nearest]), _FACING[nearest] * dx[rows, nearest]))
+    return distances[rows, nearest], angle
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, DateTime, Integer, String, UniqueConstraint, ForeignKey, Enum, Table, Column, text
+from sqlalchemy import JSON, Boolean, DateTime, Integer, String, UniqueConstraint, ForeignKey, Enum, Table, Column, Index, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from typing import Optional, List
@@ -75,21 +75,30 @@ class Match(Base):
     is_finalized: Mapped[bool] = mapped_column(Boolean, default=False)
     locked_by_user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("user.id"), nullable=True)
     locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-
+    team_score: Mapped[int] = mapped_column(Integer, default=0)  # denormalized from action
+    opponent_score: Mapped[int] = mapped_column(Integer, default=0)  # denormalized from action
+    period_scores: Mapped[dict] = mapped_column(JSON, default=dict)  # {"1": {"team": 0, "opponent": 0}, ...}
+    shared_scoring: Mapped[bool] = mapped_column(Boolean, default=False)  # any signed-in scorer may write, no lock handshake
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")  # bumped by edits of the match details
 
     team: Mapped["Team"] = relationship("Team", back_populates="matches")
     locked_by: Mapped[Optional["User"]] = relationship("User")
 
+    __table_args__ = (
+        Index("ix_match_team_date", "team_id", "date"),
+    )
+
 
 class Action(Base):
     __tablename__ = "action"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
-    match_id: Mapped[int] = mapped_column(ForeignKey("match.id"))
+    match_id: Mapped[int] = mapped_column(ForeignKey("match.id"), index=True)
     player_id: Mapped[Optional[int]] = mapped_column(ForeignKey("player.id"), nullable=True)
     is_opponent: Mapped[bool] = mapped_column(Boolean, default=False)
     user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("user.id"), nullable=True)
+    client_id: Mapped[Optional[str]] = mapped_column(String, nullable=True, unique=True, index=True)  # client-generated UUID
 
     timestamp: Mapped[int] = mapped_column()
     x: Mapped[Optional[float]] = mapped_column(nullable=True)
@@ -97,11 +106,78 @@ class Action(Base):
     period: Mapped[int] = mapped_column()
     action: Mapped[ActionType] = mapped_column(Enum(ActionType))
     result: Mapped[bool] = mapped_column(Boolean, default=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
  
     match: Mapped["Match"] = relationship("Match")
     player: Mapped["Player"] = relationship("Player")
     user: Mapped[Optional["User"]] = relationship("User")
 
+    # every update is checked against the version it was read with and bumps it
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # covers the per-player, per-type counts of a set of matches without reading the rows
+        Index("ix_action_match_player_type", "match_id", "player_id", "action", "result", "is_opponent"),
+    )
+
+
+class ActionJournal(Base):
+    """Append-only log of action mutations; the action table is the projection of it."""
+    __tablename__ = "action_journal"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)  # global order of the mutations
+
+    match_id: Mapped[int] = mapped_column(ForeignKey("match.id"))
+    action_id: Mapped[int] = mapped_column(Integer)  # no foreign key: deleted actions stay in the journal
+    user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("user.id"), nullable=True)
+    op: Mapped[str] = mapped_column(String)  # create, update, delete, undo or redo
+    target_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # entry undone or redone
+    before: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # action row before, None when absent
+    after: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # action row after, None when deleted
+    # the user's undo stack: False = applied, True = undone and redoable, None = neither
+    undone: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index("ix_action_journal_stack", "match_id", "user_id", "undone", "id"),
+        Index("ix_action_journal_match", "match_id", "id"),
+    )
+
+
+class ActionSnapshot(Base):
+    """All action rows of a match as of one journal entry, so a rebuild replays only what followed."""
+    __tablename__ = "action_snapshot"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    match_id: Mapped[int] = mapped_column(ForeignKey("match.id"))
+    journal_id: Mapped[int] = mapped_column(Integer)  # last entry included; 0 for the baseline of older data
+    actions: Mapped[list] = mapped_column(JSON, default=list)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index("ix_action_snapshot_match", "match_id", "journal_id"),
+    )
+
+
+class LineupChange(Base):
+    """The players on the field from a moment of a match on, until the next change."""
+    __tablename__ = "lineup_change"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    match_id: Mapped[int] = mapped_column(ForeignKey("match.id"))
+    user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("user.id"), nullable=True)
+    client_id: Mapped[Optional[str]] = mapped_column(String, nullable=True, unique=True)  # client-generated UUID
+    period: Mapped[int] = mapped_column(Integer)
+    timestamp: Mapped[int] = mapped_column(Integer)  # clock seconds, like action timestamps
+    player_ids: Mapped[list] = mapped_column(JSON, default=list)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index("ix_lineup_change_match", "match_id", "period", "timestamp", "id"),
+    )
+
 
 class User(Base):
     __tablename__ = "user"
@@ -142,6 +218,13 @@ async def init_db():
         await _migrate_match_lock_columns(conn)
         await _migrate_match_current_period(conn)
         await _migrate_match_time_settings(conn)
+        await _migrate_match_score_columns(conn)
+        await _migrate_action_client_id(conn)
+        await _migrate_action_indexes(conn)
+        await _migrate_row_versions(conn)
+        await _migrate_match_shared_scoring(conn)
+        await _migrate_action_journal_baseline(conn)
+        await _migrate_action_coordinates_to_metres(conn)
 
 
 async def _migrate_action_coordinates_nullable(conn) -> None:
@@ -271,4 +354,122 @@ async def _migrate_match_time_settings(conn) -> None:
     if "period_minutes" not in columns:
         await conn.execute(text("ALTER TABLE match ADD COLUMN period_minutes INTEGER DEFAULT 25"))
     if "total_periods" not in columns:
-        await conn.execute(text("ALTER TABLE match ADD COLUMN total_periods INTEGER DEFAULT 2"))
\ No newline at end of file
+        await conn.execute(text("ALTER TABLE match ADD COLUMN total_periods INTEGER DEFAULT 2"))
+
+
+async def _migrate_match_score_columns(conn) -> None:
+    from .services.score_service import recompute_match_scores
+
+    result = await conn.execute(text("PRAGMA table_info(match)"))
+    columns = {row[1]: row for row in result.fetchall()}
+    if not columns:
+        return
+    added = False
+    if "team_score" not in columns:
+        await conn.execute(text("ALTER TABLE match ADD COLUMN team_score INTEGER DEFAULT 0"))
+        added = True
+    if "opponent_score" not in columns:
+        await conn.execute(text("ALTER TABLE match ADD COLUMN opponent_score INTEGER DEFAULT 0"))
+        added = True
+    if "period_scores" not in columns:
+        await conn.execute(text("ALTER TABLE match ADD COLUMN period_scores JSON DEFAULT '{}'"))
+        added = True
+    if added:
+        await recompute_match_scores(conn)
+
+
+async def _migrate_action_client_id(conn) -> None:
+    result = await conn.execute(text("PRAGMA table_info(action)"))
+    columns = {row[1]: row for row in result.fetchall()}
+    if not columns or "client_id" in columns:
+        return
+    await conn.execute(text("ALTER TABLE action ADD COLUMN client_id VARCHAR"))
+
+
+async def _migrate_action_indexes(conn) -> None:
+    await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_action_match_id ON action (match_id)"))
+    await conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_action_client_id ON action (client_id)"))
+    await conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_action_match_player_type ON action (match_id, player_id, action, result, is_opponent)"
+    ))
+    await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_match_team_date ON match (team_id, date)"))
+
+
+async def _migrate_row_versions(conn) -> None:
+    for table in ("action", "match"):
+        result = await conn.execute(text(f"PRAGMA table_info({table})"))
+        columns = {row[1]: row for row in result.fetchall()}
+        if columns and "version" not in columns:
+            await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+
+
+async def _migrate_match_shared_scoring(conn) -> None:
+    result = await conn.execute(text("PRAGMA table_info(match)"))
+    columns = {row[1]: row for row in result.fetchall()}
+    if not columns or "shared_scoring" in columns:
+        return
+    await conn.execute(text("ALTER TABLE match ADD COLUMN shared_scoring BOOLEAN DEFAULT 0"))
+
+
+async def _migrate_action_journal_baseline(conn) -> None:
+    """Snapshot the actions of matches that predate the journal, so a rebuild starts from them."""
+    from .services.action_journal import row_state
+
+    result = await conn.execute(text("""
+        SELECT DISTINCT match_id FROM action
+        WHERE match_id NOT IN (SELECT match_id FROM action_snapshot)
+          AND match_id NOT IN (SELECT match_id FROM action_journal)
+    """))
+    match_ids = [row[0] for row in result.fetchall()]
+    for match_id in match_ids:
+        rows = (await conn.execute(
+            Action.__table__.select().where(Action.__table__.c.match_id == match_id)
+        )).mappings().all()
+        await conn.execute(ActionSnapshot.__table__.insert().values(
+            match_id=match_id,
+            journal_id=0,
+            actions=[row_state(row) for row in rows],
+            created_at=datetime.now(timezone.utc),
+        ))
+
+
+async def _migrate_action_coordinates_to_metres(conn) -> None:
+    """Convert coordinates saved as playfield image units to metres, once."""
+    from .field import IMAGE_OFFSET_X, IMAGE_OFFSET_Y, IMAGE_UNITS_PER_METRE, image_to_field
+
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migration (name VARCHAR PRIMARY KEY, applied_at DATETIME)"
+    ))
+    name = "action_coordinates_in_metres"
+    done = await conn.execute(text("SELECT 1 FROM schema_migration WHERE name = :name"), {"name": name})
+    if done.first():
+        return
+
+    def convert(state):
+        if state and state.get("x") is not None and state.get("y") is not None:
+            state = dict(state)
+            state["x"], state["y"] = image_to_field(state["x"], state["y"])
+        return state
+
+    await conn.execute(
+        text("""
+            UPDATE action SET x = ROUND((x - :ox) / :scale, 3), y = ROUND((y - :oy) / :scale, 3)
+            WHERE x IS NOT NULL AND y IS NOT NULL
+        """),
+        {"ox": IMAGE_OFFSET_X, "oy": IMAGE_OFFSET_Y, "scale": IMAGE_UNITS_PER_METRE},
+    )
+
+    # keep the journal and its snapshots in the same unit, or a rebuild would bring pixels back
+    journal = ActionJournal.__table__
+    for entry in (await conn.execute(journal.select())).mappings().all():
+        await conn.execute(journal.update().where(journal.c.id == entry["id"]).values(
+            before=convert(entry["before"]), after=convert(entry["after"])))
+    snapshots = ActionSnapshot.__table__
+    for snapshot in (await conn.execute(snapshots.select())).mappings().all():
+        await conn.execute(snapshots.update().where(snapshots.c.id == snapshot["id"]).values(
+            actions=[convert(state) for state in snapshot["actions"] or []]))
+
+    await conn.execute(
+        text("INSERT INTO schema_migration (name, applied_at) VALUES (:name, :now)"),
+        {"name": name, "now": datetime.now(timezone.utc)},
+    )
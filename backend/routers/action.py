@@ -1,59 +1,81 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy import select, insert
 from sqlalchemy.orm import selectinload
 
-from typing import Union, List
+from typing import Optional, Union, List
 
 from backend.auth import get_current_user
 from backend.db import get_session
-from backend.schema import ActionRead, ActionCreate
+from backend.schema import ActionRead, ActionCreate, ActionBatchResult
 from backend.models import Action, Match, User
+from backend.services.action_service import action_event, create_action
 from backend.services.match_service import ensure_lock_owner, ensure_not_finalized
+from backend.services.score_service import apply_action_score
 from backend.services.action_events import notify
+from backend.services import action_journal
+from backend.services.concurrency import is_outdated, version_conflict
+from backend.services.idempotency import recent_actions
 
 
 router = APIRouter(prefix="/actions", tags=["Actions"], dependencies=[Depends(get_current_user)])
 
+MAX_BATCH_SIZE = 100
+
 
 @router.post("", response_model=ActionRead)
 async def add_action(
     action: ActionCreate,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
 ):
-    # Check if match exists and is not finalized
-    match = await session.get(Match, action.match_id)
-    if not match:
-        raise HTTPException(status_code=404, detail="Match not found")
-    
-    ensure_not_finalized(match, "Cannot add actions to a finalized match")
-    await ensure_lock_owner(session, match, user)
+    if action.client_id and idempotency_key and action.client_id != idempotency_key:
+        raise HTTPException(status_code=400, detail="Idempotency-Key does not match client_id")
 
-    action_payload = action.model_dump(exclude={"username"})
-    if action_payload.get("is_opponent"):
-        action_payload["player_id"] = None
-    action_payload["user_id"] = user.id
-    action = Action(**action_payload)
+    stored, replayed = await create_action(session, action, user, client_id=idempotency_key)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+        return stored
 
-    try:
-        session.add(action)
+    notify(stored.match_id, await action_event(session, "created", stored))
+    return stored
 
-        await session.commit()
-        await session.refresh(action)
 
-    except IntegrityError:
-        await session.rollback()
+@router.post("/batch", response_model=List[ActionBatchResult])
+async def add_actions_batch(
+    actions: List[ActionCreate],
+    session: AsyncSession = Depends(get_session),
+    user: User = Depends(get_current_user),
+):
+    """Store a batch of (possibly retried) actions, reporting the outcome per action."""
+    if len(actions) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_SIZE} actions per batch")
+
+    results = []
+    created = []
+    for action in actions:
+        try:
+            stored, replayed = await create_action(session, action, user)
+        except HTTPException as exc:
+            results.append(ActionBatchResult(client_id=action.client_id, status=exc.status_code, detail=str(exc.detail)))
+            continue
+        if not replayed:
+            created.append(stored)
+        results.append(ActionBatchResult(
+            client_id=action.client_id,
+            status=200,
+            replayed=replayed,
+            action=ActionRead.model_validate(stored),
+        ))
 
-        raise HTTPException(
-            status_code=400,
-            detail="Error creating new action in database"
-        )
-    
-    notify(action.match_id)
-    return action
+    for stored in created:
+        notify(stored.match_id, await action_event(session, "created", stored))
+    return results
 
 
 @router.get("/{action_id}", response_model=ActionRead)
@@ -65,6 +87,16 @@ async def read_action(action_id: int, session: AsyncSession = Depends(get_sessio
     return result.scalar_one_or_none()
 
 
+async def _action_conflict(session: AsyncSession, action_id: int) -> HTTPException:
+    """The 409 for an action that changed underneath an edit, carrying the row as stored now."""
+    current = (await session.execute(
+        select(Action).where(Action.id == action_id).execution_options(populate_existing=True)
+    )).scalar_one_or_none()
+    if current is None:
+        return HTTPException(status_code=404, detail="Action not found")
+    return version_conflict(ActionRead.model_validate(current).model_dump(mode="json"))
+
+
 @router.put("/{action_id}", response_model=ActionRead)
 async def edit_action(
     action_id: int,
@@ -80,21 +112,38 @@ async def edit_action(
     match = await session.get(Match, action.match_id)
     if match:
         ensure_not_finalized(match, "Cannot edit actions in a finalized match")
-        await ensure_lock_owner(session, match, user)
+        await ensure_lock_owner(session, match, user, allow_shared=True)
     
-    if match.locked_by_user_id and match.locked_by_user_id != user.id:
+    if match.locked_by_user_id and match.locked_by_user_id != user.id and not match.shared_scoring:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Match is locked by another user")
 
-    for key, value in action_update.model_dump().items():
-        if key == "user_id":
-            continue
-        if hasattr(action, key):
-            setattr(action, key, value)
+    if is_outdated(action_update.version, action.version):
+        raise version_conflict(ActionRead.model_validate(action).model_dump(mode="json"))
 
     try:
+        before = action_journal.row_state(action)
+        await apply_action_score(session, action, sign=-1)
+
+        for key, value in action_update.model_dump().items():
+            if key in ("user_id", "client_id", "version"):
+                continue
+            if hasattr(action, key):
+                setattr(action, key, value)
+
         session.add(action)
+        await apply_action_score(session, action)
+        await session.flush()
+        await action_journal.record(
+            session, "update", action.match_id, action.id, user, before, action_journal.row_state(action))
         await session.commit()
         await session.refresh(action)
+        if action.client_id:
+            # a late retry of the create answers with the edited row
+            recent_actions.put(action.client_id, ActionRead.model_validate(action))
+    except StaleDataError:
+        # another scorer saved this action between our read and our write
+        await session.rollback()
+        raise await _action_conflict(session, action_id)
     except IntegrityError:
         await session.rollback()
         raise HTTPException(
@@ -102,13 +151,14 @@ async def edit_action(
             detail="Error updating action"
         )
 
-    notify(action.match_id)
+    notify(action.match_id, await action_event(session, "updated", action))
     return action
 
 
 @router.delete("/{action_id}", status_code=204)
 async def remove_action(
     action_id: int,
+    version: Optional[int] = None,
     session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
 ):
@@ -120,13 +170,25 @@ async def remove_action(
     match = await session.get(Match, action.match_id)
     if match:
         ensure_not_finalized(match, "Cannot delete actions from a finalized match")
-        await ensure_lock_owner(session, match, user)
+        await ensure_lock_owner(session, match, user, allow_shared=True)
+
+    if is_outdated(version, action.version):
+        raise version_conflict(ActionRead.model_validate(action).model_dump(mode="json"))
 
     try:
+        before = action_journal.row_state(action)
         await session.delete(action)
+        await apply_action_score(session, action, sign=-1)
+        await session.flush()
+        await action_journal.record(session, "delete", action.match_id, action.id, user, before, None)
         await session.commit()
+        if action.client_id:
+            recent_actions.discard(action.client_id)
 
-        notify(action.match_id)
+        notify(action.match_id, await action_event(session, "deleted", action))
+    except StaleDataError:
+        await session.rollback()
+        raise await _action_conflict(session, action_id)
     except IntegrityError:
         await session.rollback()
 
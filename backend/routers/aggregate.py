@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import List, Optional
+
+from backend.auth import get_current_user
+from backend.db import get_session
+from backend.models import Team
+from backend.schema import AggregateStatsRead, MatchType
+from backend.services.aggregate_service import aggregate
+from backend.services.match_service import matches_query
+
+
+router = APIRouter(prefix="/stats", tags=["Statistics"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/aggregate", response_model=AggregateStatsRead)
+async def read_aggregate(
+    team_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    match_type: Optional[MatchType] = None,
+    location: Optional[str] = Query(None, description="Part of the location, any case"),
+    opponent: Optional[str] = Query(None, description="Part of the opponent name, any case"),
+    match_id: Optional[List[int]] = Query(None, description="Only these matches; repeat for several"),
+    session: AsyncSession = Depends(get_session),
+):
+    """Success/attempt totals per action type and per player over every match passing the filters."""
+    if team_id is not None and await session.get(Team, team_id) is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    query = matches_query(team_id, date_from, date_to, match_type, location, opponent, match_id)
+    return await aggregate(session, query)
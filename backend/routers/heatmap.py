@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import Optional
+
+from backend.auth import get_current_user
+from backend.db import get_session
+from backend.models import Match, Team
+from backend.schema import HeatmapRead, ShotZonesRead
+from backend.services.heatmap_service import match_heatmap, team_heatmap
+from backend.services.shot_zones import shot_zones, team_shot_zones
+
+
+router = APIRouter(tags=["Heatmaps"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/matches/{match_id}/heatmap", response_model=HeatmapRead)
+async def read_match_heatmap(
+    match_id: int,
+    player_id: Optional[int] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    """Made and missed shots of a match, or of one player in it, per field cell."""
+    if await session.get(Match, match_id) is None:
+        raise HTTPException(status_code=404, detail="Match not found")
+    return await match_heatmap(session, match_id, player_id)
+
+
+@router.get("/teams/{team_id}/heatmap", response_model=HeatmapRead)
+async def read_team_heatmap(
+    team_id: int,
+    player_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    """Shots of all matches of a team, optionally of one player or one season (date range)."""
+    if await session.get(Team, team_id) is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return await team_heatmap(session, team_id, player_id, date_from, date_to)
+
+
+@router.get("/matches/{match_id}/shot_zones", response_model=ShotZonesRead)
+async def read_match_shot_zones(match_id: int, session: AsyncSession = Depends(get_session)):
+    """Shot efficiency of a match by distance and angle to the nearest post, per player."""
+    if await session.get(Match, match_id) is None:
+        raise HTTPException(status_code=404, detail="Match not found")
+    return await shot_zones(session, [match_id])
+
+
+@router.get("/teams/{team_id}/shot_zones", response_model=ShotZonesRead)
+async def read_team_shot_zones(
+    team_id: int,
+    group: str = Query("player", pattern="^(player|match)$"),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    """Shot efficiency over a team's matches, e.g. of one season, per player or per match."""
+    if await session.get(Team, team_id) is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return await team_shot_zones(session, team_id, group, date_from, date_to)
@@ -0,0 +1,99 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import List, Optional
+
+from backend.auth import get_current_user
+from backend.db import get_session
+from backend.models import ActionJournal, User
+from backend.schema import ActionJournalRead, ActionRead, ActionUndoResult
+from backend.services import action_journal, heatmap_service, replay_service
+from backend.services.action_events import notify
+from backend.services.action_service import action_event
+from backend.services.idempotency import recent_actions
+from backend.services.match_service import ensure_lock_owner, ensure_not_finalized, get_match_or_404
+
+
+router = APIRouter(prefix="/matches", tags=["Journal"], dependencies=[Depends(get_current_user)])
+
+JOURNAL_PAGE_SIZE = 100
+
+
+async def _step(session: AsyncSession, match_id: int, user: User, step) -> ActionUndoResult:
+    match = await get_match_or_404(session, match_id)
+    ensure_not_finalized(match, "Cannot change actions of a finalized match")
+    await ensure_lock_owner(session, match, user)
+
+    try:
+        entry, action, event_type = await step(session, match_id, user)
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="Error applying the journal entry")
+
+    if action.client_id:
+        recent_actions.discard(action.client_id)
+    notify(match_id, await action_event(session, event_type, action))
+    return ActionUndoResult(entry=entry, action=ActionRead.model_validate(action), type=event_type)
+
+
+@router.post("/{match_id}/undo", response_model=ActionUndoResult)
+async def undo_action(
+    match_id: int,
+    session: AsyncSession = Depends(get_session),
+    user: User = Depends(get_current_user),
+):
+    """Revert the caller's latest action mutation in this match."""
+    return await _step(session, match_id, user, action_journal.undo)
+
+
+@router.post("/{match_id}/redo", response_model=ActionUndoResult)
+async def redo_action(
+    match_id: int,
+    session: AsyncSession = Depends(get_session),
+    user: User = Depends(get_current_user),
+):
+    """Apply again the caller's most recently undone mutation in this match."""
+    return await _step(session, match_id, user, action_journal.redo)
+
+
+@router.get("/{match_id}/journal", response_model=List[ActionJournalRead])
+async def read_journal(
+    match_id: int,
+    before_id: Optional[int] = None,
+    limit: int = JOURNAL_PAGE_SIZE,
+    session: AsyncSession = Depends(get_session),
+):
+    """Journal entries of a match, newest first; page with ``before_id``."""
+    query = select(ActionJournal).where(ActionJournal.match_id == match_id)
+    if before_id is not None:
+        query = query.where(ActionJournal.id < before_id)
+    query = query.order_by(ActionJournal.id.desc()).limit(max(1, min(limit, JOURNAL_PAGE_SIZE)))
+    return (await session.execute(query)).scalars().all()
+
+
+@router.post("/{match_id}/rebuild_actions", status_code=200)
+async def rebuild_actions(
+    match_id: int,
+    session: AsyncSession = Depends(get_session),
+    user: User = Depends(get_current_user),
+):
+    """Rewrite the action rows of a match from the journal."""
+    match = await get_match_or_404(session, match_id)
+    ensure_not_finalized(match, "Cannot change actions of a finalized match")
+    await ensure_lock_owner(session, match, user)
+    before, after = await action_journal.rebuild(session, match_id)
+    await session.commit()
+    replay_service.forget(match_id)
+    heatmap_service.forget(match_id)
+
+    for state in [*before.values(), *after.values()]:
+        if state["client_id"]:
+            recent_actions.discard(state["client_id"])
+    # open pages, streams and the shared match views follow the rows that changed
+    for event_type, state in action_journal.changes(before, after):
+        notify(match_id, await action_event(session, event_type, action_journal.as_action(state)))
+    return {"detail": "ok", "actions": len(after)}
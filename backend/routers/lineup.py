@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import List, Optional
+
+from backend.auth import get_current_user
+from backend.db import get_session
+from backend.models import LineupChange, Team, User
+from backend.schema import LineupChangeCreate, LineupChangeRead, PlusMinusRead
+from backend.services.lineup_service import (
+    COMBINATION_LIMIT,
+    DEFAULT_COMBINATION_SIZE,
+    plus_minus,
+    record_change,
+    team_plus_minus,
+)
+from backend.services.match_service import ensure_lock_owner, ensure_not_finalized, get_match_or_404
+
+
+router = APIRouter(tags=["Lineups"], dependencies=[Depends(get_current_user)])
+
+
+@router.post("/matches/{match_id}/lineup", response_model=LineupChangeRead)
+async def create_lineup_change(
+    match_id: int,
+    data: LineupChangeCreate,
+    session: AsyncSession = Depends(get_session),
+    user: User = Depends(get_current_user),
+):
+    """Register who is on the field from (period, timestamp) on; unchanged lineups are not stored again."""
+    match = await get_match_or_404(session, match_id)
+    ensure_not_finalized(match, "Cannot modify active players for a finalized match")
+    await ensure_lock_owner(session, match, user)
+    change, _ = await record_change(
+        session, match_id, user, data.period, data.timestamp, data.player_ids, data.client_id)
+    return change
+
+
+@router.get("/matches/{match_id}/lineup", response_model=List[LineupChangeRead])
+async def read_lineup_changes(match_id: int, session: AsyncSession = Depends(get_session)):
+    """All lineup changes of a match, in match time order."""
+    await get_match_or_404(session, match_id)
+    result = await session.execute(
+        select(LineupChange)
+        .where(LineupChange.match_id == match_id)
+        .order_by(LineupChange.period, LineupChange.timestamp, LineupChange.id)
+    )
+    return result.scalars().all()
+
+
+@router.get("/matches/{match_id}/plus_minus", response_model=PlusMinusRead)
+async def read_match_plus_minus(
+    match_id: int,
+    size: Optional[int] = Query(DEFAULT_COMBINATION_SIZE, ge=1, le=8, description="Players per combination"),
+    limit: int = Query(COMBINATION_LIMIT, ge=1, le=500),
+    session: AsyncSession = Depends(get_session),
+):
+    """Goals for and against while each player and each combination of players was on the field."""
+    await get_match_or_404(session, match_id)
+    return await plus_minus(session, [match_id], size, limit)
+
+
+@router.get("/teams/{team_id}/plus_minus", response_model=PlusMinusRead)
+async def read_team_plus_minus(
+    team_id: int,
+    size: Optional[int] = Query(DEFAULT_COMBINATION_SIZE, ge=1, le=8, description="Players per combination"),
+    limit: int = Query(COMBINATION_LIMIT, ge=1, le=500),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    """Plus/minus over a team's matches, e.g. of one season."""
+    if await session.get(Team, team_id) is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return await team_plus_minus(session, team_id, size, date_from, date_to, limit)
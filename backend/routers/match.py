@@ -4,14 +4,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, OperationalError
-from sqlalchemy import select, insert
+from sqlalchemy import select, insert, update
 from sqlalchemy.orm import selectinload
 
 from typing import Union, List
 
 from backend.auth import get_current_user
 from backend.db import get_session
-from backend.schema import MatchCreate, MatchRead, TeamCreate, TeamRead, TeamAssignPlayer, PlayerRead
+from backend.schema import MatchCreate, MatchRead, MatchUpdate, TeamCreate, TeamRead, TeamAssignPlayer, PlayerRead
 from backend.schema import ActionRead
 from backend.models import Match, Action, Team, User
 from backend.services.match_service import (
@@ -22,7 +22,9 @@ from backend.services.match_service import (
     transfer_lock_on_owner_exit,
     clear_stale_lock,
 )
-from backend.services.collaboration import add_collaborator, add_request, get_requests, pop_request, is_collaborator, list_collaborators
+from backend.services.score_service import recompute_match_scores
+from backend.services.collaboration import add_collaborator, add_request, get_requests, pop_request, is_collaborator, list_collaborators, remove_collaborator
+from backend.services.concurrency import is_outdated, version_conflict
 from backend.services.join_events import notify as notify_join
 from backend.services.join_decision_events import notify as notify_join_decision
 from backend.services.clock_events import notify as notify_clock
@@ -48,11 +50,7 @@ async def read_matches(with_team: bool = False, session: AsyncSession = Depends(
     return [MatchRead.model_validate(match) for match in matches]
 
 
-@router.get("/{match_id}", response_model=MatchRead)
-async def get_match(
-    match_id: int,
-    session: AsyncSession = Depends(get_session),
-):
+async def get_match_with_team(session: AsyncSession, match_id: int, populate_existing: bool = False) -> Match | None:
     stmt = (
         select(Match)
         .options(
@@ -60,9 +58,19 @@ async def get_match(
         )
         .where(Match.id == match_id)
     )
+    if populate_existing:
+        stmt = stmt.execution_options(populate_existing=True)
 
     result = await session.execute(stmt)
-    match = result.scalar_one_or_none()
+    return result.scalar_one_or_none()
+
+
+@router.get("/{match_id}", response_model=MatchRead)
+async def get_match(
+    match_id: int,
+    session: AsyncSession = Depends(get_session),
+):
+    match = await get_match_with_team(session, match_id)
 
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
@@ -92,8 +100,8 @@ async def create_match(data: MatchCreate, session: AsyncSession = Depends(get_se
 
 
 @router.put("/{match_id}", response_model=MatchRead)
-async def update_match(match_id: int, data: MatchCreate, session: AsyncSession = Depends(get_session)):
-    match = await session.get(Match, match_id)
+async def update_match(match_id: int, data: MatchUpdate, session: AsyncSession = Depends(get_session)):
+    match = await get_match_with_team(session, match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     
@@ -103,14 +111,32 @@ async def update_match(match_id: int, data: MatchCreate, session: AsyncSession =
             detail="Cannot update a finalized match"
         )
 
-    for key, value in data.model_dump().items():
-        setattr(match, key, value)
+    if is_outdated(data.version, match.version):
+        raise version_conflict(MatchRead.model_validate(match).model_dump(mode="json"))
+
+    exclude = {"version"}
+    if "shared_scoring" not in data.model_fields_set:
+        exclude.add("shared_scoring")  # older clients do not send the mode; keep it
+
+    # only write when nobody saved the match since it was read; lock, clock and score
+    # bookkeeping leave the version alone so they never conflict with an edit
+    stmt = (
+        update(Match)
+        .where(Match.id == match_id, Match.version == match.version)
+        .values(**data.model_dump(exclude=exclude), version=Match.version + 1)
+        .execution_options(synchronize_session=False)
+    )
 
     try:
-        session.add(match)
+        result = await session.execute(stmt)
+        if result.rowcount != 1:
+            await session.rollback()
+            current = await get_match_with_team(session, match_id, populate_existing=True)
+            if not current:
+                raise HTTPException(status_code=404, detail="Match not found")
+            raise version_conflict(MatchRead.model_validate(current).model_dump(mode="json"))
 
         await session.commit()
-        await session.refresh(match, attribute_names=["team"])
 
     except IntegrityError:
         await session.rollback()
@@ -120,7 +146,7 @@ async def update_match(match_id: int, data: MatchCreate, session: AsyncSession =
             detail="Error updating match in database"
         )
 
-    return match
+    return await get_match_with_team(session, match_id, populate_existing=True)
 
 
 @router.delete("/{match_id}", status_code=204)
@@ -236,6 +262,10 @@ async def lock_match(
     await clear_stale_lock(session, match)
 
     if match.locked_by_user_id and match.locked_by_user_id != user.id:
+        if match.shared_scoring:
+            # no join request: every scorer of a shared match writes next to the owner,
+            # who keeps the clock
+            add_collaborator(match_id, user.id)
         if is_collaborator(match_id, user.id):
             return {"detail": "collaborator"}
         return {"detail": "locked"}
@@ -274,6 +304,11 @@ async def unlock_match(
 
     await ensure_lock_owner(session, match, user)
 
+    if match.shared_scoring and match.locked_by_user_id != user.id:
+        # a scorer of a shared match leaving does not hand over the owner's lock
+        remove_collaborator(match_id, user.id)
+        return {"detail": "ok"}
+
     try:
         new_owner_id = await transfer_lock_on_owner_exit(session, match, user.id)
         await session.commit()
@@ -297,6 +332,22 @@ async def unlock_all_matches(
     return {"detail": "ok"}
 
 
+@router.post("/recompute_scores", status_code=200)
+async def recompute_all_scores(session: AsyncSession = Depends(get_session)):
+    totals = await recompute_match_scores(session)
+    await session.commit()
+    return {"detail": "ok", "matches": len(totals)}
+
+
+@router.post("/{match_id}/recompute_scores", response_model=MatchRead)
+async def recompute_scores(match_id: int, session: AsyncSession = Depends(get_session)):
+    match = await get_match_or_404(session, match_id)
+    await recompute_match_scores(session, [match_id])
+    await session.commit()
+    await session.refresh(match, attribute_names=["team", "team_score", "opponent_score", "period_scores"])
+    return match
+
+
 @router.get("/{match_id}/join_requests")
 async def list_join_requests(
     match_id: int,
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db import get_session
+from backend.services.match_service import get_match_or_404
+from backend.services.match_stream import event_messages, open_stream
+
+
+# public like the spectator snapshot: EventSource clients (scoreboards, overlays) cannot send a token
+router = APIRouter(prefix="/matches", tags=["Matches"])
+
+
+@router.get("/{match_id}/events")
+async def stream_match_events(
+    match_id: int,
+    last_event_id: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Server-Sent Events of a match: `action`, `clock`, `lineup` and `lock` events, plus a
+    `reset` event when missed events cannot be replayed. Reconnecting clients send
+    `Last-Event-ID` to receive what they missed; comment lines are sent as heartbeats.
+    """
+    await get_match_or_404(session, match_id)
+    await session.close()  # the stream can stay open for hours; don't hold on to a connection
+    return StreamingResponse(
+        event_messages(open_stream(match_id), last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import List, Optional
+
+from backend.auth import get_current_user
+from backend.db import get_session
+from backend.models import Match, Team
+from backend.schema import PlayerRates
+from backend.services.player_rates import player_rates, team_player_rates
+
+
+router = APIRouter(tags=["Player rates"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/matches/{match_id}/player_rates", response_model=List[PlayerRates])
+async def read_match_player_rates(match_id: int, session: AsyncSession = Depends(get_session)):
+    """Goals, attempts, rebounds, assists and steals of each player per 25 minutes played."""
+    if await session.get(Match, match_id) is None:
+        raise HTTPException(status_code=404, detail="Match not found")
+    return await player_rates(session, [match_id])
+
+
+@router.get("/teams/{team_id}/player_rates", response_model=List[PlayerRates])
+async def read_team_player_rates(
+    team_id: int,
+    match_id: Optional[List[int]] = Query(None, description="Only these matches of the team"),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    """Per-25-minute rates over a team's matches: all of them, a season or a chosen set."""
+    if await session.get(Team, team_id) is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return await team_player_rates(session, team_id, match_id, date_from, date_to)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.auth import get_current_user
+from backend.db import get_session
+from backend.schema import MatchStateAt
+from backend.services.replay_service import get_timeline
+
+
+router = APIRouter(prefix="/matches", tags=["Replay"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/{match_id}/state_at", response_model=MatchStateAt)
+async def read_state_at(
+    match_id: int,
+    period: int = Query(ge=1),
+    t: int = Query(ge=0, description="Clock seconds, as stored in the action timestamps"),
+    session: AsyncSession = Depends(get_session),
+):
+    """Score and running player stats after every action registered up to (period, t)."""
+    timeline = await get_timeline(session, match_id)
+    return timeline.state_at(period, t)
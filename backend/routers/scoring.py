@@ -0,0 +1,107 @@
+import asyncio
+import json
+from collections import OrderedDict
+from logging import getLogger
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+
+from backend.auth import user_from_token
+from backend.db import async_session_maker
+from backend.services.match_service import get_match_or_404
+from backend.services.match_stream import JSON, close_stream, open_stream, updates
+from backend.services.scoring_service import run_command
+
+logger = getLogger('uvicorn.error')
+
+# authentication happens in the first message, so the socket itself is not behind get_current_user
+router = APIRouter(prefix="/matches", tags=["Scoring"])
+
+AUTH_TIMEOUT_SECONDS = 10
+# acknowledgements kept per socket to answer retransmitted commands without running them again
+ACK_HISTORY = 100
+
+
+@router.websocket("/{match_id}/scoring")
+async def scoring_socket(websocket: WebSocket, match_id: int):
+    """
+    Scoring socket for entry devices.
+
+    The first message is `{"type": "auth", "token": ..., "last_event_id": ...}`. After that the
+    device sends commands `{"seq": n, "type": "action" | "substitution" | "clock", ...}` and
+    receives `{"type": "ack", "seq": n, "status": ...}` for each, interleaved with the match
+    events `{"type": "event", "id": ..., "event": ..., "data": ...}` of the SSE stream.
+    """
+    await websocket.accept()
+    try:
+        hello = await asyncio.wait_for(websocket.receive_json(), AUTH_TIMEOUT_SECONDS)
+    except (asyncio.TimeoutError, ValueError, WebSocketDisconnect):
+        await websocket.close(code=4401, reason="Authenticate first")
+        return
+    if not isinstance(hello, dict) or hello.get("type") != "auth":
+        await websocket.close(code=4401, reason="Authenticate first")
+        return
+    async with async_session_maker() as session:
+        try:
+            user = await user_from_token(session, str(hello.get("token") or ""))
+            await get_match_or_404(session, match_id)
+        except HTTPException as exc:
+            await websocket.close(code=4000 + exc.status_code, reason=str(exc.detail))
+            return
+
+    stream = open_stream(match_id)
+    send_lock = asyncio.Lock()
+    acks: OrderedDict = OrderedDict()
+
+    async def send(text: str) -> None:
+        async with send_lock:
+            await websocket.send_text(text)
+
+    async def forward_events(cursor: int) -> None:
+        async for messages in updates(stream, cursor, JSON):
+            for message in messages:
+                await send(message)
+
+    async def execute(command: dict) -> dict:
+        seq = command.get("seq")
+        async with async_session_maker() as session:
+            try:
+                result = await run_command(session, user, match_id, command)
+            except HTTPException as exc:
+                return {"type": "ack", "seq": seq, "status": exc.status_code, "detail": exc.detail}
+            except Exception:
+                logger.exception(f"Scoring command failed for match {match_id}")
+                return {"type": "ack", "seq": seq, "status": 500, "detail": "Internal error"}
+        return {"type": "ack", "seq": seq, "status": 200, **result}
+
+    cursor = stream.resume_cursor(hello.get("last_event_id"))
+    forwarder = None
+    try:
+        await send(json.dumps({"type": "ready", "match_id": match_id, "username": user.username}))
+        if cursor is None:
+            await send(stream.reset_event(JSON))
+            cursor = stream.seq
+        forwarder = asyncio.create_task(forward_events(cursor))
+        while True:
+            try:
+                command = await websocket.receive_json()
+            except ValueError:
+                await send(json.dumps({"type": "ack", "seq": None, "status": 400, "detail": "Invalid JSON"}))
+                continue
+            if not isinstance(command, dict) or not isinstance(command.get("seq"), int):
+                await send(json.dumps({"type": "ack", "seq": None, "status": 400, "detail": "Commands need an integer seq"}))
+                continue
+            seq = command["seq"]
+            if seq in acks:
+                await send(json.dumps({**acks[seq], "duplicate": True}))
+                continue
+            ack = await execute(command)
+            acks[seq] = ack
+            if len(acks) > ACK_HISTORY:
+                acks.popitem(last=False)
+            await send(json.dumps(ack))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if forwarder is not None:
+            forwarder.cancel()
+        close_stream(stream)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db import get_session
+from backend.schema import SpectatorSnapshot
+from backend.services.spectator_service import get_snapshot
+
+
+# public on purpose: spectators follow a match without an account
+router = APIRouter(prefix="/spectate", tags=["Spectate"])
+
+
+@router.get("/{match_id}", response_model=SpectatorSnapshot)
+async def read_snapshot(match_id: int, session: AsyncSession = Depends(get_session)):
+    return await get_snapshot(session, match_id)
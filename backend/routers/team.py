@@ -1,17 +1,20 @@
+import json
+
 from fastapi import APIRouter, Depends, HTTPException
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select, insert
+from sqlalchemy import case, func, select, insert
 from sqlalchemy.orm import selectinload
 
 from typing import Union, List
 
 from backend.auth import get_current_user
 from backend.db import get_session
-from backend.schema import TeamCreate, TeamRead, TeamAssignPlayer, PlayerRead, MatchRead
+from backend.schema import TeamCreate, TeamRead, TeamAssignPlayer, PlayerRead, MatchRead, MatchSummary
 
-from backend.models import Team, Player, team_player_link, Match
+from backend.models import Team, Player, team_player_link, Match, Action, User
+from backend.services.score_service import GOAL_ACTIONS, efficiency
 from backend.schema import TeamRead, TeamReadWithPlayers
 
 from logging import getLogger
@@ -69,6 +72,59 @@ async def read_team_matches(team_id: int, session: AsyncSession = Depends(get_se
     return [MatchRead.model_validate(match) for match in matches]
 
 
+@router.get("/{team_id}/matches/summary", response_model=List[MatchSummary])
+async def read_team_match_summaries(team_id: int, session: AsyncSession = Depends(get_session)):
+
+    team = await session.get(Team, team_id)
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+
+    is_attempt = (Action.is_opponent.isnot(True)) & (Action.action.in_(GOAL_ACTIONS))
+    query = (
+        select(
+            Match,
+            func.count(Action.id),
+            func.sum(case((is_attempt, 1), else_=0)),
+            func.sum(case((is_attempt & Action.result.is_(True), 1), else_=0)),
+            # a JSON array keeps usernames intact, group_concat would split them on a comma
+            func.json_group_array(User.username.distinct()),
+        )
+        .outerjoin(Action, Action.match_id == Match.id)
+        .outerjoin(User, User.id == Action.user_id)
+        .where(Match.team_id == team_id)
+        .group_by(Match.id)
+        .order_by(Match.date)
+    )
+
+    result = await session.execute(query)
+
+    summaries = []
+    for match, n_actions, attempts, goals, usernames in result.all():
+        attempts = attempts or 0
+        goals = goals or 0
+        summaries.append(MatchSummary(
+            id=match.id,
+            team_id=match.team_id,
+            date=match.date,
+            opponent_name=match.opponent_name,
+            location=match.location,
+            match_type=match.match_type,
+            team_score=match.team_score or 0,
+            opponent_score=match.opponent_score or 0,
+            action_count=n_actions,
+            attempts=attempts,
+            goals=goals,
+            efficiency=efficiency(goals, attempts),
+            minutes_registered=round((match.time_registered_s or 0) / 60, 1),
+            is_finalized=match.is_finalized,
+            usernames=sorted(name for name in json.loads(usernames) if name is not None),
+            shared_scoring=bool(match.shared_scoring),
+            version=match.version or 1,
+        ))
+
+    return summaries
+
+
 @router.post("", response_model=TeamRead)
 async def create_team(data: TeamCreate, session: AsyncSession = Depends(get_session)):
 
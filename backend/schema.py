@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field
 
 from enum import Enum
@@ -74,9 +74,19 @@ class MatchCreate(BaseModel):
     match_type: Optional[MatchType] = MatchType.NORMAL
     period_minutes: Optional[int] = 25
     total_periods: Optional[int] = 2
+    shared_scoring: Optional[bool] = False  # every scorer writes directly instead of joining the lock owner
     # match time and finalized should not be set at creation
 
 
+class MatchUpdate(MatchCreate):
+    version: Optional[int] = None  # the version that was edited; a newer one on the server gives 409
+
+
+class PeriodScore(BaseModel):
+    team: int = 0
+    opponent: int = 0
+
+
 class MatchRead(BaseModel):
     id: int
     team: TeamRead
@@ -91,36 +101,159 @@ class MatchRead(BaseModel):
     is_finalized: bool
     locked_by_user_id: Optional[int] = None
     locked_at: Optional[datetime] = None
+    team_score: int = 0
+    opponent_score: int = 0
+    period_scores: Dict[int, PeriodScore] = Field(default_factory=dict)
+    shared_scoring: bool = False
+    version: int = 1
 
     model_config = {
         "from_attributes": True
     }
 
+class MatchSummary(BaseModel):
+    id: int
+    team_id: int
+    date: datetime
+    opponent_name: Optional[str] = None
+    location: Optional[str] = None
+    match_type: Optional[MatchType] = MatchType.NORMAL
+    team_score: int = 0
+    opponent_score: int = 0
+    action_count: int = 0
+    attempts: int = 0
+    goals: int = 0
+    efficiency: Optional[float] = None  # percentage of attempts that scored
+    minutes_registered: float = 0
+    is_finalized: bool = False
+    usernames: List[str] = Field(default_factory=list)  # users that registered actions
+    shared_scoring: bool = False
+    version: int = 1
+
 # -- Event models
 class Action(BaseModel):
     match_id: int
     player_id: Optional[int] = None
 
     timestamp: int
-    x: Optional[float] = None
-    y: Optional[float] = None
+    x: Optional[float] = None  # metres from the left end line
+    y: Optional[float] = None  # metres from the top side line
     period: int
     action: ActionType
     result: Optional[bool] = False
     user_id: Optional[int] = None
     is_opponent: bool = False
     username: Optional[str] = None
+    client_id: Optional[str] = None  # client-generated id, makes submission idempotent
 
 class ActionCreate(Action):
-    pass
+    version: Optional[int] = None  # on edits: the version that was edited; a newer one on the server gives 409
 
 class ActionRead(Action):
     id: int
+    version: int = 1
+
+    model_config = {
+        "from_attributes": True
+    }
+
+class ActionJournalRead(BaseModel):
+    id: int
+    match_id: int
+    action_id: int
+    user_id: Optional[int] = None
+    op: str  # create, update, delete, undo or redo
+    target_id: Optional[int] = None
+    before: Optional[Dict] = None
+    after: Optional[Dict] = None
+    undone: Optional[bool] = None
+    created_at: datetime
 
     model_config = {
         "from_attributes": True
     }
 
+class ActionUndoResult(BaseModel):
+    entry: ActionJournalRead
+    action: ActionRead
+    type: str  # the action event it caused: created, updated or deleted
+
+class ReplayActionStats(BaseModel):
+    success: int = 0
+    attempts: int = 0
+
+class ReplayPlayerStats(BaseModel):
+    player_id: int
+    goals: int = 0
+    attempts: int = 0  # attempts of the goal actions
+    actions: Dict[str, ReplayActionStats] = Field(default_factory=dict)
+
+class ReplayAction(BaseModel):
+    id: int
+    period: int
+    timestamp: int
+    player_id: Optional[int] = None
+    action: ActionType
+    result: Optional[bool] = False
+    is_opponent: bool = False
+    x: Optional[float] = None
+    y: Optional[float] = None
+
+class MatchStateAt(BaseModel):
+    match_id: int
+    period: int
+    t: int
+    position: int  # actions registered up to this moment
+    total_actions: int
+    last_period: Optional[int] = None  # moment of the last action of the match
+    last_t: Optional[int] = None
+    team_score: int = 0
+    opponent_score: int = 0
+    players: List[ReplayPlayerStats] = Field(default_factory=list)
+    recent_actions: List[ReplayAction] = Field(default_factory=list)  # newest first
+    lineup: List[int] = Field(default_factory=list)  # player ids on the field at this moment
+
+class HeatmapRead(BaseModel):
+    bins_x: int
+    bins_y: int
+    width: float  # field size in metres
+    height: float
+    matches: int
+    made_total: int = 0
+    missed_total: int = 0
+    made: List[List[int]]  # bins_y rows of bins_x shot counts
+    missed: List[List[int]]
+
+class ShotZoneCell(BaseModel):
+    label: str
+    made: int = 0
+    attempts: int = 0
+    efficiency: Optional[float] = None  # percentage of attempts that scored
+
+class ShotZoneGroup(BaseModel):
+    key: Optional[int] = None  # player or match id, depending on the grouping
+    made: int = 0
+    attempts: int = 0
+    efficiency: Optional[float] = None
+    mean_distance: Optional[float] = None  # metres to the nearest post
+    rings: List[ShotZoneCell]  # by distance to the nearest post
+    sectors: List[ShotZoneCell]  # by angle to it: front, side, behind
+
+class ShotZonesRead(BaseModel):
+    group: str  # "player" or "match"
+    matches: int
+    rings: List[str]
+    sectors: List[str]
+    team: ShotZoneGroup
+    groups: List[ShotZoneGroup]
+
+class ActionBatchResult(BaseModel):
+    client_id: Optional[str] = None
+    status: int  # HTTP status this action would have received on its own
+    replayed: bool = False
+    action: Optional[ActionRead] = None
+    detail: Optional[str] = None
+
 class PlayerPlaytime(BaseModel):
     player_id: int
     player: PlayerRead
@@ -136,6 +269,88 @@ class PlaytimeForMatch(BaseModel):
     match_time_registered_s: int
     player_playtimes: List[PlayerPlaytime] = Field(default_factory=list)
 
+class LineupChangeCreate(BaseModel):
+    period: int = Field(ge=1)
+    timestamp: int = Field(ge=0)  # clock seconds, like action timestamps
+    player_ids: List[int]
+    client_id: Optional[str] = None  # makes re-sending after an unknown outcome safe
+
+class LineupChangeRead(LineupChangeCreate):
+    id: int
+    match_id: int
+    user_id: Optional[int] = None
+
+    model_config = {
+        "from_attributes": True
+    }
+
+class OnFieldStats(BaseModel):
+    seconds: int = 0  # time on the field (together)
+    goals_for: int = 0
+    goals_against: int = 0
+    plus_minus: int = 0
+    attempts: int = 0
+    efficiency: Optional[float] = None  # percentage of the team's attempts that scored
+
+class PlayerPlusMinus(OnFieldStats):
+    player_id: int
+
+class LineupCombination(OnFieldStats):
+    player_ids: List[int]
+
+class PlusMinusRead(BaseModel):
+    matches: int
+    size: Optional[int] = None  # players per combination; None for whole lineups
+    players: List[PlayerPlusMinus] = Field(default_factory=list)
+    combinations: List[LineupCombination] = Field(default_factory=list)
+    # goals scored before the first registered lineup of a match
+    unattributed_for: int = 0
+    unattributed_against: int = 0
+
+class PlayerStatTotals(BaseModel):
+    goals: int = 0
+    attempts: int = 0
+    rebounds: int = 0
+    assists: int = 0
+    steals: int = 0
+
+class PlayerStatRates(BaseModel):
+    goals: Optional[float] = None
+    attempts: Optional[float] = None
+    rebounds: Optional[float] = None
+    assists: Optional[float] = None
+    steals: Optional[float] = None
+
+class PlayerRates(BaseModel):
+    player_id: int
+    matches: int  # matches with registered playtime
+    minutes_played: float
+    efficiency: Optional[float] = None  # percentage of attempts that scored
+    totals: PlayerStatTotals
+    per_25: PlayerStatRates  # per 25 minutes played
+
+class ActionTotals(BaseModel):
+    action: ActionType
+    success: int
+    attempts: int
+    efficiency: Optional[float] = None
+
+class PlayerAggregate(BaseModel):
+    player_id: int
+    goals: int
+    attempts: int
+    efficiency: Optional[float] = None
+    actions: List[ActionTotals]
+
+class AggregateStatsRead(BaseModel):
+    matches: int
+    goals: int
+    attempts: int
+    efficiency: Optional[float] = None
+    opponent_goals: int
+    actions: List[ActionTotals]
+    players: List[PlayerAggregate]
+
 class TimeUpdate(BaseModel):
     match_time_registered_s: int
     player_time_registered_s: dict[int, int]  # player_id -> time_played
@@ -167,4 +382,40 @@ class Token(BaseModel):
 
 class ChangePassword(BaseModel):
     current_password: str
-    new_password: str
\ No newline at end of file
+    new_password: str
+
+# -- Spectator models
+class SpectatorAction(BaseModel):
+    id: int
+    period: int
+    timestamp: int
+    action: ActionType
+    result: bool = False
+    is_opponent: bool = False
+    player: Optional[str] = None
+
+
+class SpectatorPlayer(BaseModel):
+    id: int
+    name: str
+
+
+class SpectatorClock(BaseModel):
+    clock_running: bool = False
+    remaining_seconds: Optional[int] = None
+    period: int = 1
+    period_minutes: int = 25
+    total_periods: int = 2
+
+
+class SpectatorSnapshot(BaseModel):
+    match_id: int
+    version: int
+    team_name: str
+    opponent_name: Optional[str] = None
+    team_score: int = 0
+    opponent_score: int = 0
+    is_finalized: bool = False
+    clock: SpectatorClock
+    lineup: List[SpectatorPlayer] = Field(default_factory=list)
+    recent_actions: List[SpectatorAction] = Field(default_factory=list)
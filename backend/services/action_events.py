@@ -3,12 +3,22 @@ from typing import Callable, Dict, List, Tuple
 
 from nicegui.client import Client
 
+from backend.services.listeners import call_listeners
 
-Subscriber = Tuple[Client, Callable[[], None]]
+
+Subscriber = Tuple[Client, Callable[[dict], None]]
 _subscribers: Dict[int, List[Subscriber]] = defaultdict(list)
 
+# process-wide listeners that see every match, e.g. the shared match views
+Listener = Callable[[int, dict], None]
+_listeners: List[Listener] = []
+
+
+def add_listener(listener: Listener) -> None:
+    _listeners.append(listener)
+
 
-def subscribe(match_id: int, client: Client, callback: Callable[[], None]) -> None:
+def subscribe(match_id: int, client: Client, callback: Callable[[dict], None]) -> None:
     _subscribers[match_id].append((client, callback))
 
 
@@ -22,6 +32,8 @@ def unsubscribe(match_id: int, client: Client) -> None:
         _subscribers.pop(match_id, None)
 
 
-def notify(match_id: int) -> None:
+def notify(match_id: int, payload: dict) -> None:
+    """Publish a change; payload is {"type": "created" | "updated" | "deleted", "action": {...}, "score": {...}}."""
+    call_listeners(_listeners, match_id, payload)
     for client, callback in list(_subscribers.get(match_id, [])):
-        client.safe_invoke(callback)
+        client.safe_invoke(lambda: callback(payload))
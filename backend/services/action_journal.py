@@ -0,0 +1,280 @@
+import os
+from collections.abc import Mapping
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Action, ActionJournal, ActionSnapshot, User
+from backend.schema import ActionType
+from backend.services.concurrency import version_conflict
+from backend.services.score_service import apply_action_score, recompute_match_scores
+
+# a snapshot of a match's actions is stored once this many journal entries followed the last one
+SNAPSHOT_INTERVAL = int(os.getenv("KORFBALL_JOURNAL_SNAPSHOT_INTERVAL", "200"))
+
+STATE_COLUMNS = (
+    "id", "match_id", "player_id", "is_opponent", "user_id", "client_id",
+    "timestamp", "x", "y", "period", "action", "result", "version",
+)
+MUTATIONS = ("create", "update", "delete")
+
+
+def row_state(row) -> dict:
+    """JSON-ready copy of an action row, from an ORM object or a core result mapping."""
+    state = {}
+    for column in STATE_COLUMNS:
+        value = row[column] if isinstance(row, Mapping) else getattr(row, column)
+        state[column] = getattr(value, "value", value)
+    return state
+
+
+def _columns(state: dict) -> dict:
+    """Column values of a stored state, with the action type back as an enum."""
+    return {**state, "action": ActionType(state["action"])}
+
+
+def as_action(state: dict) -> Action:
+    """Unsaved action carrying a stored state, e.g. to publish a row that no longer exists."""
+    return Action(**_columns(state))
+
+
+def _versions_match(action: Optional[Action], state: Optional[dict]) -> bool:
+    if action is None or state is None:
+        return action is None and state is None
+    return action.version == state.get("version")
+
+
+def _same_content(state: Optional[dict], other: Optional[dict]) -> bool:
+    """Equal states apart from the version, which every undo and redo bumps."""
+    if state is None or other is None:
+        return state is None and other is None
+    return {**state, "version": None} == {**other, "version": None}
+
+
+async def _journal_state(session: AsyncSession, match_id: int, action_id: int) -> Optional[dict]:
+    """The state the latest journal entry of an action left it in."""
+    return (await session.execute(
+        select(ActionJournal.after)
+        .where(ActionJournal.match_id == match_id, ActionJournal.action_id == action_id)
+        .order_by(ActionJournal.id.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+
+
+async def was_created(session: AsyncSession, match_id: int, client_id: str) -> bool:
+    """Whether an action with this client id was ever stored in the match, e.g. before it was deleted."""
+    return (await session.execute(
+        select(ActionJournal.id)
+        .where(
+            ActionJournal.match_id == match_id,
+            ActionJournal.op == "create",
+            func.json_extract(ActionJournal.after, "$.client_id") == client_id,
+        )
+        .limit(1)
+    )).first() is not None
+
+
+async def record(
+    session: AsyncSession,
+    op: str,
+    match_id: int,
+    action_id: int,
+    user: Optional[User],
+    before: Optional[dict],
+    after: Optional[dict],
+    target_id: Optional[int] = None,
+) -> ActionJournal:
+    """Append a journal entry for a mutation already applied (and flushed) in ``session``."""
+    user_id = user.id if user else None
+    if op in MUTATIONS:
+        # a new mutation ends what this user could still redo, as in any editor
+        await session.execute(
+            update(ActionJournal)
+            .where(ActionJournal.match_id == match_id, ActionJournal.user_id == user_id,
+                   ActionJournal.undone.is_(True))
+            .values(undone=None)
+            .execution_options(synchronize_session=False)
+        )
+    entry = ActionJournal(
+        match_id=match_id,
+        action_id=action_id,
+        user_id=user_id,
+        op=op,
+        target_id=target_id,
+        before=before,
+        after=after,
+        undone=False if op in MUTATIONS else None,
+    )
+    session.add(entry)
+    await session.flush()
+    await _snapshot_if_due(session, entry)
+    return entry
+
+
+async def _snapshot_if_due(session: AsyncSession, entry: ActionJournal) -> None:
+    last = (await session.execute(
+        select(ActionSnapshot.journal_id)
+        .where(ActionSnapshot.match_id == entry.match_id)
+        .order_by(ActionSnapshot.journal_id.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+    if last is not None and entry.id - last < SNAPSHOT_INTERVAL:
+        return
+    if last is None:
+        # the first entry of a match: replaying from zero is as cheap as a snapshot
+        first = (await session.execute(
+            select(ActionJournal.id)
+            .where(ActionJournal.match_id == entry.match_id)
+            .order_by(ActionJournal.id)
+            .limit(1)
+        )).scalar_one()
+        if entry.id - first + 1 < SNAPSHOT_INTERVAL:
+            return
+    rows = (await session.execute(
+        select(Action).where(Action.match_id == entry.match_id)
+    )).scalars().all()
+    session.add(ActionSnapshot(
+        match_id=entry.match_id,
+        journal_id=entry.id,
+        actions=[row_state(row) for row in rows],
+    ))
+
+
+async def _set_state(session: AsyncSession, action_id: int, state: Optional[dict]) -> Optional[Action]:
+    """Make the action row match ``state`` (None deletes it), keeping the match score in step."""
+    action = await session.get(Action, action_id)
+    if action is not None:
+        await apply_action_score(session, action, sign=-1)
+    if state is None:
+        if action is not None:
+            await session.delete(action)
+        return None
+    fields = {key: value for key, value in _columns(state).items() if key not in ("id", "version")}
+    if action is None:
+        action = Action(id=action_id, **fields)
+        session.add(action)
+    else:
+        for key, value in fields.items():
+            setattr(action, key, value)
+    await session.flush()
+    await apply_action_score(session, action)
+    return action
+
+
+async def _apply(
+    session: AsyncSession,
+    user: User,
+    target: ActionJournal,
+    op: str,
+    expected: Optional[dict],
+    state: Optional[dict],
+) -> tuple[ActionJournal, Action, str]:
+    current = await session.get(Action, target.action_id)
+    # the row must be as the journal last left it (undos and redos of later entries included, with
+    # their version bumps), and that must be the state ``target`` expects; otherwise someone else
+    # changed the action since and applying the old state would overwrite that
+    journal_state = await _journal_state(session, target.match_id, target.action_id)
+    if not (_versions_match(current, journal_state) and _same_content(journal_state, expected)):
+        raise version_conflict(
+            row_state(current) if current is not None else None,
+            f"The action changed since, cannot {op} this change",
+        )
+    before = row_state(current) if current is not None else None
+    action = await _set_state(session, target.action_id, state)
+    target.undone = op == "undo"
+    entry = await record(
+        session, op, target.match_id, target.action_id, user,
+        before, row_state(action) if action is not None else None, target_id=target.id,
+    )
+    if action is None:
+        # the deleted row: keep its last state for the action event
+        action = Action(**_columns(before))
+        event_type = "deleted"
+    else:
+        event_type = "created" if before is None else "updated"
+    return entry, action, event_type
+
+
+async def undo(session: AsyncSession, match_id: int, user: User) -> tuple[ActionJournal, Action, str]:
+    """Revert the user's latest applied mutation in a match; the caller commits."""
+    target = (await session.execute(
+        select(ActionJournal)
+        .where(ActionJournal.match_id == match_id, ActionJournal.user_id == user.id,
+               ActionJournal.undone.is_(False))
+        .order_by(ActionJournal.id.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+    if target is None:
+        raise HTTPException(status_code=404, detail="Nothing to undo")
+    return await _apply(session, user, target, "undo", target.after, target.before)
+
+
+async def redo(session: AsyncSession, match_id: int, user: User) -> tuple[ActionJournal, Action, str]:
+    """Apply again the user's most recently undone mutation; the caller commits."""
+    # undo walks back from the newest entry, so the last one undone is the oldest still undone
+    target = (await session.execute(
+        select(ActionJournal)
+        .where(ActionJournal.match_id == match_id, ActionJournal.user_id == user.id,
+               ActionJournal.undone.is_(True))
+        .order_by(ActionJournal.id)
+        .limit(1)
+    )).scalar_one_or_none()
+    if target is None:
+        raise HTTPException(status_code=404, detail="Nothing to redo")
+    return await _apply(session, user, target, "redo", target.before, target.after)
+
+
+def replay(states: dict[int, dict], entries) -> dict[int, dict]:
+    """Apply journal entries, oldest first, to action states keyed by id."""
+    for entry in entries:
+        if entry.after is None:
+            states.pop(entry.action_id, None)
+        else:
+            states[entry.action_id] = entry.after
+    return states
+
+
+def changes(before: dict[int, dict], after: dict[int, dict]) -> list[tuple[str, dict]]:
+    """Action events that take the ``before`` rows of a match to the ``after`` rows, as (type, row state)."""
+    events = [("deleted", state) for action_id, state in before.items() if action_id not in after]
+    for action_id, state in after.items():
+        if action_id not in before:
+            events.append(("created", state))
+        elif state != before[action_id]:
+            events.append(("updated", state))
+    return events
+
+
+async def rebuild(session: AsyncSession, match_id: int) -> tuple[dict[int, dict], dict[int, dict]]:
+    """
+    Rewrite the action rows of a match from its latest snapshot and the entries after it.
+
+    Returns the row states per action id before and after the rewrite.
+    """
+    current = {
+        row["id"]: row_state(row)
+        for row in (await session.execute(select(Action.__table__).where(Action.match_id == match_id))).mappings()
+    }
+    snapshot = (await session.execute(
+        select(ActionSnapshot)
+        .where(ActionSnapshot.match_id == match_id)
+        .order_by(ActionSnapshot.journal_id.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+    states = {state["id"]: state for state in snapshot.actions} if snapshot else {}
+    entries = (await session.execute(
+        select(ActionJournal)
+        .where(ActionJournal.match_id == match_id,
+               ActionJournal.id > (snapshot.journal_id if snapshot else 0))
+        .order_by(ActionJournal.id)
+    )).scalars().all()
+    states = replay(states, entries)
+
+    await session.execute(delete(Action).where(Action.match_id == match_id))
+    if states:
+        await session.execute(insert(Action), [_columns(state) for state in states.values()])
+    await recompute_match_scores(session, [match_id])
+    return current, states
+
@@ -0,0 +1,99 @@
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Action, Match, User
+from backend.schema import ActionCreate, ActionRead
+from backend.services import action_journal
+from backend.services.idempotency import recent_actions
+from backend.services.match_service import ensure_lock_owner, ensure_not_finalized
+from backend.services.score_service import apply_action_score
+
+
+async def action_event(session: AsyncSession, event_type: str, action: Action) -> dict:
+    """Build the action_events payload for a created, updated or deleted action."""
+    data = ActionRead.model_validate(action).model_dump(mode="json")
+    if action.user_id and not data.get("username"):
+        user = await session.get(User, action.user_id)
+        data["username"] = user.username if user else None
+    score = (await session.execute(
+        select(Match.team_score, Match.opponent_score).where(Match.id == action.match_id)
+    )).one_or_none()
+    return {
+        "type": event_type,
+        "action": data,
+        "score": {"team_score": score[0] or 0, "opponent_score": score[1] or 0} if score else None,
+    }
+
+
+async def find_action_by_client_id(session: AsyncSession, client_id: str) -> Action | None:
+    result = await session.execute(select(Action).where(Action.client_id == client_id))
+    return result.scalar_one_or_none()
+
+
+async def create_action(
+    session: AsyncSession,
+    action: ActionCreate,
+    user: User,
+    client_id: str | None = None,
+) -> tuple[Action | ActionRead, bool]:
+    """Store a new action and return it with a flag telling whether it was a replay."""
+    client_id = action.client_id or client_id
+
+    # Check if match exists and is not finalized; replays answer to the same checks
+    match = await session.get(Match, action.match_id)
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found")
+
+    ensure_not_finalized(match, "Cannot add actions to a finalized match")
+    await ensure_lock_owner(session, match, user, allow_shared=True)
+
+    # Replays of an already stored action return the original row
+    if client_id:
+        stored = recent_actions.get(client_id)
+        if stored is None:
+            stored = await find_action_by_client_id(session, client_id)
+            if stored is None and await action_journal.was_created(session, action.match_id, client_id):
+                # a late retry of an action that was deleted since
+                raise HTTPException(status_code=410, detail="This action was deleted")
+            if stored is not None:
+                recent_actions.put(client_id, ActionRead.model_validate(stored))
+        if stored is not None:
+            if stored.match_id != action.match_id:
+                raise HTTPException(status_code=409, detail="client_id is already used in another match")
+            return stored, True
+
+    action_payload = action.model_dump(exclude={"username", "version"})
+    if action_payload.get("is_opponent"):
+        action_payload["player_id"] = None
+    action_payload["user_id"] = user.id
+    action_payload["client_id"] = client_id
+    db_action = Action(**action_payload)
+
+    try:
+        session.add(db_action)
+        await apply_action_score(session, db_action)
+        await session.flush()
+        await action_journal.record(
+            session, "create", db_action.match_id, db_action.id, user, None, action_journal.row_state(db_action))
+
+        await session.commit()
+        await session.refresh(db_action)
+
+    except IntegrityError:
+        await session.rollback()
+
+        # A concurrent retry with the same client id won the race
+        existing = await find_action_by_client_id(session, client_id) if client_id else None
+        if existing:
+            return existing, True
+
+        raise HTTPException(
+            status_code=400,
+            detail="Error creating new action in database"
+        )
+
+    if client_id:
+        recent_actions.put(client_id, ActionRead.model_validate(db_action))
+    return db_action, False
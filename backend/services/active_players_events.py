@@ -3,10 +3,27 @@ from typing import Callable, Dict, List, Tuple
 
 from nicegui.client import Client
 
+from backend.services.listeners import call_listeners
+
 
 Subscriber = Tuple[Client, Callable[[dict], None]]
 _subscribers: Dict[int, List[Subscriber]] = defaultdict(list)
 
+# process-wide listeners that see every match, e.g. the shared match views
+Listener = Callable[[int, dict], None]
+_listeners: List[Listener] = []
+
+# last published state per match, for consumers that join later
+_last: Dict[int, dict] = {}
+
+
+def add_listener(listener: Listener) -> None:
+    _listeners.append(listener)
+
+
+def last(match_id: int) -> dict:
+    return dict(_last.get(match_id, {}))
+
 
 def subscribe(match_id: int, client: Client, callback: Callable[[dict], None]) -> None:
     _subscribers[match_id].append((client, callback))
@@ -23,5 +40,7 @@ def unsubscribe(match_id: int, client: Client) -> None:
 
 
 def notify(match_id: int, payload: dict) -> None:
+    _last[match_id] = dict(payload)
+    call_listeners(_listeners, match_id, payload)
     for client, callback in list(_subscribers.get(match_id, [])):
         client.safe_invoke(lambda: callback(payload))
@@ -0,0 +1,72 @@
+from typing import Dict, List
+
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Action
+from backend.schema import ActionType
+from backend.services.score_service import GOAL_ACTIONS, efficiency
+
+_GOAL_VALUES = {a.value for a in GOAL_ACTIONS}
+
+
+def _totals(counts: Dict[str, List[int]]) -> dict:
+    goals = sum(counts[value][0] for value in _GOAL_VALUES if value in counts)
+    attempts = sum(counts[value][1] for value in _GOAL_VALUES if value in counts)
+    return {
+        "goals": goals,
+        "attempts": attempts,
+        "efficiency": efficiency(goals, attempts),
+        "actions": [
+            {"action": value, "success": success, "attempts": tries, "efficiency": efficiency(success, tries)}
+            for value, (success, tries) in sorted(counts.items())
+        ],
+    }
+
+
+def _counts_query(match_ids: Select):
+    # one row per (player, action type, side): served from ix_action_match_player_type alone
+    return (
+        select(
+            Action.player_id,
+            Action.action,
+            Action.is_opponent,
+            func.sum(case((Action.result.is_(True), 1), else_=0)).label("success"),
+            func.count().label("attempts"),
+        )
+        .where(Action.match_id.in_(match_ids))
+        .group_by(Action.player_id, Action.action, Action.is_opponent)
+    )
+
+
+def combine(rows) -> dict:
+    """Team, per-action and per-player totals from the grouped (player, type, side) counts."""
+    team: Dict[str, List[int]] = {}
+    players: Dict[int, Dict[str, List[int]]] = {}
+    opponent_goals = 0
+    for player_id, action, is_opponent, success, attempts in rows:
+        value = ActionType(action).value
+        if is_opponent:
+            opponent_goals += attempts
+            continue
+        pair = team.setdefault(value, [0, 0])
+        pair[0] += success
+        pair[1] += attempts
+        if player_id is not None:
+            pair = players.setdefault(player_id, {}).setdefault(value, [0, 0])
+            pair[0] += success
+            pair[1] += attempts
+    return {
+        **_totals(team),
+        "opponent_goals": opponent_goals,
+        "players": [{"player_id": player_id, **_totals(counts)} for player_id, counts in sorted(players.items())],
+    }
+
+
+async def aggregate(session: AsyncSession, match_ids: Select) -> dict:
+    """Success/attempt totals over the matches selected by ``match_ids`` (a select of match ids)."""
+    matches = (await session.execute(
+        select(func.count()).select_from(match_ids.subquery())
+    )).scalar_one()
+    rows = (await session.execute(_counts_query(match_ids))).all()
+    return {"matches": matches, **combine(rows)}
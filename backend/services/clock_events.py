@@ -1,12 +1,50 @@
+import time
 from collections import defaultdict
 from typing import Callable, Dict, List, Tuple
 
 from nicegui.client import Client
 
+from backend.services.listeners import call_listeners
+
 
 Subscriber = Tuple[Client, Callable[[dict], None]]
 _subscribers: Dict[int, List[Subscriber]] = defaultdict(list)
 
+# process-wide listeners that see every match, e.g. the shared match views
+Listener = Callable[[int, dict], None]
+_listeners: List[Listener] = []
+
+# last published state per match, for consumers that join later
+_last: Dict[int, dict] = {}
+# monotonic time of the last published clock values per match
+_at: Dict[int, float] = {}
+
+
+def add_listener(listener: Listener) -> None:
+    _listeners.append(listener)
+
+
+def last(match_id: int) -> dict:
+    return dict(_last.get(match_id, {}))
+
+
+def current(match_id: int) -> dict:
+    """
+    The last published state with a running clock advanced to now.
+
+    The owner page publishes its clock every few seconds while it runs, so ``last`` can lag behind
+    by that interval; this is the clock at this moment, e.g. for the timestamp of a substitution.
+    """
+    state = last(match_id)
+    if state.get("clock_running") and match_id in _at:
+        elapsed = int(time.monotonic() - _at[match_id])
+        if state.get("remaining_seconds") is not None:
+            elapsed = min(elapsed, max(0, state["remaining_seconds"]))
+            state["remaining_seconds"] -= elapsed
+        if state.get("clock_seconds") is not None:
+            state["clock_seconds"] += elapsed
+    return state
+
 
 def subscribe(match_id: int, client: Client, callback: Callable[[dict], None]) -> None:
     _subscribers[match_id].append((client, callback))
@@ -23,5 +61,13 @@ def unsubscribe(match_id: int, client: Client) -> None:
 
 
 def notify(match_id: int, payload: dict) -> None:
+    has_values = payload.get("clock_seconds") is not None or payload.get("remaining_seconds") is not None
+    if "clock_running" in payload or has_values:
+        if not has_values and match_id in _last:
+            # a bare start or pause: keep the stored values as of this moment
+            _last[match_id] = current(match_id)
+        _at[match_id] = time.monotonic()
+    _last[match_id] = {**_last.get(match_id, {}), **payload}  # lock changes only carry the owner
+    call_listeners(_listeners, match_id, payload)
     for client, callback in list(_subscribers.get(match_id, [])):
         client.safe_invoke(lambda: callback(payload))
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+CONFLICT_MESSAGE = "Changed by someone else in the meantime"
+
+
+def version_conflict(current: Optional[dict], message: str = CONFLICT_MESSAGE) -> HTTPException:
+    """A 409 whose detail carries the row as it is now, so the client can show or merge it."""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"message": message, "current": current},
+    )
+
+
+def is_outdated(expected: Optional[int], version: Optional[int]) -> bool:
+    """True when the client edited an older version than the stored one; no version means no check."""
+    return expected is not None and expected != (version or 1)
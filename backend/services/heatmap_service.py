@@ -0,0 +1,172 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.field import FIELD_LENGTH, FIELD_WIDTH, shot_geometry
+from backend.models import Action
+from backend.services import action_events
+from backend.services.idempotency import LRUCache
+from backend.services.match_service import team_matches_query
+from backend.services.score_service import GOAL_ACTIONS
+
+# one cell per square metre of the 40 x 20 m field
+BINS_X = 40
+BINS_Y = 20
+MATCH_CACHE_SIZE = 512
+
+_EDGES = (np.linspace(0, FIELD_LENGTH, BINS_X + 1), np.linspace(0, FIELD_WIDTH, BINS_Y + 1))
+_SHOT_TYPES = list(GOAL_ACTIONS)
+
+Grids = Tuple[np.ndarray, np.ndarray]  # (made, missed), each BINS_Y rows by BINS_X columns
+
+
+def bin_shots(x: np.ndarray, y: np.ndarray, made: np.ndarray) -> Grids:
+    """Count made and missed shots per field cell; shots outside the field go to the edge cells."""
+    x = np.clip(x, 0, FIELD_LENGTH)
+    y = np.clip(y, 0, FIELD_WIDTH)
+    made_grid, _, _ = np.histogram2d(x[made], y[made], bins=_EDGES)
+    missed_grid, _, _ = np.histogram2d(x[~made], y[~made], bins=_EDGES)
+    # histogram2d indexes [x][y]; rows of the result follow the field's y axis
+    return made_grid.T.astype(np.int32), missed_grid.T.astype(np.int32)
+
+
+def empty_grids() -> Grids:
+    return np.zeros((BINS_Y, BINS_X), np.int32), np.zeros((BINS_Y, BINS_X), np.int32)
+
+
+class MatchShots:
+    """The shots of one match as arrays, with the team grids and per-player grids on demand."""
+
+    def __init__(self, player_ids: np.ndarray, x: np.ndarray, y: np.ndarray, made: np.ndarray):
+        self.player_ids = player_ids
+        self.x = x
+        self.y = y
+        self.made = made
+        self._grids: Dict[Optional[int], Grids] = {}
+        self._geometry: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def from_rows(cls, rows: List[tuple]) -> "MatchShots":
+        if not rows:
+            return cls(np.empty(0, np.int64), np.empty(0), np.empty(0), np.empty(0, bool))
+        player_ids, x, y, made = zip(*rows)
+        return cls(
+            np.array([-1 if p is None else p for p in player_ids], np.int64),
+            np.array(x, float),
+            np.array(y, float),
+            np.array(made, bool),
+        )
+
+    def grids(self, player_id: Optional[int] = None) -> Grids:
+        grids = self._grids.get(player_id)
+        if grids is None:
+            if player_id is None:
+                grids = bin_shots(self.x, self.y, self.made)
+            else:
+                mask = self.player_ids == player_id
+                grids = bin_shots(self.x[mask], self.y[mask], self.made[mask])
+            self._grids[player_id] = grids
+        return grids
+
+    def geometry(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Distance and angle of each shot to its nearest post."""
+        if self._geometry is None:
+            self._geometry = shot_geometry(self.x, self.y)
+        return self._geometry
+
+
+_matches: LRUCache = LRUCache(MATCH_CACHE_SIZE)
+# bumped on every action change, so shots loaded during a change are not cached
+_changes: Dict[int, int] = {}
+
+
+def _shots_query(match_ids: Iterable[int]):
+    return (
+        select(Action.match_id, Action.player_id, Action.x, Action.y, Action.result)
+        .where(
+            Action.match_id.in_(list(match_ids)),
+            Action.action.in_(_SHOT_TYPES),
+            Action.is_opponent.isnot(True),
+            Action.x.isnot(None),
+            Action.y.isnot(None),
+        )
+    )
+
+
+async def match_shots(session: AsyncSession, match_ids: List[int]) -> Dict[int, MatchShots]:
+    """Shots per match, loading all uncached matches with one query."""
+    found = {match_id: _matches.get(match_id) for match_id in match_ids}
+    missing = [match_id for match_id, shots in found.items() if shots is None]
+    if missing:
+        changes = {match_id: _changes.get(match_id, 0) for match_id in missing}
+        rows: Dict[int, List[tuple]] = {match_id: [] for match_id in missing}
+        for match_id, player_id, x, y, result in (await session.execute(_shots_query(missing))).all():
+            rows[match_id].append((player_id, x, y, bool(result)))
+        for match_id in missing:
+            shots = found[match_id] = MatchShots.from_rows(rows[match_id])
+            if _changes.get(match_id, 0) == changes[match_id]:
+                _matches.put(match_id, shots)
+    return found
+
+
+async def team_match_ids(
+    session: AsyncSession,
+    team_id: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> List[int]:
+    query = team_matches_query(team_id, date_from, date_to)
+    return list((await session.execute(query)).scalars().all())
+
+
+def heatmap(grids: Grids, matches: int) -> dict:
+    made, missed = grids
+    return {
+        "bins_x": BINS_X,
+        "bins_y": BINS_Y,
+        "width": FIELD_LENGTH,
+        "height": FIELD_WIDTH,
+        "matches": matches,
+        "made_total": int(made.sum()),
+        "missed_total": int(missed.sum()),
+        "made": made.tolist(),
+        "missed": missed.tolist(),
+    }
+
+
+async def match_heatmap(session: AsyncSession, match_id: int, player_id: Optional[int] = None) -> dict:
+    shots = (await match_shots(session, [match_id]))[match_id]
+    return heatmap(shots.grids(player_id), 1)
+
+
+async def team_heatmap(
+    session: AsyncSession,
+    team_id: int,
+    player_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> dict:
+    """Sum of the cached per-match grids over the team's matches, e.g. of one season."""
+    match_ids = await team_match_ids(session, team_id, date_from, date_to)
+
+    made, missed = empty_grids()
+    for shots in (await match_shots(session, match_ids)).values():
+        match_made, match_missed = shots.grids(player_id)
+        made += match_made
+        missed += match_missed
+    return heatmap((made, missed), len(match_ids))
+
+
+def forget(match_id: int) -> None:
+    _changes[match_id] = _changes.get(match_id, 0) + 1
+    _matches.discard(match_id)
+
+
+def _on_action(match_id: int, payload: dict) -> None:
+    forget(match_id)
+
+
+action_events.add_listener(_on_action)
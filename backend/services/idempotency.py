@@ -0,0 +1,41 @@
+from collections import OrderedDict
+import os
+from typing import Generic, Hashable, Optional, TypeVar
+
+
+V = TypeVar("V")
+
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("KORFBALL_IDEMPOTENCY_CACHE_SIZE", "2048"))
+
+
+class LRUCache(Generic[V]):
+    """Small bounded least-recently-used mapping."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, V] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# client_id -> ActionRead of the row that was stored for it
+recent_actions: LRUCache = LRUCache(IDEMPOTENCY_CACHE_SIZE)
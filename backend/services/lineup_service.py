@@ -0,0 +1,263 @@
+from collections import defaultdict
+from datetime import datetime
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Action, LineupChange, Match, User
+from backend.services import replay_service
+from backend.services.match_service import team_matches_query
+from backend.services.score_service import GOAL_ACTIONS, efficiency
+
+DEFAULT_COMBINATION_SIZE = 4  # one zone
+COMBINATION_LIMIT = 50
+
+# what happened while a lineup was on the field
+GOAL_FOR, GOAL_AGAINST, MISS = 0, 1, 2
+
+Change = Tuple[int, int, Tuple[int, ...]]  # (period, timestamp, sorted player ids)
+Event = Tuple[int, int, int]  # (period, timestamp, GOAL_FOR | GOAL_AGAINST | MISS)
+
+
+async def latest_change(session: AsyncSession, match_id: int) -> Optional[LineupChange]:
+    return (await session.execute(
+        select(LineupChange)
+        .where(LineupChange.match_id == match_id)
+        .order_by(LineupChange.period.desc(), LineupChange.timestamp.desc(), LineupChange.id.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+
+
+async def record_change(
+    session: AsyncSession,
+    match_id: int,
+    user: Optional[User],
+    period: int,
+    timestamp: int,
+    player_ids: Iterable[int],
+    client_id: Optional[str] = None,
+) -> Tuple[LineupChange, bool]:
+    """
+    Store who is on the field from (period, timestamp) on.
+
+    Returns the change and whether it was already stored: a replayed ``client_id`` or the same
+    players as the latest change, as every re-broadcast of an unchanged lineup would otherwise add one.
+    """
+    if client_id:
+        existing = (await session.execute(
+            select(LineupChange).where(LineupChange.client_id == client_id)
+        )).scalar_one_or_none()
+        if existing is not None:
+            return existing, True
+    player_ids = sorted(set(player_ids))
+    latest = await latest_change(session, match_id)
+    if latest is not None and sorted(latest.player_ids) == player_ids:
+        return latest, True
+
+    change = LineupChange(
+        match_id=match_id,
+        user_id=user.id if user else None,
+        client_id=client_id,
+        period=period,
+        timestamp=timestamp,
+        player_ids=player_ids,
+    )
+    try:
+        session.add(change)
+        await session.commit()
+        await session.refresh(change)
+    except IntegrityError:
+        await session.rollback()
+        # a concurrent retry with the same client id won the race
+        existing = (await session.execute(
+            select(LineupChange).where(LineupChange.client_id == client_id)
+        )).scalar_one_or_none() if client_id else None
+        if existing is not None:
+            return existing, True
+        raise HTTPException(status_code=400, detail="Error storing the lineup change")
+    replay_service.forget(match_id)
+    return change, False
+
+
+# ----------------------------------------------------------------------
+# ENGINE
+# ----------------------------------------------------------------------
+def _new_stats() -> List[int]:
+    return [0, 0, 0, 0]  # seconds, goals for, goals against, attempts
+
+
+def on_field_intervals(changes: List[Change], events: List[Event], end: int) -> Tuple[List[list], List[int]]:
+    """
+    What happened during each lineup interval, in one sorted sweep over changes and events.
+
+    A lineup is on the field from its change up to the next one, the last one until ``end``. Both
+    lists are walked once in (period, timestamp) order, so the cost is linear in changes plus events
+    instead of one interval scan per event. Returns per interval ``[players, stats]`` and the goals
+    (for, against) of events before the first change.
+    """
+    changes = sorted(changes, key=lambda c: (c[0], c[1]))
+    events = sorted(events, key=lambda e: (e[0], e[1]))
+    intervals = []
+    for index, (period, timestamp, players) in enumerate(changes):
+        stop = changes[index + 1][1] if index + 1 < len(changes) else max(end, timestamp)
+        stats = _new_stats()
+        stats[0] = max(0, stop - timestamp)
+        intervals.append([players, stats])
+
+    unattributed = [0, 0]
+    current = -1
+    for period, timestamp, kind in events:
+        # a change applies to the events at its own moment
+        while current + 1 < len(changes) and changes[current + 1][:2] <= (period, timestamp):
+            current += 1
+        if current < 0:
+            if kind != MISS:
+                unattributed[kind] += 1
+            continue
+        stats = intervals[current][1]
+        if kind == GOAL_FOR:
+            stats[1] += 1
+            stats[3] += 1
+        elif kind == GOAL_AGAINST:
+            stats[2] += 1
+        else:
+            stats[3] += 1
+    return intervals, unattributed
+
+
+def merge_lineups(intervals: Iterable[list], into: Optional[Dict] = None) -> Dict[Tuple[int, ...], List[int]]:
+    """Sum the stats of intervals with the same players, e.g. over all matches of a season."""
+    lineups: Dict[Tuple[int, ...], List[int]] = into if into is not None else defaultdict(_new_stats)
+    for lineup, stats in intervals:
+        _add(lineups[lineup], stats)
+    return lineups
+
+
+def attribute(
+    lineups: Iterable[list], size: Optional[int]
+) -> Tuple[Dict[int, List[int]], Dict[Tuple[int, ...], List[int]]]:
+    """
+    Add the stats of each lineup to each of its players and each combination of ``size`` of them.
+
+    Pass merged lineups: a lineup that came back on the field is then expanded into its
+    combinations once, not once per interval. Lineups that were on and off at the same second
+    without any event are skipped, and lineups of fewer than ``size`` players (e.g. while the start was set up)
+    only count for their players.
+    """
+    players: Dict[int, List[int]] = defaultdict(_new_stats)
+    combos: Dict[Tuple[int, ...], List[int]] = defaultdict(_new_stats)
+    for lineup, stats in lineups:
+        if not any(stats):
+            continue  # on and off at the same second, nothing happened
+        for player_id in lineup:
+            _add(players[player_id], stats)
+        group = len(lineup) if size is None else size
+        if not lineup or len(lineup) < group:
+            continue
+        for combo in combinations(lineup, group):
+            _add(combos[combo], stats)
+    return players, combos
+
+
+def _add(total: List[int], stats: List[int]) -> None:
+    total[0] += stats[0]
+    total[1] += stats[1]
+    total[2] += stats[2]
+    total[3] += stats[3]
+
+
+def _row(stats: List[int]) -> dict:
+    seconds, goals_for, goals_against, attempts = stats
+    return {
+        "seconds": seconds,
+        "goals_for": goals_for,
+        "goals_against": goals_against,
+        "plus_minus": goals_for - goals_against,
+        "attempts": attempts,
+        "efficiency": efficiency(goals_for, attempts),
+    }
+
+
+# ----------------------------------------------------------------------
+# QUERIES
+# ----------------------------------------------------------------------
+async def plus_minus(
+    session: AsyncSession,
+    match_ids,
+    size: Optional[int] = DEFAULT_COMBINATION_SIZE,
+    limit: int = COMBINATION_LIMIT,
+) -> dict:
+    """Plus/minus per player and per lineup combination over the matches (ids or a select of them)."""
+    if not isinstance(match_ids, Select):
+        match_ids = list(match_ids)
+
+    changes: Dict[int, List[Change]] = defaultdict(list)
+    for match_id, period, timestamp, player_ids in (await session.execute(
+        select(LineupChange.match_id, LineupChange.period, LineupChange.timestamp, LineupChange.player_ids)
+        .where(LineupChange.match_id.in_(match_ids))
+        .order_by(LineupChange.id)
+    )).all():
+        changes[match_id].append((period, timestamp, tuple(sorted(player_ids))))
+
+    # only what changes the score or counts as an attempt
+    events: Dict[int, List[Event]] = defaultdict(list)
+    for match_id, period, timestamp, result, is_opponent in (await session.execute(
+        select(Action.match_id, Action.period, Action.timestamp, Action.result, Action.is_opponent)
+        .where(Action.match_id.in_(match_ids),
+               or_(Action.is_opponent.is_(True), Action.action.in_(GOAL_ACTIONS)))
+    )).all():
+        if is_opponent:
+            events[match_id].append((period, timestamp, GOAL_AGAINST))
+        else:
+            events[match_id].append((period, timestamp, GOAL_FOR if result else MISS))
+
+    # the last lineup stays on until the registered match time or the last action, whichever is later
+    last_action = (
+        select(Action.match_id, func.max(Action.timestamp).label("last_t"))
+        .where(Action.match_id.in_(match_ids))
+        .group_by(Action.match_id)
+        .subquery()
+    )
+    matches = (await session.execute(
+        select(Match.id, Match.time_registered_s, last_action.c.last_t)
+        .outerjoin(last_action, last_action.c.match_id == Match.id)
+        .where(Match.id.in_(match_ids))
+    )).all()
+
+    lineups: Dict[Tuple[int, ...], List[int]] = defaultdict(_new_stats)
+    unattributed = [0, 0]
+    for match_id, time_registered_s, last_t in matches:
+        end = max(time_registered_s or 0, last_t or 0)
+        intervals, missed = on_field_intervals(changes.get(match_id, []), events.get(match_id, []), end)
+        unattributed[0] += missed[0]
+        unattributed[1] += missed[1]
+        merge_lineups(intervals, lineups)
+    players, combos = attribute(lineups.items(), size)
+
+    player_rows = [{"player_id": player_id, **_row(stats)} for player_id, stats in players.items()]
+    player_rows.sort(key=lambda row: (-row["plus_minus"], -row["seconds"], row["player_id"]))
+    combo_rows = [{"player_ids": list(combo), **_row(stats)} for combo, stats in combos.items()]
+    combo_rows.sort(key=lambda row: (-row["plus_minus"], -row["seconds"], row["player_ids"]))
+    return {
+        "matches": len(matches),
+        "size": size,
+        "players": player_rows,
+        "combinations": combo_rows[:limit],
+        "unattributed_for": unattributed[0],
+        "unattributed_against": unattributed[1],
+    }
+
+
+async def team_plus_minus(
+    session: AsyncSession,
+    team_id: int,
+    size: Optional[int] = DEFAULT_COMBINATION_SIZE,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    limit: int = COMBINATION_LIMIT,
+) -> dict:
+    return await plus_minus(session, team_matches_query(team_id, date_from, date_to), size, limit)
@@ -0,0 +1,19 @@
+from logging import getLogger
+from typing import Callable, Iterable
+
+
+logger = getLogger('uvicorn.error')
+
+
+def call_listeners(listeners: Iterable[Callable[[int, dict], None]], match_id: int, payload: dict) -> None:
+    """
+    Call the process-wide listeners of an event module.
+
+    Events are published after the change was committed, so a failing listener is logged and
+    neither stops the other listeners nor fails the request that made the change.
+    """
+    for listener in list(listeners):
+        try:
+            listener(match_id, payload)
+        except Exception:
+            logger.exception(f"Listener {getattr(listener, '__qualname__', listener)} failed for match {match_id}")
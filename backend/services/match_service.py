@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from backend.models import Match, User
+from backend.schema import MatchType
 from backend.services.collaboration import (
     is_collaborator,
     list_collaborators,
@@ -20,6 +21,39 @@ async def get_match_or_404(session: AsyncSession, match_id: int) -> Match:
     return match
 
 
+def matches_query(
+    team_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    match_type: MatchType | None = None,
+    location: str | None = None,
+    opponent: str | None = None,
+    match_ids: list[int] | None = None,
+):
+    """Select of the ids of the matches passing every given filter; names match on a part, any case."""
+    query = select(Match.id)
+    if team_id is not None:
+        query = query.where(Match.team_id == team_id)
+    if date_from is not None:
+        query = query.where(Match.date >= date_from)
+    if date_to is not None:
+        query = query.where(Match.date <= date_to)
+    if match_type is not None:
+        query = query.where(Match.match_type == match_type)
+    if location:
+        query = query.where(Match.location.icontains(location, autoescape=True))
+    if opponent:
+        query = query.where(Match.opponent_name.icontains(opponent, autoescape=True))
+    if match_ids:
+        query = query.where(Match.id.in_(match_ids))
+    return query
+
+
+def team_matches_query(team_id: int, date_from: datetime | None = None, date_to: datetime | None = None):
+    """Select of the ids of a team's matches, optionally within a date range such as a season."""
+    return matches_query(team_id, date_from, date_to)
+
+
 LOCK_TIMEOUT_MINUTES = int(os.getenv("KORFBALL_LOCK_TIMEOUT_MINUTES", "10"))
 
 
@@ -52,7 +86,16 @@ def format_lock_detail(username: str | None) -> str:
     return f"Match is locked by {username or 'another user'}"
 
 
-async def ensure_lock_owner(session: AsyncSession, match: Match, user: User) -> None:
+async def ensure_lock_owner(session: AsyncSession, match: Match, user: User, allow_shared: bool = False) -> None:
+    """
+    Raise 409 unless ``user`` holds the match lock or collaborates on it.
+
+    ``allow_shared`` lets every scorer through on a shared scoring match; only action writes pass
+    it, since their row versions catch conflicting edits. Finalizing, unlocking, join decisions,
+    lineups and playtime stay with the owner and collaborators.
+    """
+    if allow_shared and match.shared_scoring:
+        return
     if await clear_stale_lock(session, match):
         return
     if match.locked_by_user_id and match.locked_by_user_id != user.id:
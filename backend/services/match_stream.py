@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from backend.services import action_events, active_players_events, clock_events
+
+# events kept per match so a reconnecting stream can resume from its Last-Event-ID
+EVENT_BUFFER = int(os.getenv("KORFBALL_SSE_BUFFER", "500"))
+HEARTBEAT_SECONDS = float(os.getenv("KORFBALL_SSE_HEARTBEAT_SECONDS", "15"))
+# streams are woken this long after an event, so the write to every stream happens after the
+# scoring request has been answered and bursts of events go out in one write
+FLUSH_SECONDS = 0.05
+# buffers of matches nobody streams are dropped after this many seconds
+IDLE_SECONDS = 300
+
+CLOCK_FIELDS = ("clock_running", "clock_seconds", "remaining_seconds", "period", "period_minutes", "total_periods", "is_finalized")
+# fields of an action that are not meant for the public stream
+PRIVATE_ACTION_FIELDS = ("user_id", "username", "client_id")
+
+# event ids are "<boot>-<seq>"; ids from before a restart cannot be resumed
+_BOOT = uuid.uuid4().hex[:8]
+
+HEARTBEAT = ": heartbeat\n\n"
+
+# message formats kept per event
+SSE = 0
+JSON = 1
+
+
+def format_event(event_id: str, event: str, data: dict) -> Tuple[str, str]:
+    """The event as an SSE message and as the JSON message sent on scoring sockets."""
+    data_json = json.dumps(data, separators=(',', ':'))
+    return (
+        f"id: {event_id}\nevent: {event}\ndata: {data_json}\n\n",
+        f'{{"type":"event","id":"{event_id}","event":"{event}","data":{data_json}}}',
+    )
+
+
+class MatchStream:
+    """
+    Recent events of one match, already formatted as SSE and socket messages.
+
+    Publishing appends to a ring buffer and schedules a wake-up of the waiting streams; each
+    stream then sends the messages after its own cursor, so the publisher's cost per event does
+    not depend on the number of listeners.
+    """
+
+    def __init__(self, match_id: int):
+        self.match_id = match_id
+        self.seq = 0
+        self.events: Deque[Tuple[int, Tuple[str, str]]] = deque(maxlen=EVENT_BUFFER)
+        self.listeners = 0
+        self.idle_since = time.monotonic()
+        self.lock_owner: Optional[int] = None
+        self._changed = asyncio.Event()
+        self._wake: Optional[asyncio.TimerHandle] = None
+
+    def publish(self, event: str, data: dict) -> None:
+        self.seq += 1
+        self.events.append((self.seq, format_event(f"{_BOOT}-{self.seq}", event, data)))
+        if self._wake is not None or not self.listeners:
+            return
+        try:
+            self._wake = asyncio.get_running_loop().call_later(FLUSH_SECONDS, self._wake_streams)
+        except RuntimeError:
+            self._wake_streams()
+
+    def _wake_streams(self) -> None:
+        self._wake = None
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def resume_cursor(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Sequence to continue after, or None when ``last_event_id`` cannot be resumed."""
+        if not last_event_id:
+            return self.seq
+        boot, _, seq = last_event_id.rpartition("-")
+        if boot != _BOOT or not seq.isdigit() or int(seq) > self.seq:
+            return None
+        return int(seq)
+
+    def after(self, cursor: int, fmt: int = SSE) -> Optional[List[str]]:
+        """Messages newer than ``cursor``, or None when some of them were already dropped."""
+        if cursor >= self.seq:
+            return []
+        if not self.events or self.events[0][0] > cursor + 1:
+            return None
+        messages = []
+        for seq, formats in reversed(self.events):
+            if seq <= cursor:
+                break
+            messages.append(formats[fmt])
+        messages.reverse()
+        return messages
+
+    async def wait(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def reset_event(self, fmt: int = SSE) -> str:
+        """Tells a client that it missed events and should reload the match."""
+        return format_event(f"{_BOOT}-{self.seq}", "reset", {"match_id": self.match_id})[fmt]
+
+
+_streams: Dict[int, MatchStream] = {}
+
+
+def _drop_idle() -> None:
+    now = time.monotonic()
+    for match_id, stream in list(_streams.items()):
+        if not stream.listeners and now - stream.idle_since > IDLE_SECONDS:
+            del _streams[match_id]
+
+
+def open_stream(match_id: int) -> MatchStream:
+    _drop_idle()
+    stream = _streams.get(match_id)
+    if stream is None:
+        stream = _streams[match_id] = MatchStream(match_id)
+    stream.listeners += 1
+    return stream
+
+
+def close_stream(stream: MatchStream) -> None:
+    stream.listeners -= 1
+    stream.idle_since = time.monotonic()
+
+
+async def updates(stream: MatchStream, cursor: int, fmt: int = SSE):
+    """Yield batches of messages after ``cursor``; an empty batch when the match stayed quiet."""
+    while True:
+        messages = stream.after(cursor, fmt)
+        if messages is None:
+            # the buffer wrapped while this client was slow
+            yield [stream.reset_event(fmt)]
+            cursor = stream.seq
+            continue
+        if messages:
+            cursor += len(messages)
+            yield messages
+            continue
+        await stream.wait(HEARTBEAT_SECONDS)
+        if stream.seq == cursor:
+            yield []
+
+
+async def event_messages(stream: MatchStream, last_event_id: Optional[str]):
+    """Yield the SSE messages of one client: missed events, then live events and heartbeats."""
+    try:
+        yield "retry: 3000\n\n"
+        cursor = stream.resume_cursor(last_event_id)
+        if cursor is None:
+            yield stream.reset_event()
+            cursor = stream.seq
+        async for messages in updates(stream, cursor):
+            yield "".join(messages) if messages else HEARTBEAT
+    finally:
+        close_stream(stream)
+
+
+def _public_action(action: dict) -> dict:
+    return {key: value for key, value in action.items() if key not in PRIVATE_ACTION_FIELDS}
+
+
+def _on_action(match_id: int, payload: dict) -> None:
+    stream = _streams.get(match_id)
+    if stream is None:
+        return
+    stream.publish("action", {
+        "match_id": match_id,
+        "type": payload.get("type"),
+        "action": _public_action(payload.get("action") or {}),
+        "score": payload.get("score"),
+    })
+
+
+def _on_clock(match_id: int, payload: dict) -> None:
+    stream = _streams.get(match_id)
+    if stream is None:
+        return
+    clock = {key: payload[key] for key in CLOCK_FIELDS if payload.get(key) is not None}
+    if clock:
+        stream.publish("clock", {"match_id": match_id, **clock})
+    if "locked_by_user_id" in payload and payload["locked_by_user_id"] != stream.lock_owner:
+        stream.lock_owner = payload["locked_by_user_id"]
+        stream.publish("lock", {"match_id": match_id, "locked_by_user_id": stream.lock_owner})
+
+
+def _on_active_players(match_id: int, payload: dict) -> None:
+    stream = _streams.get(match_id)
+    if stream is None:
+        return
+    stream.publish("lineup", {"match_id": match_id, "player_ids": list(payload.get("player_ids") or [])})
+
+
+action_events.add_listener(_on_action)
+clock_events.add_listener(_on_clock)
+active_players_events.add_listener(_on_active_players)
@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Union
+
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Action, MatchPlayerLink
+from backend.schema import ActionType
+from backend.services.match_service import matches_query
+from backend.services.score_service import GOAL_ACTIONS, efficiency
+
+# rates are per period of a normal match
+RATE_MINUTES = 25
+
+STATS = ("goals", "attempts", "rebounds", "assists", "steals")
+
+
+def _counted(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+def per_minutes(totals: Dict[str, int], seconds: int, minutes: int = RATE_MINUTES) -> Dict[str, Optional[float]]:
+    """Totals scaled to ``minutes`` played; None without registered time."""
+    if seconds <= 0:
+        return {stat: None for stat in totals}
+    return {stat: round(value * minutes * 60 / seconds, 2) for stat, value in totals.items()}
+
+
+def _rates_query(match_ids: Union[Iterable[int], Select]):
+    if not isinstance(match_ids, Select):
+        match_ids = list(match_ids)
+    # actions are summed per (match, player) first, so joining them to the playtime rows does
+    # not repeat a player's time for every action
+    counts = (
+        select(
+            Action.match_id,
+            Action.player_id,
+            _counted(Action.action.in_(GOAL_ACTIONS) & Action.result.is_(True)).label("goals"),
+            _counted(Action.action.in_(GOAL_ACTIONS)).label("attempts"),
+            _counted(Action.action == ActionType.REBOUND).label("rebounds"),
+            _counted(Action.action == ActionType.ASSIST).label("assists"),
+            _counted(Action.action == ActionType.STEAL).label("steals"),
+        )
+        .where(Action.match_id.in_(match_ids), Action.is_opponent.isnot(True), Action.player_id.isnot(None))
+        .group_by(Action.match_id, Action.player_id)
+        .subquery()
+    )
+    return (
+        select(
+            MatchPlayerLink.player_id,
+            func.count(MatchPlayerLink.match_id).label("matches"),
+            func.sum(MatchPlayerLink.time_played).label("seconds_played"),
+            *(func.coalesce(func.sum(counts.c[stat]), 0).label(stat) for stat in STATS),
+        )
+        .select_from(MatchPlayerLink)
+        .outerjoin(counts, (counts.c.match_id == MatchPlayerLink.match_id)
+                   & (counts.c.player_id == MatchPlayerLink.player_id))
+        .where(MatchPlayerLink.match_id.in_(match_ids), MatchPlayerLink.time_played > 0)
+        .group_by(MatchPlayerLink.player_id)
+        .order_by(MatchPlayerLink.player_id)
+    )
+
+
+async def player_rates(session: AsyncSession, match_ids: Union[Iterable[int], Select]) -> List[dict]:
+    """
+    Totals and per-25-minute rates of every player with registered playtime in the matches.
+
+    ``match_ids`` is a list of ids or a select of them, which then runs inside the same query.
+    Actions of players without registered time in a match are left out, as they have no rate.
+    """
+    rows = (await session.execute(_rates_query(match_ids))).mappings().all()
+    players = []
+    for row in rows:
+        totals = {stat: int(row[stat]) for stat in STATS}
+        seconds = int(row["seconds_played"] or 0)
+        players.append({
+            "player_id": row["player_id"],
+            "matches": row["matches"],
+            "minutes_played": round(seconds / 60, 1),
+            "efficiency": efficiency(totals["goals"], totals["attempts"]),
+            "totals": totals,
+            "per_25": per_minutes(totals, seconds),
+        })
+    return players
+
+
+async def team_player_rates(
+    session: AsyncSession,
+    team_id: int,
+    match_ids: Optional[List[int]] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> List[dict]:
+    return await player_rates(session, matches_query(team_id, date_from, date_to, match_ids=match_ids))
@@ -0,0 +1,170 @@
+import os
+from bisect import bisect_right
+from types import SimpleNamespace
+from typing import Dict, List, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Action, LineupChange, Match
+from backend.schema import ActionType
+from backend.services import action_events
+from backend.services.idempotency import LRUCache
+from backend.services.score_service import GOAL_ACTIONS, score_delta
+
+# player stats are stored in full every this many actions; a seek replays fewer than this many
+CHECKPOINT_EVERY = int(os.getenv("KORFBALL_REPLAY_CHECKPOINT_EVERY", "32"))
+TIMELINE_CACHE_SIZE = 64
+RECENT_ACTIONS = 5
+
+ACTION_TYPES = [a.value for a in ActionType]
+_TYPE_INDEX = {value: i for i, value in enumerate(ACTION_TYPES)}
+_GOAL_TYPES = {a.value for a in GOAL_ACTIONS}
+
+# per player: [success, attempts] per action type, in ACTION_TYPES order
+PlayerCounts = Dict[int, List[List[int]]]
+
+
+def _copy(counts: PlayerCounts) -> PlayerCounts:
+    return {player_id: [pair[:] for pair in pairs] for player_id, pairs in counts.items()}
+
+
+def _count(counts: PlayerCounts, row: tuple) -> None:
+    player_id, action_type, result, is_opponent = row
+    if is_opponent or player_id is None:
+        return
+    pairs = counts.get(player_id)
+    if pairs is None:
+        pairs = counts[player_id] = [[0, 0] for _ in ACTION_TYPES]
+    pair = pairs[_TYPE_INDEX[action_type]]
+    pair[1] += 1
+    if result:
+        pair[0] += 1
+
+
+class MatchTimeline:
+    """
+    The actions of one match, ordered by (period, timestamp), with what a seek needs precomputed.
+
+    Scores are prefix sums, so they are read at any position directly. Player stats are
+    checkpointed every ``CHECKPOINT_EVERY`` actions; the state at a moment is one bisect, a copy of
+    the checkpoint before it and fewer than ``CHECKPOINT_EVERY`` actions counted on top.
+    """
+
+    def __init__(self, match_id: int, actions: List[dict], lineups: Sequence[Tuple[int, int, List[int]]] = ()):
+        self.match_id = match_id
+        # (period, timestamp, player ids) of each lineup change, in match time order
+        lineups = sorted(lineups, key=lambda change: change[:2])
+        self.lineup_keys: List[Tuple[int, int]] = [change[:2] for change in lineups]
+        self.lineups: List[List[int]] = [sorted(change[2]) for change in lineups]
+        actions = sorted(actions, key=lambda a: (a["period"], a["timestamp"], a["id"]))
+        self.actions = actions
+        self.keys: List[Tuple[int, int]] = [(a["period"], a["timestamp"]) for a in actions]
+        self.rows = [(a["player_id"], a["action"], bool(a["result"]), bool(a["is_opponent"])) for a in actions]
+
+        self.team_scores = [0]
+        self.opponent_scores = [0]
+        for action in actions:
+            team, opponent = score_delta(SimpleNamespace(**action))
+            self.team_scores.append(self.team_scores[-1] + team)
+            self.opponent_scores.append(self.opponent_scores[-1] + opponent)
+
+        # checkpoints[k] holds the counts after the first k * CHECKPOINT_EVERY actions
+        self.checkpoints: List[PlayerCounts] = []
+        counts: PlayerCounts = {}
+        for index, row in enumerate(self.rows):
+            if index % CHECKPOINT_EVERY == 0:
+                self.checkpoints.append(_copy(counts))
+            _count(counts, row)
+        if len(self.rows) % CHECKPOINT_EVERY == 0:
+            self.checkpoints.append(_copy(counts))
+
+    def position(self, period: int, t: int) -> int:
+        """Number of actions registered up to and including second ``t`` of ``period``."""
+        return bisect_right(self.keys, (period, t))
+
+    def counts_at(self, position: int) -> PlayerCounts:
+        checkpoint = position // CHECKPOINT_EVERY
+        counts = _copy(self.checkpoints[checkpoint])
+        for row in self.rows[checkpoint * CHECKPOINT_EVERY:position]:
+            _count(counts, row)
+        return counts
+
+    def state_at(self, period: int, t: int) -> dict:
+        position = self.position(period, t)
+        players = []
+        for player_id, pairs in sorted(self.counts_at(position).items()):
+            goals = sum(pairs[_TYPE_INDEX[value]][0] for value in _GOAL_TYPES)
+            attempts = sum(pairs[_TYPE_INDEX[value]][1] for value in _GOAL_TYPES)
+            players.append({
+                "player_id": player_id,
+                "goals": goals,
+                "attempts": attempts,
+                "actions": {
+                    value: {"success": pair[0], "attempts": pair[1]}
+                    for value, pair in zip(ACTION_TYPES, pairs) if pair[1]
+                },
+            })
+        return {
+            "match_id": self.match_id,
+            "period": period,
+            "t": t,
+            "position": position,
+            "total_actions": len(self.actions),
+            "last_period": self.keys[-1][0] if self.keys else None,
+            "last_t": self.keys[-1][1] if self.keys else None,
+            "team_score": self.team_scores[position],
+            "opponent_score": self.opponent_scores[position],
+            "players": players,
+            "recent_actions": self.actions[max(0, position - RECENT_ACTIONS):position][::-1],
+            "lineup": self.lineup_at(period, t),
+        }
+
+    def lineup_at(self, period: int, t: int) -> List[int]:
+        """Players on the field at second ``t`` of ``period``: the latest change up to that moment."""
+        index = bisect_right(self.lineup_keys, (period, t))
+        return self.lineups[index - 1] if index else []
+
+
+_timelines: LRUCache = LRUCache(TIMELINE_CACHE_SIZE)
+# bumped on every action change, so a timeline built during a change is not cached
+_changes: Dict[int, int] = {}
+
+
+async def get_timeline(session: AsyncSession, match_id: int) -> MatchTimeline:
+    """The cached timeline of a match, built on first use and dropped when an action changes."""
+    timeline = _timelines.get(match_id)
+    if timeline is not None:
+        return timeline
+    if await session.get(Match, match_id) is None:
+        raise HTTPException(status_code=404, detail="Match not found")
+    changes = _changes.get(match_id, 0)
+    rows = (await session.execute(
+        select(Action.id, Action.period, Action.timestamp, Action.player_id,
+               Action.action, Action.result, Action.is_opponent, Action.x, Action.y)
+        .where(Action.match_id == match_id)
+    )).mappings().all()
+    actions = [{**row, "action": row["action"].value} for row in rows]
+    lineups = (await session.execute(
+        select(LineupChange.period, LineupChange.timestamp, LineupChange.player_ids)
+        .where(LineupChange.match_id == match_id)
+        .order_by(LineupChange.id)
+    )).all()
+    timeline = MatchTimeline(match_id, actions, [tuple(row) for row in lineups])
+    if _changes.get(match_id, 0) == changes:
+        _timelines.put(match_id, timeline)
+    return timeline
+
+
+def forget(match_id: int) -> None:
+    """Drop the cached timeline, after a change of its actions or lineups."""
+    _changes[match_id] = _changes.get(match_id, 0) + 1
+    _timelines.discard(match_id)
+
+
+def _on_action(match_id: int, payload: dict) -> None:
+    forget(match_id)
+
+
+action_events.add_listener(_on_action)
@@ -0,0 +1,113 @@
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func, select, update
+
+from backend.models import Action, Match
+from backend.schema import ActionType
+
+
+GOAL_ACTIONS = {
+    ActionType.SHOT,
+    ActionType.KORTE_KANS,
+    ActionType.VRIJWORP,
+    ActionType.STRAFWORP,
+    ActionType.INLOPER,
+}
+
+
+def efficiency(success: int, attempts: int) -> Optional[float]:
+    """Percentage of successful attempts, one decimal; None without attempts."""
+    return round(100 * success / attempts, 1) if attempts else None
+
+
+def score_delta(action) -> tuple[int, int]:
+    """Return the (team, opponent) score contribution of a single action."""
+    if getattr(action, "is_opponent", False):
+        return 0, 1
+    action_type = getattr(action, "action", None)
+    if action_type is not None and getattr(action, "result", False) and ActionType(action_type) in GOAL_ACTIONS:
+        return 1, 0
+    return 0, 0
+
+
+async def apply_score_delta(session, match_id: int, period: int, team: int, opponent: int) -> None:
+    """Atomically add a score delta to the match counters and its period breakdown."""
+    if not team and not opponent:
+        return
+    period_path = f'$."{int(period)}"'
+    period_scores = func.coalesce(Match.period_scores, func.json_object())
+    stmt = (
+        update(Match)
+        .where(Match.id == match_id)
+        .values(
+            team_score=func.coalesce(Match.team_score, 0) + team,
+            opponent_score=func.coalesce(Match.opponent_score, 0) + opponent,
+            period_scores=func.json_set(
+                period_scores,
+                period_path,
+                func.json_object(
+                    "team", func.coalesce(func.json_extract(period_scores, f"{period_path}.team"), 0) + team,
+                    "opponent", func.coalesce(func.json_extract(period_scores, f"{period_path}.opponent"), 0) + opponent,
+                ),
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(stmt)
+
+
+async def apply_action_score(session, action, sign: int = 1) -> None:
+    """Add (sign=1) or remove (sign=-1) the score contribution of an action."""
+    team, opponent = score_delta(action)
+    await apply_score_delta(session, action.match_id, action.period, sign * team, sign * opponent)
+
+
+async def recompute_match_scores(conn, match_ids: Iterable[int] | None = None) -> dict[int, tuple[int, int]]:
+    """Rebuild the denormalized score columns from the action table.
+
+    Works on both an ``AsyncSession`` and an ``AsyncConnection``; the caller commits.
+    """
+    team_goal = case(
+        (
+            (Action.is_opponent.isnot(True))
+            & (Action.result.is_(True))
+            & (Action.action.in_(GOAL_ACTIONS)),
+            1,
+        ),
+        else_=0,
+    )
+    opponent_goal = case((Action.is_opponent.is_(True), 1), else_=0)
+
+    stmt = (
+        select(
+            Action.match_id,
+            Action.period,
+            func.sum(team_goal),
+            func.sum(opponent_goal),
+        )
+        .group_by(Action.match_id, Action.period)
+    )
+    match_stmt = select(Match.id)
+    if match_ids is not None:
+        match_ids = list(match_ids)
+        stmt = stmt.where(Action.match_id.in_(match_ids))
+        match_stmt = match_stmt.where(Match.id.in_(match_ids))
+
+    per_period: dict[int, dict[str, dict[str, int]]] = defaultdict(dict)
+    for match_id, period, team, opponent in (await conn.execute(stmt)).all():
+        per_period[match_id][str(period)] = {"team": int(team or 0), "opponent": int(opponent or 0)}
+
+    totals: dict[int, tuple[int, int]] = {}
+    for match_id in (await conn.execute(match_stmt)).scalars().all():
+        periods = per_period.get(match_id, {})
+        team_score = sum(p["team"] for p in periods.values())
+        opponent_score = sum(p["opponent"] for p in periods.values())
+        await conn.execute(
+            update(Match)
+            .where(Match.id == match_id)
+            .values(team_score=team_score, opponent_score=opponent_score, period_scores=periods)
+            .execution_options(synchronize_session=False)
+        )
+        totals[match_id] = (team_score, opponent_score)
+    return totals
@@ -0,0 +1,106 @@
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import User
+from backend.schema import ActionCreate, ActionRead
+from backend.services import active_players_events, clock_events
+from backend.services.action_events import notify as notify_action
+from backend.services.action_service import action_event, create_action
+from backend.services.lineup_service import latest_change, record_change
+from backend.services.match_service import ensure_lock_owner, ensure_not_finalized, get_match_or_404
+
+CLOCK_ACTIONS = ("start", "pause", "set")
+
+
+def _int_list(value, field: str) -> list[int]:
+    if not isinstance(value, list) or not all(isinstance(v, int) for v in value):
+        raise HTTPException(status_code=422, detail=f"{field} must be a list of player ids")
+    return value
+
+
+async def _action(session: AsyncSession, user: User, match_id: int, command: dict) -> dict:
+    try:
+        action = ActionCreate(**{**(command.get("action") or {}), "match_id": match_id})
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False))
+    stored, replayed = await create_action(session, action, user)
+    if not replayed:
+        notify_action(match_id, await action_event(session, "created", stored))
+    return {"replayed": replayed, "action": ActionRead.model_validate(stored).model_dump(mode="json")}
+
+
+async def _substitution(session: AsyncSession, user: User, match_id: int, command: dict) -> dict:
+    match = await get_match_or_404(session, match_id)
+    ensure_not_finalized(match, "Cannot modify active players for a finalized match")
+    await ensure_lock_owner(session, match, user)
+    await session.commit()  # a stale lock may have been cleared
+
+    if "player_ids" in command:
+        player_ids = set(_int_list(command["player_ids"], "player_ids"))
+    else:
+        current = active_players_events.last(match_id).get("player_ids")
+        if current is None:
+            # nothing broadcast since the server started: continue from the stored lineup
+            latest = await latest_change(session, match_id)
+            current = latest.player_ids if latest else []
+        player_ids = set(current)
+        player_ids -= set(_int_list(command.get("out", []), "out"))
+        player_ids |= set(_int_list(command.get("in", []), "in"))
+    payload = {"player_ids": sorted(player_ids)}
+    # the substitution takes effect now: the clock the live page broadcast last, advanced since
+    clock = clock_events.current(match_id)
+    await record_change(
+        session, match_id, user,
+        clock.get("period") or match.current_period or 1, clock.get("clock_seconds") or 0,
+        payload["player_ids"], command.get("client_id"),
+    )
+    active_players_events.notify(match_id, payload)
+    return payload
+
+
+async def _clock(session: AsyncSession, user: User, match_id: int, command: dict) -> dict:
+    match = await get_match_or_404(session, match_id)
+    ensure_not_finalized(match, "Cannot modify clock for a finalized match")
+    if match.locked_by_user_id != user.id:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Only the match owner can control the clock")
+
+    action = command.get("action")
+    if action not in CLOCK_ACTIONS:
+        raise HTTPException(status_code=422, detail=f"Clock action must be one of {', '.join(CLOCK_ACTIONS)}")
+
+    # the owner's live page runs the clock: a device only starts or pauses it, as the last
+    # broadcast values may be seconds old and would set the running clock back; the page then
+    # broadcasts its own values
+    last = clock_events.current(match_id)
+    payload = {"clock_running": bool(last.get("clock_running")), "locked_by_user_id": user.id}
+    if action == "set":
+        for key in ("remaining_seconds", "clock_seconds", "period"):
+            if key in command:
+                if not isinstance(command[key], int) or command[key] < 0:
+                    raise HTTPException(status_code=422, detail=f"{key} must be a non-negative integer")
+                payload[key] = command[key]
+    else:
+        remaining = last.get("remaining_seconds")
+        if remaining is None:
+            remaining = (last.get("period_minutes") or match.period_minutes) * 60
+        if action == "start" and remaining <= 0:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Reset the clock before starting")
+        payload["clock_running"] = action == "start"
+    clock_events.notify(match_id, payload)
+    return {"clock": clock_events.current(match_id)}
+
+
+COMMANDS = {
+    "action": _action,
+    "substitution": _substitution,
+    "clock": _clock,
+}
+
+
+async def run_command(session: AsyncSession, user: User, match_id: int, command: dict) -> dict:
+    """Execute one scoring command; errors are raised as HTTPException like the REST endpoints."""
+    handler = COMMANDS.get(command.get("type"))
+    if handler is None:
+        raise HTTPException(status_code=400, detail=f"Unknown command type: {command.get('type')}")
+    return await handler(session, user, match_id, command)
@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.services.heatmap_service import match_shots, team_match_ids
+from backend.services.score_service import efficiency
+
+# rings around the nearest post: [0, 2), [2, 4), [4, 6), [6, 8) and 8 m or more
+RING_EDGES = (2.0, 4.0, 6.0, 8.0)
+# angle to the post: in front up to 45 degrees, beside it up to 135, behind it beyond that
+SECTOR_EDGES = (45.0, 135.0)
+SECTORS = ("front", "side", "behind")
+GROUPS = ("player", "match")
+
+RING_LABELS = [
+    f"{low:g}-{high:g} m" for low, high in zip((0.0,) + RING_EDGES, RING_EDGES)
+] + [f"{RING_EDGES[-1]:g}+ m"]
+
+
+def _cells(labels: List[str], made: np.ndarray, attempts: np.ndarray) -> List[dict]:
+    return [
+        {"label": label, "made": int(m), "attempts": int(a), "efficiency": efficiency(int(m), int(a))}
+        for label, m, a in zip(labels, made, attempts)
+    ]
+
+
+def zone_table(
+    keys: np.ndarray, distance: np.ndarray, angle: np.ndarray, made: np.ndarray
+) -> Dict[int, dict]:
+    """
+    Made shots and attempts per distance ring and angle sector, for every distinct key.
+
+    All groups are counted in one pass: each shot gets a flat (group, zone) index and one
+    ``bincount`` counts them all, so the cost is linear in the number of shots.
+    """
+    groups, index = np.unique(keys, return_inverse=True)
+    rings = np.digitize(distance, RING_EDGES)
+    sectors = np.digitize(angle, SECTOR_EDGES)
+
+    def count(zone: np.ndarray, zones: int):
+        cells = index * zones + zone
+        size = len(groups) * zones
+        attempts = np.bincount(cells, minlength=size).reshape(len(groups), zones)
+        hits = np.bincount(cells, weights=made, minlength=size).reshape(len(groups), zones)
+        return hits.astype(np.int64), attempts
+
+    ring_made, ring_attempts = count(rings, len(RING_LABELS))
+    sector_made, sector_attempts = count(sectors, len(SECTORS))
+    distance_sums = np.bincount(index, weights=distance, minlength=len(groups))
+
+    table = {}
+    for row, key in enumerate(groups.tolist()):
+        made_total, attempts = int(ring_made[row].sum()), int(ring_attempts[row].sum())
+        table[key] = {
+            "made": made_total,
+            "attempts": attempts,
+            "efficiency": efficiency(made_total, attempts),
+            "mean_distance": round(float(distance_sums[row]) / attempts, 2),
+            "rings": _cells(RING_LABELS, ring_made[row], ring_attempts[row]),
+            "sectors": _cells(list(SECTORS), sector_made[row], sector_attempts[row]),
+        }
+    return table
+
+
+def _empty_group() -> dict:
+    zeros = np.zeros(len(RING_LABELS), np.int64)
+    return {
+        "made": 0,
+        "attempts": 0,
+        "efficiency": None,
+        "mean_distance": None,
+        "rings": _cells(RING_LABELS, zeros, zeros),
+        "sectors": _cells(list(SECTORS), zeros[:len(SECTORS)], zeros[:len(SECTORS)]),
+    }
+
+
+async def shot_zones(session: AsyncSession, match_ids: List[int], group: str = "player") -> dict:
+    """Zone efficiency of the given matches, for the team and per player or per match."""
+    shots = await match_shots(session, match_ids)
+    parts = [(match_id, shots[match_id]) for match_id in match_ids if len(shots[match_id].x)]
+    if parts:
+        distance = np.concatenate([s.geometry()[0] for _, s in parts])
+        angle = np.concatenate([s.geometry()[1] for _, s in parts])
+        made = np.concatenate([s.made for _, s in parts])
+        if group == "match":
+            keys = np.concatenate([np.full(len(s.x), match_id, np.int64) for match_id, s in parts])
+        else:
+            keys = np.concatenate([s.player_ids for _, s in parts])
+        team = zone_table(np.zeros(len(made), np.int64), distance, angle, made)[0]
+        groups = zone_table(keys, distance, angle, made)
+    else:
+        team, groups = _empty_group(), {}
+
+    return {
+        "group": group,
+        "matches": len(match_ids),
+        "rings": RING_LABELS,
+        "sectors": list(SECTORS),
+        "team": team,
+        # shots registered without a player are only in the team row
+        "groups": [{"key": key, **counts} for key, counts in sorted(groups.items()) if key != -1],
+    }
+
+
+async def team_shot_zones(
+    session: AsyncSession,
+    team_id: int,
+    group: str = "player",
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> dict:
+    return await shot_zones(session, await team_match_ids(session, team_id, date_from, date_to), group)
@@ -0,0 +1,211 @@
+import asyncio
+import os
+import time
+from typing import Callable, Dict, List
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.models import Action, Match, Team
+from backend.services import action_events, active_players_events, clock_events
+from backend.services.listeners import call_listeners
+
+RECENT_ACTIONS = 10
+# snapshots older than this are rebuilt from the database on the next read
+SNAPSHOT_TTL = float(os.getenv("KORFBALL_SPECTATOR_SNAPSHOT_TTL", "30"))
+
+CLOCK_FIELDS = ("clock_running", "remaining_seconds", "period", "period_minutes", "total_periods")
+
+# listeners receive (match_id, delta); a delta holds the changed top-level snapshot keys and the new version
+Listener = Callable[[int, dict], None]
+_listeners: List[Listener] = []
+
+
+def add_listener(listener: Listener) -> None:
+    _listeners.append(listener)
+
+
+class MatchSnapshot:
+    """Read-only public state of one match: score, clock, lineup and the latest actions."""
+
+    def __init__(self, match_id: int):
+        self.match_id = match_id
+        self.data: Dict = {}
+        self.players: Dict[int, str] = {}
+        self.built_at = 0.0
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.built_at > SNAPSHOT_TTL
+
+
+_snapshots: Dict[int, MatchSnapshot] = {}
+_build_locks: Dict[int, asyncio.Lock] = {}
+_versions: Dict[int, int] = {}
+
+
+def _next_version(match_id: int) -> int:
+    _versions[match_id] = _versions.get(match_id, 0) + 1
+    return _versions[match_id]
+
+
+def _player_name(player) -> str:
+    return f"{player.first_name} {player.last_name}".strip()
+
+
+def _public_action(action: dict, players: Dict[int, str]) -> dict:
+    action_type = action.get("action")
+    return {
+        "id": action.get("id"),
+        "period": action.get("period"),
+        "timestamp": action.get("timestamp"),
+        "action": getattr(action_type, "value", action_type),
+        "result": bool(action.get("result")),
+        "is_opponent": bool(action.get("is_opponent")),
+        "player": players.get(action.get("player_id")),
+    }
+
+
+def _recent_key(action: dict) -> tuple:
+    return action.get("period") or 0, action.get("timestamp") or 0, action.get("id") or 0
+
+
+def _lineup(snapshot: MatchSnapshot) -> List[dict]:
+    # clock and lineup only live in the scorer's session; use what was last broadcast
+    return [
+        {"id": player_id, "name": snapshot.players.get(player_id, "")}
+        for player_id in active_players_events.last(snapshot.match_id).get("player_ids") or []
+    ]
+
+
+def _broadcast_clock(match_id: int) -> dict:
+    last = clock_events.last(match_id)
+    return {key: last[key] for key in CLOCK_FIELDS if last.get(key) is not None}
+
+
+def _clock(match: Match) -> dict:
+    clock = {
+        "clock_running": False,
+        "remaining_seconds": None,
+        "period": match.current_period,
+        "period_minutes": match.period_minutes,
+        "total_periods": match.total_periods,
+    }
+    clock.update(_broadcast_clock(match.id))
+    if match.is_finalized:
+        clock["clock_running"] = False
+    return clock
+
+
+async def _build(session: AsyncSession, match_id: int) -> MatchSnapshot:
+    match = (await session.execute(
+        select(Match)
+        .options(selectinload(Match.team).selectinload(Team.players))
+        .where(Match.id == match_id)
+    )).scalar_one_or_none()
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found")
+    actions = (await session.execute(
+        select(Action)
+        .where(Action.match_id == match_id)
+        .order_by(Action.period.desc(), Action.timestamp.desc(), Action.id.desc())
+        .limit(RECENT_ACTIONS)
+    )).scalars().all()
+
+    snapshot = MatchSnapshot(match_id)
+    snapshot.players = {player.id: _player_name(player) for player in match.team.players}
+    snapshot.data = {
+        "match_id": match_id,
+        "version": _next_version(match_id),
+        "team_name": match.team.name,
+        "opponent_name": match.opponent_name,
+        "team_score": match.team_score or 0,
+        "opponent_score": match.opponent_score or 0,
+        "is_finalized": bool(match.is_finalized),
+        "clock": _clock(match),
+        "lineup": [],
+        "recent_actions": [
+            _public_action(
+                {column: getattr(action, column) for column in (
+                    "id", "period", "timestamp", "action", "result", "is_opponent", "player_id")},
+                snapshot.players,
+            )
+            for action in actions
+        ],
+    }
+    snapshot.data["lineup"] = _lineup(snapshot)
+    snapshot.built_at = time.monotonic()
+    return snapshot
+
+
+async def get_snapshot(session: AsyncSession, match_id: int) -> dict:
+    """Return the cached snapshot of a match, rebuilding it when it is missing or stale."""
+    snapshot = _snapshots.get(match_id)
+    if snapshot is not None and not snapshot.is_stale:
+        return snapshot.data
+    lock = _build_locks.setdefault(match_id, asyncio.Lock())
+    async with lock:
+        # concurrent readers wait for the one rebuild instead of each running their own
+        snapshot = _snapshots.get(match_id)
+        if snapshot is None or snapshot.is_stale:
+            snapshot = _snapshots[match_id] = await _build(session, match_id)
+    return snapshot.data
+
+
+def _publish(snapshot: MatchSnapshot, delta: dict) -> None:
+    delta["version"] = snapshot.data["version"] = _next_version(snapshot.match_id)
+    snapshot.data.update(delta)
+    call_listeners(_listeners, snapshot.match_id, delta)
+
+
+def _on_action(match_id: int, payload: dict) -> None:
+    snapshot = _snapshots.get(match_id)
+    if snapshot is None:
+        return
+    delta = {}
+    if payload.get("score"):
+        delta["team_score"] = payload["score"].get("team_score", 0)
+        delta["opponent_score"] = payload["score"].get("opponent_score", 0)
+    action = _public_action(payload.get("action") or {}, snapshot.players)
+    recent = [a for a in snapshot.data["recent_actions"] if a["id"] != action["id"]]
+    if payload.get("type") == "deleted":
+        if len(recent) != len(snapshot.data["recent_actions"]):
+            snapshot.built_at = 0.0  # refill the list from the database on the next read
+    else:
+        recent = sorted(recent + [action], key=_recent_key, reverse=True)[:RECENT_ACTIONS]
+    if recent != snapshot.data["recent_actions"]:
+        delta["recent_actions"] = recent
+    if delta:
+        _publish(snapshot, delta)
+
+
+def _on_clock(match_id: int, payload: dict) -> None:
+    clock = {key: payload[key] for key in CLOCK_FIELDS if payload.get(key) is not None}
+    snapshot = _snapshots.get(match_id)
+    if snapshot is None:
+        return
+    delta = {}
+    if clock:
+        merged = {**snapshot.data["clock"], **clock}
+        if merged != snapshot.data["clock"]:
+            delta["clock"] = merged
+    if payload.get("is_finalized") is not None and bool(payload["is_finalized"]) != snapshot.data["is_finalized"]:
+        delta["is_finalized"] = bool(payload["is_finalized"])
+    if delta:
+        _publish(snapshot, delta)
+
+
+def _on_active_players(match_id: int, payload: dict) -> None:
+    snapshot = _snapshots.get(match_id)
+    if snapshot is None:
+        return
+    lineup = _lineup(snapshot)
+    if lineup != snapshot.data["lineup"]:
+        _publish(snapshot, {"lineup": lineup})
+
+
+action_events.add_listener(_on_action)
+clock_events.add_listener(_on_clock)
+active_players_events.add_listener(_on_active_players)
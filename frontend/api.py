@@ -4,6 +4,14 @@ from nicegui import app
 BASE_URL = "http://localhost:8855/api/v1"
 
 
+class ApiError(Exception):
+    """The API answered with an error status (as opposed to being unreachable)."""
+
+    def __init__(self, detail, status: int):
+        super().__init__(detail)
+        self.status = status
+
+
 def _auth_headers(token: str | None = None) -> dict:
     if token is None:
         try:
@@ -32,8 +40,8 @@ async def _request(
                 data = await r.text()
             if r.status >= 400:
                 if isinstance(data, dict) and "detail" in data:
-                    raise Exception(data["detail"])
-                raise Exception(data)
+                    raise ApiError(data["detail"], r.status)
+                raise ApiError(data, r.status)
             return data
 
 
@@ -41,6 +49,10 @@ async def api_get(path: str, token: str | None = None):
     return await _request("GET", path, token=token)
 
 
+async def api_get_public(path: str):
+    return await _request("GET", path, auth=False)
+
+
 async def api_post(path: str, payload: dict, token: str | None = None):
     return await _request("POST", path, payload, token=token)
         
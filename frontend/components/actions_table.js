@@ -0,0 +1,43 @@
+export default {
+  template: `
+    <q-table
+      :rows="localRows"
+      :columns="columns"
+      :row-key="rowKey"
+      :pagination="{ rowsPerPage: 0 }"
+      :virtual-scroll-item-size="itemSize"
+      virtual-scroll
+      hide-pagination
+    >
+      <template v-for="(_, slot) in $slots" v-slot:[slot]="slotProps">
+        <slot :name="slot" v-bind="slotProps || {}" />
+      </template>
+    </q-table>
+  `,
+  props: {
+    rows: Array,
+    columns: Array,
+    rowKey: String,
+    itemSize: Number,
+  },
+  data() {
+    return { localRows: [...(this.rows || [])] };
+  },
+  watch: {
+    // a full reset from the server (match change, manual refresh)
+    rows(value) {
+      this.localRows = [...(value || [])];
+    },
+  },
+  methods: {
+    insertRow(index, row) {
+      this.localRows.splice(index, 0, row);
+    },
+    replaceRow(index, row) {
+      this.localRows.splice(index, 1, row);
+    },
+    removeRow(index) {
+      this.localRows.splice(index, 1);
+    },
+  },
+};
@@ -0,0 +1,118 @@
+import bisect
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from nicegui.element import Element
+
+
+class OrderedRows:
+    """
+    Rows kept in sort order and indexed by key.
+
+    Every change returns the index it touched, so a browser-side copy of the list can
+    apply the same splice instead of receiving all rows again.
+    """
+
+    def __init__(self, sort_key: Callable[[Dict], Tuple], row_key: str = "id"):
+        self.sort_key = sort_key
+        self.row_key = row_key
+        self.rows: List[Dict] = []
+        self._keys: List[Tuple] = []
+        self._key_by_id: Dict[Hashable, Tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, row_id: Hashable) -> bool:
+        return row_id in self._key_by_id
+
+    def reset(self, rows: List[Dict]) -> None:
+        keyed = sorted(((self.sort_key(row), row) for row in rows), key=lambda item: item[0])
+        self.rows = [row for _, row in keyed]
+        self._keys = [key for key, _ in keyed]
+        self._key_by_id = {row[self.row_key]: key for key, row in keyed}
+
+    def _find(self, row_id: Hashable) -> int:
+        index = bisect.bisect_left(self._keys, self._key_by_id[row_id])
+        while self.rows[index][self.row_key] != row_id:
+            index += 1
+        return index
+
+    def insert(self, row: Dict) -> int:
+        key = self.sort_key(row)
+        index = bisect.bisect_right(self._keys, key)
+        self.rows.insert(index, row)
+        self._keys.insert(index, key)
+        self._key_by_id[row[self.row_key]] = key
+        return index
+
+    def remove(self, row_id: Hashable) -> Optional[int]:
+        if row_id not in self._key_by_id:
+            return None
+        index = self._find(row_id)
+        del self.rows[index]
+        del self._keys[index]
+        del self._key_by_id[row_id]
+        return index
+
+    def upsert(self, row: Dict) -> List[Tuple[str, int]]:
+        """Insert or replace a row; returns the ("insert" | "replace" | "remove", index) steps applied."""
+        row_id = row[self.row_key]
+        if self._key_by_id.get(row_id) == self.sort_key(row):
+            index = self._find(row_id)
+            self.rows[index] = row
+            return [("replace", index)]
+        steps: List[Tuple[str, int]] = []
+        if row_id in self._key_by_id:
+            steps.append(("remove", self.remove(row_id)))
+        steps.append(("insert", self.insert(row)))
+        return steps
+
+
+class ActionsTable(Element, component="actions_table.js"):
+    """
+    Quasar table with virtual scrolling that is updated one row at a time.
+
+    ``set_rows`` sends the full list (e.g. after switching matches); ``upsert`` and ``remove``
+    only send the changed row together with its position.
+    """
+
+    def __init__(
+        self,
+        columns: List[Dict],
+        sort_key: Callable[[Dict], Tuple],
+        row_key: str = "id",
+        column_defaults: Optional[Dict] = None,
+        item_size: int = 33,
+    ):
+        super().__init__()
+        self.ordered = OrderedRows(sort_key, row_key)
+        self._props["columns"] = [{**(column_defaults or {}), **column} for column in columns]
+        self._props["row-key"] = row_key
+        self._props["item-size"] = item_size
+        self._props["rows"] = []
+
+    def _sync_props(self) -> None:
+        # keep the server-side copy current for reconnects without resending it
+        with self.props.suspend_updates():
+            self._props["rows"] = list(self.ordered.rows)
+
+    def set_rows(self, rows: List[Dict]) -> None:
+        self.ordered.reset(rows)
+        self._props["rows"] = list(self.ordered.rows)
+        self.update()
+
+    def upsert(self, row: Dict) -> None:
+        for step, index in self.ordered.upsert(row):
+            if step == "remove":
+                self.run_method("removeRow", index)
+            elif step == "replace":
+                self.run_method("replaceRow", index, row)
+            else:
+                self.run_method("insertRow", index, row)
+        self._sync_props()
+
+    def remove(self, row_id: Hashable) -> None:
+        index = self.ordered.remove(row_id)
+        if index is not None:
+            self.run_method("removeRow", index)
+            self._sync_props()
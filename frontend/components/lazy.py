@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from nicegui import ui
+from nicegui.element import Element
+
+
+class LazyPanel:
+    """
+    Content of a container that only exists while it is shown.
+
+    ``show`` runs ``build`` inside the container the first time; ``hide`` deletes the built
+    elements again, so a client that never opens the panel never pays for it on the server.
+    """
+
+    def __init__(self, container: Element, build: Callable[[], None]):
+        self.container = container
+        self.build = build
+        self.is_built = False
+
+    def show(self) -> None:
+        if self.is_built:
+            return
+        with self.container:
+            self.build()
+        self.is_built = True
+
+    def hide(self) -> None:
+        if not self.is_built:
+            return
+        self.container.clear()
+        self.is_built = False
+
+    def set_visibility(self, visible: bool) -> None:
+        if visible:
+            self.show()
+        else:
+            self.hide()
+
+
+@contextmanager
+def transient_dialog(host: Element) -> Iterator[ui.dialog]:
+    """Build a dialog under ``host``, open it, and delete it once it has been closed."""
+    with host:
+        with ui.dialog() as dialog, ui.card():
+            yield dialog
+    # "hide" fires after the closing transition, so the dialog never disappears abruptly
+    dialog.on("hide", dialog.delete)
+    dialog.open()
+
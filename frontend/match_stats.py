@@ -0,0 +1,92 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.schema import ActionType
+
+# action types that count as a shot at the korf in the overall efficiency
+ATTEMPT_ACTIONS = [
+    ActionType.SHOT,
+    ActionType.KORTE_KANS,
+    ActionType.VRIJWORP,
+    ActionType.STRAFWORP,
+    ActionType.INLOPER,
+]
+_ATTEMPT_VALUES = {a.value for a in ATTEMPT_ACTIONS}
+
+Counted = Tuple[Optional[int], str, bool]  # (player id, action type, result) of a counted action
+
+
+def _pair() -> List[int]:
+    return [0, 0]  # success, attempts
+
+
+class MatchStats:
+    """
+    Success/attempt counters of one match, kept current from its action events.
+
+    Counters are held per action type for the match and per player, plus the shots of
+    ``ATTEMPT_ACTIONS``. The fields they depend on are remembered per action id, so a created,
+    updated or deleted action changes a handful of counters instead of recounting the match, and
+    the tables are rendered from the counters alone.
+    """
+
+    def __init__(self, actions: Iterable[Dict] = ()):
+        self.totals: Dict[str, List[int]] = {a.value: _pair() for a in ActionType}
+        self.shots = _pair()
+        self.players: Dict[int, Dict[str, List[int]]] = {}
+        self.player_shots: Dict[int, List[int]] = {}
+        self._counted: Dict[int, Counted] = {}
+        for action in actions:
+            self._add(action)
+
+    def __len__(self) -> int:
+        return len(self._counted)
+
+    @staticmethod
+    def _fields(action: Dict) -> Counted:
+        value = action["action"]
+        return action.get("player_id"), getattr(value, "value", value), bool(action.get("result"))
+
+    def _count(self, fields: Counted, sign: int) -> None:
+        player_id, action_type, result = fields
+        shot = action_type in _ATTEMPT_VALUES
+        pairs = [self.totals[action_type]]
+        if shot:
+            pairs.append(self.shots)
+        if player_id is not None:
+            player = self.players.get(player_id)
+            if player is None:
+                player = self.players[player_id] = {a.value: _pair() for a in ActionType}
+                self.player_shots[player_id] = _pair()
+            pairs.append(player[action_type])
+            if shot:
+                pairs.append(self.player_shots[player_id])
+        for pair in pairs:
+            pair[1] += sign
+            if result:
+                pair[0] += sign
+
+    def _add(self, action: Dict) -> None:
+        self._remove(action["id"])  # a repeated event must not count the action twice
+        fields = self._fields(action)
+        self._counted[action["id"]] = fields
+        self._count(fields, 1)
+
+    def _remove(self, action_id: int) -> None:
+        fields = self._counted.pop(action_id, None)
+        if fields is not None:
+            self._count(fields, -1)
+
+    def apply(self, payload: Dict) -> bool:
+        """Update the counters from an action event; False when it changed nothing."""
+        action = payload.get("action") or {}
+        if action.get("id") is None:
+            return False
+        if payload.get("type") == "deleted":
+            if action["id"] not in self._counted:
+                return False
+            self._remove(action["id"])
+        else:
+            if self._counted.get(action["id"]) == self._fields(action):
+                return False  # e.g. only the position or time was edited
+            self._add(action)
+        return True
@@ -0,0 +1,162 @@
+import asyncio
+import functools
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.services import action_events, active_players_events, clock_events
+from backend.services.score_service import score_delta
+from frontend.voice import VoiceIndex
+
+# event kinds passed to subscribers
+ACTION = "action"
+CLOCK = "clock"
+ACTIVE_PLAYERS = "active_players"
+RELOAD = "reload"
+
+Callback = Callable[[str, dict], None]
+Loader = Callable[[], Awaitable[Tuple[List[Dict], List[Dict]]]]
+
+
+class MatchView:
+    """
+    State of one match shared by every live client in this process that watches it.
+
+    Roster, stored actions, score, the players on the field, the clock and the voice lookup are
+    held once per match. Match events update the view once and are then handed to each
+    subscriber, which only adjusts its own UI.
+    """
+
+    def __init__(self, match_id: int):
+        self.match_id = match_id
+        self.players: List[Dict] = []
+        self.actions: Dict[int, Dict] = {}
+        self.score: Optional[Dict] = None  # {"team_score": .., "opponent_score": ..} of the stored actions
+        # players on the field as last broadcast, None until someone broadcast them
+        self.active_player_ids: Optional[List[int]] = active_players_events.last(match_id).get("player_ids")
+        self.loaded = False
+        self._load_lock = asyncio.Lock()
+        self._missed: List[dict] = []  # action events that arrive while the view is loading
+        self._subscribers: Dict[str, Tuple[object, Callback]] = {}
+        self._voice_index: Optional[VoiceIndex] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def clock(self) -> Dict:
+        """The clock the owner's page broadcast last, advanced to now; empty before any broadcast."""
+        return clock_events.current(self.match_id)
+
+    def subscribe(self, client, callback: Callback) -> None:
+        self._subscribers[client.id] = (client, callback)
+
+    def unsubscribe(self, client) -> None:
+        self._subscribers.pop(client.id, None)
+
+    async def load(self, loader: Loader, force: bool = False) -> None:
+        """Fill the view through ``loader`` unless another subscriber already did."""
+        async with self._load_lock:
+            if self.loaded and not force:
+                return
+            self._missed = []
+            self.loaded = False
+            players, actions = await loader()
+            self.players = list(players)
+            self.actions = {action["id"]: action for action in actions}
+            self.score = _score(self.actions.values())
+            for payload in self._missed:
+                self._apply_action(payload)
+            self._missed = []
+            self.loaded = True
+        if force:
+            self._publish(RELOAD, {})
+
+    def voice_index(self) -> VoiceIndex:
+        key = VoiceIndex.roster_key(self.players)
+        if self._voice_index is None or self._voice_index.key != key:
+            self._voice_index = VoiceIndex(self.players)
+        return self._voice_index
+
+    def apply(self, kind: str, payload: dict) -> None:
+        if kind == ACTION:
+            if self._load_lock.locked():
+                self._missed.append(payload)  # the snapshot being loaded may predate it
+            self._apply_action(payload)
+        elif kind == ACTIVE_PLAYERS and payload.get("player_ids") is not None:
+            self.active_player_ids = list(payload["player_ids"])
+        self._publish(kind, payload)
+
+    def _apply_action(self, payload: dict) -> None:
+        action = payload.get("action") or {}
+        if payload.get("type") == "deleted":
+            self.actions.pop(action.get("id"), None)
+        elif action.get("id") is not None:
+            self.actions[action["id"]] = action
+        if payload.get("score"):
+            self.score = payload["score"]
+
+    def _publish(self, kind: str, payload: dict) -> None:
+        for client, callback in list(self._subscribers.values()):
+            client.safe_invoke(functools.partial(callback, kind, payload))
+
+
+def _score(actions) -> Dict:
+    team = opponent = 0
+    for action in actions:
+        delta = score_delta(SimpleNamespace(**action))
+        team += delta[0]
+        opponent += delta[1]
+    return {"team_score": team, "opponent_score": opponent}
+
+
+_views: Dict[int, MatchView] = {}
+
+
+async def acquire(match_id: int, client, callback: Callback, loader: Loader) -> MatchView:
+    """Subscribe ``client`` to the shared view of a match, loading it on first use."""
+    view = _views.get(match_id)
+    if view is None:
+        view = _views[match_id] = MatchView(match_id)
+    view.subscribe(client, callback)
+    try:
+        await view.load(loader)
+    except Exception:
+        release(match_id, client)
+        raise
+    return view
+
+
+def release(match_id: int, client) -> None:
+    """Drop the subscription of ``client``; the view is evicted when nobody watches it anymore."""
+    view = _views.get(match_id)
+    if view is None:
+        return
+    view.unsubscribe(client)
+    if not view.subscriber_count:
+        _views.pop(match_id, None)
+
+
+def get(match_id: int) -> Optional[MatchView]:
+    return _views.get(match_id)
+
+
+def stats() -> Dict[str, int]:
+    return {
+        "matches": len(_views),
+        "subscribers": sum(view.subscriber_count for view in _views.values()),
+        "actions": sum(len(view.actions) for view in _views.values()),
+    }
+
+
+def _listener(kind: str) -> Callable[[int, dict], None]:
+    def dispatch(match_id: int, payload: dict) -> None:
+        view = _views.get(match_id)
+        if view is not None:
+            view.apply(kind, payload)
+    return dispatch
+
+
+action_events.add_listener(_listener(ACTION))
+clock_events.add_listener(_listener(CLOCK))
+active_players_events.add_listener(_listener(ACTIVE_PLAYERS))
@@ -0,0 +1,127 @@
+import json
+import logging
+import math
+import os
+import time
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, Tuple
+
+logger = logging.getLogger('uvicorn.error')
+
+# outbound websocket messages a single live client may receive per second
+MAX_MESSAGES_PER_SECOND = float(os.getenv("KORFBALL_MAX_MESSAGES_PER_SECOND", "4"))
+TRAFFIC_METER_ENABLED = os.getenv("KORFBALL_TRAFFIC_METER", "1") != "0"
+
+
+class LatencyTracker:
+    """
+    Rolling window of latency samples with percentile summaries.
+
+    Every ``report_every`` samples the current p50/p95 is written to the log, so slow
+    entry on the live page shows up in the server logs without extra tooling.
+    """
+
+    def __init__(self, name: str, window: int = 500, report_every: int = 50, clock: Callable[[], float] = time.perf_counter):
+        self.name = name
+        self.report_every = report_every
+        self.clock = clock
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def start(self) -> float:
+        return self.clock()
+
+    def stop(self, started: float) -> float:
+        elapsed = self.clock() - started
+        self.record(elapsed)
+        return elapsed
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+        if self.report_every and self.count % self.report_every == 0:
+            logger.info(f"{self.name} latency: {self.format_summary()}")
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile of the current window, in seconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": len(self.samples),
+            "p50_ms": round(self.percentile(50) * 1000, 1),
+            "p95_ms": round(self.percentile(95) * 1000, 1),
+            "max_ms": round(max(self.samples, default=0.0) * 1000, 1),
+        }
+
+    def format_summary(self) -> str:
+        s = self.summary()
+        return f"p50 {s['p50_ms']} ms, p95 {s['p95_ms']} ms, max {s['max_ms']} ms over {s['count']} samples"
+
+
+class TrafficMeter:
+    """
+    Outbound NiceGUI messages and bytes per client, bucketed per second.
+
+    The page counts its own pushes with ``count``: every broadcast event it handles and every
+    clock tick. NiceGUI sends the element changes of one callback as one update message, so one
+    push is one message; its size is taken from the event payload.
+    """
+
+    def __init__(self, window: int = 10, budget: float = MAX_MESSAGES_PER_SECOND, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.budget = budget
+        self.clock = clock
+        # client id -> deque of (second, messages, bytes)
+        self._buckets: Dict[str, Deque[list]] = defaultdict(deque)
+
+    def count(self, client_id: str, payload=None) -> None:
+        """Record one push to a client, sized by the payload it shows."""
+        self.record(client_id, len(json.dumps(payload, default=str)))
+
+    def forget(self, client_id: str) -> None:
+        self._buckets.pop(client_id, None)
+
+    def record(self, client_id: str, size: int) -> None:
+        second = int(self.clock())
+        buckets = self._buckets[client_id]
+        if buckets and buckets[-1][0] == second:
+            buckets[-1][1] += 1
+            buckets[-1][2] += size
+        else:
+            buckets.append([second, 1, size])
+        while buckets and buckets[0][0] <= second - self.window:
+            buckets.popleft()
+
+    def rates(self, client_id: str) -> Dict[str, float]:
+        now = int(self.clock())
+        buckets = [b for b in self._buckets.get(client_id, ()) if b[0] > now - self.window]
+        messages = sum(b[1] for b in buckets)
+        size = sum(b[2] for b in buckets)
+        return {
+            "messages_per_s": round(messages / self.window, 2),
+            "bytes_per_s": round(size / self.window, 1),
+            "peak_messages_per_s": max((b[1] for b in buckets), default=0),
+        }
+
+    def within_budget(self, client_id: str) -> bool:
+        return self.rates(client_id)["peak_messages_per_s"] <= self.budget
+
+    def report(self, client_id: str) -> Tuple[bool, str]:
+        r = self.rates(client_id)
+        text = (
+            f"{r['messages_per_s']} msg/s, {r['bytes_per_s']} B/s, "
+            f"peak {r['peak_messages_per_s']} msg/s (budget {self.budget:g}) over {self.window} s"
+        )
+        return self.within_budget(client_id), text
+
+
+# outbound traffic of live page clients
+live_traffic = TrafficMeter()
+
+# click on a result button until the new row is painted in the scorer's browser
+action_entry_latency = LatencyTracker("Action entry")
@@ -0,0 +1,293 @@
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, MutableMapping, Optional
+
+from frontend.api import ApiError, api_post, api_put
+
+logger = logging.getLogger('uvicorn.error')
+
+OUTBOX_KEY = "live_outbox"
+
+PENDING = "pending"
+FAILED = "failed"
+
+# statuses that are worth retrying later instead of giving up on the entry
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class FlushReport:
+    stored: List[Dict] = field(default_factory=list)  # actions as returned by the API
+    rejected: List[Dict] = field(default_factory=list)  # outbox entries the API refused
+    sent: int = 0
+    offline: bool = False
+
+
+class Outbox:
+    """
+    Persistent queue of live-page writes (actions, lineups and playtime) that still have to reach the API.
+
+    Entries are kept in a storage mapping (``app.storage.user`` on the live page), so they survive
+    reconnects and page reloads. Every action carries a client-generated id, which makes re-sending
+    after an unknown outcome safe: the API answers replays with the originally stored row.
+    """
+
+    def __init__(
+        self,
+        storage: MutableMapping,
+        key: str = OUTBOX_KEY,
+        batch_size: int = 25,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.storage = storage
+        self.key = key
+        self.batch_size = batch_size
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+
+        self.failures = 0  # consecutive attempts that could not reach the API
+        self.next_attempt_at = 0.0
+        self._flushing = False
+        self._flushed: Optional[asyncio.Event] = None  # set when the running flush ends
+        self._in_flight: set = set()  # ids of the entries in a request right now
+        self._entries: List[Dict] = [dict(entry) for entry in (storage.get(key) or [])]
+        # every tab of a user has its own outbox on the same storage key: ids of this outbox's
+        # entries and of all stored entries as of its last save, to merge with the other tabs
+        self._own_ids = {entry["id"] for entry in self._entries}
+        self._stored_ids = set(self._own_ids)
+
+    # ------------------------------------------------------------------
+    # QUEUE
+    # ------------------------------------------------------------------
+    @property
+    def entries(self) -> List[Dict]:
+        return list(self._entries)
+
+    @property
+    def pending_count(self) -> int:
+        return sum(1 for entry in self._entries if entry["status"] == PENDING)
+
+    @property
+    def failed_count(self) -> int:
+        return sum(1 for entry in self._entries if entry["status"] == FAILED)
+
+    def _save(self) -> None:
+        """Write this outbox's entries, keeping what other tabs queued on the same key."""
+        stored = list(self.storage.get(self.key) or [])
+        stored_ids = {entry["id"] for entry in stored}
+        # entries another tab sent or discarded since this one last saved are done
+        self._entries = [e for e in self._entries if e["id"] in stored_ids or e["id"] not in self._stored_ids]
+        own = {entry["id"]: entry for entry in self._entries}
+        removed = self._own_ids - own.keys()
+        entries = [
+            dict(own[entry["id"]]) if entry["id"] in own else dict(entry)
+            for entry in stored if entry["id"] not in removed
+        ] + [dict(entry) for entry in self._entries if entry["id"] not in stored_ids]
+        self._own_ids = set(own)
+        self._stored_ids = {entry["id"] for entry in entries}
+        if entries != stored:  # every assignment is a storage write
+            self.storage[self.key] = entries
+
+    def enqueue_action(self, payload: Dict) -> Dict:
+        payload = dict(payload)
+        payload["client_id"] = payload.get("client_id") or str(uuid.uuid4())
+        if hasattr(payload.get("action"), "value"):
+            payload["action"] = payload["action"].value
+        entry = {
+            "id": payload["client_id"],
+            "kind": "action",
+            "match_id": payload.get("match_id"),
+            "payload": payload,
+            "status": PENDING,
+            "error": None,
+        }
+        self._entries.append(entry)
+        self._save()
+        return entry
+
+    def enqueue_playtime(self, match_id: int, payload: Dict) -> Dict:
+        # playtime updates carry totals, so only the latest one per match matters
+        self._entries = [
+            entry for entry in self._entries
+            if not (entry["kind"] == "playtime" and entry["match_id"] == match_id)
+        ]
+        entry = {
+            "id": str(uuid.uuid4()),
+            "kind": "playtime",
+            "match_id": match_id,
+            "payload": {
+                **payload,
+                "player_time_registered_s": {str(k): v for k, v in payload.get("player_time_registered_s", {}).items()},
+            },
+            "status": PENDING,
+            "error": None,
+        }
+        self._entries.append(entry)
+        self._save()
+        return entry
+
+    def enqueue_lineup(self, match_id: int, payload: Dict) -> Dict:
+        # every change is kept: together they are the intervals the lineup analytics work on
+        payload = dict(payload)
+        payload["client_id"] = payload.get("client_id") or str(uuid.uuid4())
+        entry = {
+            "id": payload["client_id"],
+            "kind": "lineup",
+            "match_id": match_id,
+            "payload": payload,
+            "status": PENDING,
+            "error": None,
+        }
+        self._entries.append(entry)
+        self._save()
+        return entry
+
+    def actions_for_match(self, match_id: int) -> List[Dict]:
+        return [entry for entry in self._entries if entry["kind"] == "action" and entry["match_id"] == match_id]
+
+    def discard(self, entry_id: str) -> Optional[Dict]:
+        for idx, entry in enumerate(self._entries):
+            if entry["id"] == entry_id:
+                removed = self._entries.pop(idx)
+                self._save()
+                return removed
+        return None
+
+    def is_sending(self, entry_id: str) -> bool:
+        return entry_id in self._in_flight
+
+    def withdraw(self, entry_id: str) -> Optional[Dict]:
+        """Discard an entry unless it is being sent right now; None when in flight or already gone."""
+        if entry_id in self._in_flight:
+            return None
+        return self.discard(entry_id)
+
+    async def wait_for_flush(self) -> None:
+        """Return once the flush that is running, if any, has ended."""
+        if self._flushing and self._flushed is not None:
+            await self._flushed.wait()
+
+    def retry_failed(self) -> None:
+        for entry in self._entries:
+            if entry["status"] == FAILED:
+                entry["status"] = PENDING
+                entry["error"] = None
+        self.failures = 0
+        self.next_attempt_at = 0.0
+        self._save()
+
+    def discard_failed(self) -> List[Dict]:
+        removed = [entry for entry in self._entries if entry["status"] == FAILED]
+        self._entries = [entry for entry in self._entries if entry["status"] != FAILED]
+        self._save()
+        return removed
+
+    # ------------------------------------------------------------------
+    # SYNC
+    # ------------------------------------------------------------------
+    def _backoff(self) -> None:
+        self.failures += 1
+        delay = min(self.max_delay, self.base_delay * 2 ** (self.failures - 1))
+        self.next_attempt_at = self.clock() + delay
+
+    def _reject(self, entry: Dict, detail, report: FlushReport) -> None:
+        entry["status"] = FAILED
+        entry["error"] = str(detail)
+        report.rejected.append(entry)
+
+    async def flush(self, token: Optional[str] = None, force: bool = False) -> FlushReport:
+        """Send pending entries in batches; connection problems back off exponentially."""
+        report = FlushReport()
+        if self._flushing or not self.pending_count:
+            return report
+        if not force and self.clock() < self.next_attempt_at:
+            report.offline = True
+            return report
+
+        self._flushing = True
+        self._flushed = asyncio.Event()
+        try:
+            while True:
+                batch = [e for e in self._entries if e["status"] == PENDING and e["kind"] == "action"][:self.batch_size]
+                if not batch:
+                    break
+                await self._send_actions(batch, token, report)
+
+            for entry in [e for e in self._entries if e["status"] == PENDING and e["kind"] == "lineup"]:
+                await self._send_lineup(entry, token, report)
+
+            for entry in [e for e in self._entries if e["status"] == PENDING and e["kind"] == "playtime"]:
+                await self._send_playtime(entry, token, report)
+
+            self.failures = 0
+            self.next_attempt_at = 0.0
+        except Exception as e:
+            logger.warning(f"Outbox sync failed, will retry: {e}")
+            report.offline = True
+            self._backoff()
+        finally:
+            self._flushing = False
+            self._flushed.set()
+            self._save()
+        return report
+
+    async def _send_actions(self, batch: List[Dict], token: Optional[str], report: FlushReport) -> None:
+        self._in_flight = {entry["id"] for entry in batch}
+        try:
+            results = await api_post("/actions/batch", [entry["payload"] for entry in batch], token=token)
+        except ApiError as e:
+            if e.status in RETRYABLE_STATUSES:
+                raise
+            for entry in batch:
+                self._reject(entry, e, report)
+            return
+        finally:
+            self._in_flight = set()  # the outcome is handled below without yielding to the loop
+
+        by_client_id = {result.get("client_id"): result for result in results}
+        retry_later = False
+        for entry in batch:
+            result = by_client_id.get(entry["id"])
+            if result is None:
+                retry_later = True
+                continue
+            status = result.get("status", 500)
+            if status < 400:
+                if entry in self._entries:  # may already be acknowledged through the action event
+                    self._entries.remove(entry)
+                report.stored.append(result.get("action") or {})
+                report.sent += 1
+            elif status in RETRYABLE_STATUSES:
+                retry_later = True
+            else:
+                self._reject(entry, result.get("detail") or status, report)
+        if retry_later:
+            raise ApiError("Some actions could not be stored yet", 503)
+
+    async def _send_lineup(self, entry: Dict, token: Optional[str], report: FlushReport) -> None:
+        try:
+            await api_post(f"/matches/{entry['match_id']}/lineup", entry["payload"], token=token)
+        except ApiError as e:
+            if e.status in RETRYABLE_STATUSES:
+                raise
+            self._reject(entry, e, report)
+            return
+        self._entries.remove(entry)
+        report.sent += 1
+
+    async def _send_playtime(self, entry: Dict, token: Optional[str], report: FlushReport) -> None:
+        try:
+            await api_put(f"/playtime/{entry['match_id']}", entry["payload"], token=token)
+        except ApiError as e:
+            if e.status in RETRYABLE_STATUSES:
+                raise
+            self._reject(entry, e, report)
+            return
+        self._entries.remove(entry)
+        report.sent += 1
@@ -1,27 +1,20 @@
 from asyncio import events
 import logging
-from collections import defaultdict
 
 from nicegui import ui, events
 
-from backend.schema import ActionType
+from backend.field import IMAGE_UNITS_PER_METRE, field_to_image
+from backend.schema import ActionType, MatchType
+from backend.services import action_events
 from frontend.api import api_get, api_post
 from frontend.layout import apply_layout
+from frontend.match_stats import MatchStats
 
 from typing import Dict, List, Optional
+from urllib.parse import urlencode
 
 logger = logging.getLogger('uvicorn.error')
 
-# --- Helper List of ActionTypes that have a success/attempt count ---
-# Only include the action types you want to display with S/A format
-ATTEMPT_ACTIONS = [
-    ActionType.SHOT,
-    ActionType.KORTE_KANS,
-    ActionType.VRIJWORP,
-    ActionType.STRAFWORP,
-    ActionType.INLOPER,
-]
-
 @ui.page('/analysis')
 def analysis_page():
 
@@ -41,42 +34,31 @@ def analysis_page():
         async def load_matches(team_id=None):
             """Load matches. If team_id is given: filter only that team's matches."""
             if team_id:
-                matches = await api_get(f"/teams/{team_id}/matches")
+                matches = await api_get(f"/teams/{team_id}/matches/summary")
+                team_name = team_select.options.get(team_id, "")
+                show_seasons(team_id, [m.get("date") or "" for m in matches])
+                match_select.set_options({
+                    m["id"]: f'{m.get("date", "")[:10]} — {m.get("opponent_name", "")} ({team_name}) '
+                             f'{m.get("team_score", 0)}-{m.get("opponent_score", 0)}'
+                    for m in matches
+                })
             else:
                 matches = await api_get("/matches")
-
-            match_select.set_options({
-                m["id"]: f'{m.get("date", "")[:10]} — {m.get("opponent_name", "")} ({m["team"]["name"]})'
-                for m in matches
-            })
+                match_select.set_options({
+                    m["id"]: f'{m.get("date", "")[:10]} — {m.get("opponent_name", "")} ({m["team"]["name"]})'
+                    for m in matches
+                })
 
             match_select.value = None  # reset
 
         # ----------------------------------------------------------------------
         # NEW: OVERALL STATS CALCULATOR
         # ----------------------------------------------------------------------
-        def calculate_match_totals(actions: List[Dict]) -> List[Dict]:
+        def calculate_match_totals(stats: MatchStats) -> List[Dict]:
             """Calculates total success/attempt/efficiency for the entire match."""
-            
-            # Initialize totals structure
-            totals = {a.value: {"success": 0, "attempts": 0} for a in ActionType}
-            
-            overall_success = 0
-            overall_attempts = 0
-
-            # Count actions
-            for a in actions:
-                action_type = ActionType(a["action"])
-
-                totals[action_type.value]["attempts"] += 1
-                if a["result"]:
-                    totals[action_type.value]["success"] += 1
-
-                # Count overall goals/efficiency (using the defined ATTEMPT_ACTIONS)
-                if action_type in ATTEMPT_ACTIONS: 
-                    overall_attempts += 1
-                    if a["result"]:
-                        overall_success += 1
+            totals = {key: {"success": pair[0], "attempts": pair[1]} for key, pair in stats.totals.items()}
+            # overall goals/efficiency over the ATTEMPT_ACTIONS
+            overall_success, overall_attempts = stats.shots
 
             # Transpose and format for the table
             transposed_rows = []
@@ -119,71 +101,345 @@ def analysis_page():
         # ----------------------------------------------------------------------
         async def load_statistics(match_id: int):
             if not match_id:
+                follow_match(None)
+                replay_card.set_visibility(False)
+                heatmap_card.set_visibility(False)
+                rates_card.set_visibility(False)
+                plus_minus_card.set_visibility(False)
                 return
 
             match = await api_get(f"/matches/{match_id}")
             players = await api_get(f"/teams/{match['team']['id']}/players")
             actions = await api_get(f"/matches/{match_id}/actions")
 
-            # --- 1. Process Player Stats ---
-            stats = defaultdict(lambda: {
-                "name": "",
-                "number": "",
-                "actions": {a.value: {"success": 0, "attempts": 0} for a in ActionType},
-                "success": 0,
-                "attempts": 0,
-            })
-            
-            for p in players:
-                stats[p["id"]]["name"] = f"{p['first_name']} {p['last_name']}"
-                stats[p["id"]]["number"] = p["number"]
+            # --- 1. Player and overall stats, kept current while the match is played ---
+            live_stats.update(match_id=match_id, players=players, stats=MatchStats(actions))
+            render_statistics()
+            follow_match(match_id)
+
+            # --- 2. Prepare the replay slider ---
+            player_names.clear()
+            player_names.update({p["id"]: f"{p['first_name']} {p['last_name']}" for p in players})
+            replay.update(
+                match_id=match_id,
+                period_seconds=max(1, (match.get("period_minutes") or 25) * 60),
+                periods=match.get("total_periods") or 2,
+            )
+            last_t = max((a["timestamp"] for a in actions), default=0)
+            replay_slider._props["max"] = max(replay["period_seconds"] * replay["periods"], last_t)
+            replay_slider.update()
+            replay_slider.set_value(0)
+            replay_card.set_visibility(True)
+            await seek(0)
 
-            for a in actions:
-                pid = a["player_id"]
-                action_type = ActionType(a["action"])
+            # --- 3. Shot heatmap ---
+            heatmap_scope.update(match_id=match_id, team_id=match["team"]["id"], date=match.get("date") or "")
+            heatmap_card.set_visibility(True)
+            await refresh_heatmap()
 
-                if pid not in stats: continue
+            # --- 4. Rates per 25 minutes played ---
+            rates_card.set_visibility(True)
+            await refresh_rates()
 
-                stats[pid]["actions"][action_type.value]["attempts"] += 1
-                if a["result"]:
-                    stats[pid]["actions"][action_type.value]["success"] += 1
+            # --- 5. Plus/minus ---
+            plus_minus_card.set_visibility(True)
+            await refresh_plus_minus()
 
-                if action_type in ATTEMPT_ACTIONS:
-                    stats[pid]["attempts"] += 1
-                    if a["result"]:
-                        stats[pid]["success"] += 1
 
+        # ----------------------------------------------------------------------
+        # LIVE STATISTICS
+        # ----------------------------------------------------------------------
+        live_stats = {"match_id": None, "players": [], "stats": MatchStats(), "following": None}
+
+        def player_rows(stats: MatchStats, players: List[Dict]) -> List[Dict]:
             table_rows = []
-            for pid, s in stats.items():
+            for p in players:
+                actions = stats.players.get(p["id"], {})
+                success, attempts = stats.player_shots.get(p["id"], (0, 0))
                 row = {
-                    "player": s["name"],
-                    "nr": s["number"],
-                    "goals": s["success"],
-                    "efficiency":
-                        f"{round(100 * s['success'] / s['attempts'], 1)}%"
-                        if s["attempts"] else "-",
+                    "player": f"{p['first_name']} {p['last_name']}",
+                    "nr": p["number"],
+                    "goals": success,
+                    "efficiency": f"{round(100 * success / attempts, 1)}%" if attempts else "-",
                 }
-
                 for action in ActionType:
-                    action_key = action.value
-                    action_stats = s["actions"][action_key]
-                    s_count = action_stats["success"]
-                    a_count = action_stats["attempts"]
-
-                    row[action_key] = f"{s_count}/{a_count}" if a_count > 0 else "-"
-                    row[f'{action_key}_eff'] = (
-                        f"({round(100 * s_count / a_count, 1)}%)"
-                        if a_count > 0
-                        else ""
-                    )
+                    s_count, a_count = actions.get(action.value, (0, 0))
+                    row[action.value] = f"{s_count}/{a_count}" if a_count > 0 else "-"
+                    row[f"{action.value}_eff"] = f"({round(100 * s_count / a_count, 1)}%)" if a_count > 0 else ""
                 table_rows.append(row)
+            return table_rows
 
-            stats_table.rows = table_rows
-            
-            # --- 2. Process Overall Match Stats ---
-            overall_rows = calculate_match_totals(actions)
-            update_overall_table(overall_rows) # Call new function to update the second table
+        def render_statistics():
+            # proportional to players x action types, not to the actions of the match
+            stats_table.rows = player_rows(live_stats["stats"], live_stats["players"])
+            update_overall_table(calculate_match_totals(live_stats["stats"]))
+
+        def on_action_event(payload: Dict):
+            if live_stats["stats"].apply(payload):
+                render_statistics()
+
+        def follow_match(match_id: Optional[int]):
+            """Receive the action events of this match only, so a bench tablet follows it live."""
+            if live_stats["following"] is not None:
+                action_events.unsubscribe(live_stats["following"], page_client)
+            live_stats["following"] = match_id
+            if match_id is not None:
+                action_events.subscribe(match_id, page_client, on_action_event)
+
+        # ----------------------------------------------------------------------
+        # REPLAY
+        # ----------------------------------------------------------------------
+        replay = {"match_id": None, "period_seconds": 1500, "periods": 2, "target": None, "busy": False}
+        player_names: Dict[int, str] = {}
+
+        async def seek(seconds: int):
+            """Show the match state at a slider position; only the latest position is fetched."""
+            replay["target"] = seconds
+            if replay["busy"]:
+                return  # the running request picks up the newest target when it is done
+            replay["busy"] = True
+            try:
+                while replay["target"] is not None:
+                    seconds, replay["target"] = replay["target"], None
+                    period = min(replay["periods"], seconds // replay["period_seconds"] + 1)
+                    state = await api_get(f"/matches/{replay['match_id']}/state_at?period={period}&t={seconds}")
+                    show_state(state)
+            except Exception as exc:
+                logger.warning(f"Replay of match {replay['match_id']} failed: {exc}")
+            finally:
+                replay["busy"] = False
+
+        def show_state(state: Dict):
+            minutes, seconds = divmod(state["t"], 60)
+            replay_time.set_text(f"Half {state['period']} — {minutes:02d}:{seconds:02d}")
+            replay_score.set_text(f"{state['team_score']} - {state['opponent_score']}")
+            replay_table.rows = [
+                {
+                    "player": player_names.get(p["player_id"], p["player_id"]),
+                    "shots": f"{p['goals']}/{p['attempts']}",
+                    "efficiency": f"{round(100 * p['goals'] / p['attempts'], 1)}%" if p["attempts"] else "-",
+                }
+                for p in state["players"]
+            ]
+            replay_recent.set_text(", ".join(
+                f"{a['timestamp'] // 60:02d}:{a['timestamp'] % 60:02d} "
+                f"{'Opponent' if a['is_opponent'] else player_names.get(a['player_id'], '')} "
+                f"{a['action'].replace('_', ' ')}{' ✓' if a['result'] else ''}"
+                for a in state["recent_actions"]
+            ) or "-")
+
+
+        # ----------------------------------------------------------------------
+        # SHOT HEATMAP
+        # ----------------------------------------------------------------------
+        heatmap_scope = {"match_id": None, "team_id": None, "date": "", "data": None}
+        HEATMAP_COLORS = {"made": "#2e7d32", "missed": "#c62828", "all": "#ef6c00"}
+
+        def season_range(date: str) -> tuple[str, str]:
+            """A season runs from August to July."""
+            year, month = int(date[:4]), int(date[5:7])
+            start = year if month >= 8 else year - 1
+            return f"{start}-08-01T00:00:00", f"{start + 1}-07-31T23:59:59"
+
+        async def refresh_heatmap():
+            if not heatmap_scope["match_id"]:
+                return
+            if heatmap_range.value == "season" and heatmap_scope["date"]:
+                date_from, date_to = season_range(heatmap_scope["date"])
+                base = f"/teams/{heatmap_scope['team_id']}"
+                query = f"?date_from={date_from}&date_to={date_to}"
+            else:
+                base, query = f"/matches/{heatmap_scope['match_id']}", ""
+            try:
+                data = await api_get(f"{base}/heatmap{query}")
+                zones = await api_get(f"{base}/shot_zones{query}")
+            except Exception as exc:
+                logger.warning(f"Loading the shot heatmap failed: {exc}")
+                return
+            heatmap_scope["data"] = data
+            show_heatmap(data)
+            show_shot_zones(zones)
 
+        def show_shot_zones(zones: Dict):
+            def zone_row(name, group):
+                row = {
+                    "player": name,
+                    "distance": f"{group['mean_distance']} m" if group["mean_distance"] is not None else "-",
+                    "total": f"{group['made']}/{group['attempts']}",
+                }
+                for index, cell in enumerate(group["rings"] + group["sectors"]):
+                    row[f"zone{index}"] = (
+                        f"{cell['made']}/{cell['attempts']} ({cell['efficiency']}%)" if cell["attempts"] else "-"
+                    )
+                return row
+
+            zones_table.columns = [
+                {"name": "player", "label": "Player", "field": "player", "align": "left"},
+                {"name": "distance", "label": "Avg distance", "field": "distance", "align": "left"},
+                {"name": "total", "label": "Goals", "field": "total", "align": "left"},
+            ] + [
+                {"name": f"zone{index}", "label": label, "field": f"zone{index}", "align": "left"}
+                for index, label in enumerate(zones["rings"] + [s.capitalize() for s in zones["sectors"]])
+            ]
+            zones_table.rows = [
+                zone_row(player_names.get(group["key"], group["key"]), group) for group in zones["groups"]
+            ] + [zone_row("Team", zones["team"])]
+
+        def show_heatmap(data: Dict):
+            mode = heatmap_mode.value
+            if mode == "all":
+                grid = [[m + x for m, x in zip(made, missed)] for made, missed in zip(data["made"], data["missed"])]
+            else:
+                grid = data[mode]
+            highest = max((count for row in grid for count in row), default=0)
+            # cells are in metres, the overlay is drawn in the units of the field image
+            cell_w = data["width"] / data["bins_x"]
+            cell_h = data["height"] / data["bins_y"]
+            color = HEATMAP_COLORS[mode]
+            rects = []
+            for row, counts in enumerate(grid):
+                for col, count in enumerate(counts):
+                    if not count:
+                        continue
+                    x, y = field_to_image(col * cell_w, row * cell_h)
+                    rects.append(
+                        f'<rect x="{x:.1f}" y="{y:.1f}" width="{cell_w * IMAGE_UNITS_PER_METRE:.1f}" '
+                        f'height="{cell_h * IMAGE_UNITS_PER_METRE:.1f}" fill="{color}" '
+                        f'fill-opacity="{0.15 + 0.7 * count / highest:.2f}"><title>{count}</title></rect>'
+                    )
+            heatmap_image.content = "".join(rects)
+            heatmap_summary.set_text(
+                f"{data['made_total']} made, {data['missed_total']} missed in {data['matches']} match(es)"
+            )
+
+        # ----------------------------------------------------------------------
+        # RATES PER 25 MINUTES PLAYED
+        # ----------------------------------------------------------------------
+        RATE_STATS = ["goals", "attempts", "rebounds", "assists", "steals"]
+
+        async def refresh_rates():
+            # shares the match and season of the heatmap
+            if not heatmap_scope["match_id"]:
+                return
+            if rates_range.value == "season" and heatmap_scope["date"]:
+                date_from, date_to = season_range(heatmap_scope["date"])
+                path = f"/teams/{heatmap_scope['team_id']}/player_rates?date_from={date_from}&date_to={date_to}"
+            else:
+                path = f"/matches/{heatmap_scope['match_id']}/player_rates"
+            try:
+                rates = await api_get(path)
+            except Exception as exc:
+                logger.warning(f"Loading the player rates failed: {exc}")
+                return
+            rates_table.rows = [
+                {
+                    "player": player_names.get(r["player_id"], r["player_id"]),
+                    "matches": r["matches"],
+                    "minutes": r["minutes_played"],
+                    "efficiency": f"{r['efficiency']}%" if r["efficiency"] is not None else "-",
+                    **{stat: r["per_25"][stat] for stat in RATE_STATS},
+                }
+                for r in rates
+            ]
+
+        # ----------------------------------------------------------------------
+        # PLUS/MINUS
+        # ----------------------------------------------------------------------
+        def on_field_row(name: str, row: Dict) -> Dict:
+            return {
+                "name": name,
+                "minutes": round(row["seconds"] / 60, 1),
+                "for": row["goals_for"],
+                "against": row["goals_against"],
+                "plus_minus": f"{row['plus_minus']:+d}",
+                "efficiency": f"{row['efficiency']}%" if row["efficiency"] is not None else "-",
+            }
+
+        async def refresh_plus_minus():
+            if not heatmap_scope["match_id"]:
+                return
+            query = f"size={plus_minus_size.value}"
+            if plus_minus_range.value == "season" and heatmap_scope["date"]:
+                date_from, date_to = season_range(heatmap_scope["date"])
+                path = f"/teams/{heatmap_scope['team_id']}/plus_minus?{query}&date_from={date_from}&date_to={date_to}"
+            else:
+                path = f"/matches/{heatmap_scope['match_id']}/plus_minus?{query}"
+            try:
+                data = await api_get(path)
+            except Exception as exc:
+                logger.warning(f"Loading plus/minus failed: {exc}")
+                return
+            plus_minus_players.rows = [
+                on_field_row(player_names.get(row["player_id"], str(row["player_id"])), row) for row in data["players"]
+            ]
+            plus_minus_combinations.rows = [
+                on_field_row(", ".join(player_names.get(pid, str(pid)) for pid in row["player_ids"]), row)
+                for row in data["combinations"]
+            ]
+            plus_minus_summary.set_text(
+                f"Not attributed (no lineup registered yet): {data['unattributed_for']} for, "
+                f"{data['unattributed_against']} against"
+                if data["unattributed_for"] or data["unattributed_against"] else ""
+            )
+
+        # ----------------------------------------------------------------------
+        # SEASON TOTALS
+        # ----------------------------------------------------------------------
+        season_scope = {"team_id": None, "names": {}}
+
+        def show_seasons(team_id: int, dates: List[str]):
+            starts = sorted({season_range(date)[0][:10] for date in dates if date}, reverse=True)
+            season_scope["team_id"] = None  # on_team_change loads the totals once the filters are set
+            season_select.set_options({"": "All matches", **{d: f"{d[:4]}/{int(d[2:4]) + 1:02d}" for d in starts}})
+            season_select.value = starts[0] if starts else ""
+            season_scope["team_id"] = team_id
+            season_card.set_visibility(True)
+
+        def totals_text(success: int, attempts: int, efficiency: Optional[float]) -> str:
+            return f"{success}/{attempts} ({efficiency}%)" if efficiency is not None else "-"
+
+        async def refresh_season():
+            team_id = season_scope["team_id"]
+            if not team_id:
+                return
+            params = {"team_id": team_id}
+            if season_select.value:
+                params["date_from"], params["date_to"] = season_range(season_select.value)
+            if season_type.value:
+                params["match_type"] = season_type.value
+            if season_opponent.value:
+                params["opponent"] = season_opponent.value
+            if season_location.value:
+                params["location"] = season_location.value
+            try:
+                if not season_scope["names"].get(team_id):
+                    players = await api_get(f"/teams/{team_id}/players")
+                    season_scope["names"][team_id] = {p["id"]: f"{p['first_name']} {p['last_name']}" for p in players}
+                data = await api_get(f"/stats/aggregate?{urlencode(params)}")
+            except Exception as exc:
+                logger.warning(f"Loading the season totals failed: {exc}")
+                return
+            names = season_scope["names"][team_id]
+            season_summary.set_text(
+                f"{data['matches']} matches — goals {totals_text(data['goals'], data['attempts'], data['efficiency'])}, "
+                f"{data['opponent_goals']} against"
+            )
+            season_actions.rows = [
+                {"action": a["action"].replace("_", " ").title(),
+                 "display": totals_text(a["success"], a["attempts"], a["efficiency"])}
+                for a in data["actions"]
+            ]
+            season_players.rows = [
+                {
+                    "player": names.get(p["player_id"], str(p["player_id"])),
+                    "goals": p["goals"],
+                    "attempts": p["attempts"],
+                    "efficiency": f"{p['efficiency']}%" if p["efficiency"] is not None else "-",
+                    **{a.value: "-" for a in ActionType},
+                    **{a["action"]: f"{a['success']}/{a['attempts']}" for a in p["actions"]},
+                }
+                for p in data["players"]
+            ]
 
         # ----------------------------------------------------------------------
         # NEW: OVERALL TABLE RENDERER
@@ -198,7 +454,11 @@ def analysis_page():
         # ----------------------------------------------------------------------
 
         async def on_team_change(team_id):
+            if not team_id:
+                season_scope["team_id"] = None
+                season_card.set_visibility(False)
             await load_matches(team_id)
+            await refresh_season()
 
         async def on_match_change(match_id):
             logger.info(f"Selected match ID: {match_id}")
@@ -246,6 +506,72 @@ def analysis_page():
                     row_key="metric",
                 ).classes("w-96 q-table--dense") # Use a fixed width for a cleaner look
         
+        with ui.card().classes("p-4 w-full") as season_card:
+            with ui.row().classes("items-center gap-4"):
+                ui.label("Season totals").classes("text-xs font-bold text-grey-6")
+                season_select = ui.select({"": "All matches"}, value="", label="Season",
+                                          on_change=lambda e: refresh_season()).classes("w-32")
+                season_type = ui.select({"": "All types", **{t.value: t.value.title() for t in MatchType}}, value="",
+                                        label="Match type", on_change=lambda e: refresh_season()).classes("w-32")
+                season_opponent = ui.input("Opponent").props("debounce=400").on_value_change(lambda e: refresh_season())
+                season_location = ui.input("Location").props("debounce=400").on_value_change(lambda e: refresh_season())
+                season_summary = ui.label("").classes("text-caption")
+            with ui.row().classes("items-start gap-8"):
+                season_actions = ui.table(
+                    columns=[
+                        {"name": "action", "label": "Action", "field": "action", "align": "left"},
+                        {"name": "display", "label": "Success/attempts", "field": "display", "align": "left"},
+                    ],
+                    rows=[],
+                    row_key="action",
+                ).classes("q-table--dense")
+                season_players = ui.table(
+                    columns=[
+                        {"name": "player", "label": "Player", "field": "player", "align": "left", "sortable": True},
+                        {"name": "goals", "label": "Goals", "field": "goals", "align": "left", "sortable": True},
+                        {"name": "attempts", "label": "Attempts", "field": "attempts", "align": "left", "sortable": True},
+                        {"name": "efficiency", "label": "Efficiency", "field": "efficiency", "align": "left"},
+                    ] + [
+                        {"name": a.value, "label": a.value.replace("_", " ").title(), "field": a.value, "align": "left"}
+                        for a in ActionType if a is not ActionType.OPPONENT_GOAL
+                    ],
+                    rows=[],
+                    row_key="player",
+                    pagination=20,
+                ).classes("q-table--dense")
+        season_card.set_visibility(False)
+
+        with ui.card().classes("p-4 w-full") as replay_card:
+            ui.label("Replay").classes("text-xs font-bold text-grey-6")
+            replay_slider = ui.slider(min=0, max=3000, step=1, value=0, on_change=lambda e: seek(int(e.value or 0)))
+            with ui.row().classes("items-center gap-8"):
+                replay_time = ui.label("")
+                replay_score = ui.label("").classes("text-lg font-bold")
+            replay_recent = ui.label("").classes("text-caption")
+            replay_table = ui.table(
+                columns=[
+                    {"name": "player", "label": "Player", "field": "player", "align": "left"},
+                    {"name": "shots", "label": "Goals", "field": "shots", "align": "left"},
+                    {"name": "efficiency", "label": "Efficiency", "field": "efficiency", "align": "left"},
+                ],
+                rows=[],
+                row_key="player",
+            ).classes("w-96 q-table--dense")
+        replay_card.set_visibility(False)
+
+        with ui.card().classes("p-4") as heatmap_card:
+            with ui.row().classes("items-center gap-4"):
+                ui.label("Shot heatmap").classes("text-xs font-bold text-grey-6")
+                heatmap_range = ui.toggle({"match": "Match", "season": "Season"}, value="match",
+                                          on_change=lambda e: refresh_heatmap())
+                heatmap_mode = ui.toggle({"all": "All", "made": "Made", "missed": "Missed"}, value="all",
+                                         on_change=lambda e: heatmap_scope["data"] and show_heatmap(heatmap_scope["data"]))
+                heatmap_summary = ui.label("").classes("text-caption")
+            heatmap_image = ui.interactive_image("korfball_field.svg", sanitize=False).style("width: 600px; height: auto")
+            ui.label("Shots by distance and angle to the nearest post").classes("text-xs font-bold text-grey-6")
+            zones_table = ui.table(columns=[], rows=[], row_key="player").classes("q-table--dense")
+        heatmap_card.set_visibility(False)
+
         with ui.row().classes("items-start gap-8"):
     
             with ui.card().classes("p-4"):
@@ -269,6 +595,51 @@ def analysis_page():
                     row_key="player"
                 ).classes("w-full q-table--dense")
 
+        ON_FIELD_COLUMNS = [
+            {"name": "name", "label": "Players", "field": "name", "align": "left"},
+            {"name": "minutes", "label": "Minutes", "field": "minutes", "align": "left", "sortable": True},
+            {"name": "for", "label": "For", "field": "for", "align": "left", "sortable": True},
+            {"name": "against", "label": "Against", "field": "against", "align": "left", "sortable": True},
+            {"name": "plus_minus", "label": "+/-", "field": "plus_minus", "align": "left"},
+            {"name": "efficiency", "label": "Efficiency", "field": "efficiency", "align": "left"},
+        ]
+
+        with ui.card().classes("p-4") as plus_minus_card:
+            with ui.row().classes("items-center gap-4"):
+                ui.label("Plus/minus on the field").classes("text-xs font-bold text-grey-6")
+                plus_minus_range = ui.toggle({"match": "Match", "season": "Season"}, value="match",
+                                             on_change=lambda e: refresh_plus_minus())
+                plus_minus_size = ui.select({2: "Pairs", 4: "Fours", 8: "Full lineups"}, value=4,
+                                            label="Combinations", on_change=lambda e: refresh_plus_minus()).classes("w-32")
+                plus_minus_summary = ui.label("").classes("text-caption")
+            with ui.row().classes("items-start gap-8"):
+                plus_minus_players = ui.table(columns=ON_FIELD_COLUMNS, rows=[], row_key="name").classes("q-table--dense")
+                plus_minus_combinations = ui.table(
+                    columns=ON_FIELD_COLUMNS, rows=[], row_key="name", pagination=10,
+                ).classes("q-table--dense")
+        plus_minus_card.set_visibility(False)
+
+        with ui.card().classes("p-4") as rates_card:
+            with ui.row().classes("items-center gap-4"):
+                ui.label("Per 25 minutes played").classes("text-xs font-bold text-grey-6")
+                rates_range = ui.toggle({"match": "Match", "season": "Season"}, value="match",
+                                        on_change=lambda e: refresh_rates())
+            rates_table = ui.table(
+                columns=[
+                    {"name": "player", "label": "Player", "field": "player", "align": "left", "sortable": True},
+                    {"name": "matches", "label": "Matches", "field": "matches", "align": "left", "sortable": True},
+                    {"name": "minutes", "label": "Minutes", "field": "minutes", "align": "left", "sortable": True},
+                ] + [
+                    {"name": stat, "label": stat.title(), "field": stat, "align": "left", "sortable": True}
+                    for stat in RATE_STATS
+                ] + [
+                    {"name": "efficiency", "label": "Efficiency", "field": "efficiency", "align": "left"},
+                ],
+                rows=[],
+                row_key="player",
+            ).classes("q-table--dense")
+        rates_card.set_visibility(False)
+
         # ----------------------------------------------------------------------
         # CUSTOM SLOTS FOR S/A
         # ----------------------------------------------------------------------
@@ -303,6 +674,8 @@ def analysis_page():
         async def refresh_all():
             await load_teams()
 
+        page_client = ui.context.client
+        page_client.on_disconnect(lambda: follow_match(None))
         ui.timer(0, refresh_all, once=True)
 
     apply_layout(content, page_title="Analysis")
\ No newline at end of file
@@ -1,19 +1,25 @@
 import asyncio
 from asyncio import events
-import difflib
 import logging
+import uuid
 
-from nicegui import app, ui, events
+from nicegui import app, background_tasks, ui, events
 
+from backend.field import image_to_field
 from backend.schema import ActionType
-from frontend.api import api_post
+from frontend.components.actions_table import ActionsTable
+from frontend.components.lazy import LazyPanel, transient_dialog
+from frontend import match_view
+from frontend.api import ApiError
 from frontend.layout import apply_layout
-from frontend.pages.live_controller import get_live_controller
-from backend.services.action_events import subscribe as subscribe_actions, unsubscribe as unsubscribe_actions
+from frontend.metrics import TRAFFIC_METER_ENABLED, action_entry_latency, live_traffic
+from frontend.pages.live_controller import CLOCK_BROADCAST_INTERVAL, get_live_controller
+from frontend.storage import DebouncedWriter
+from frontend.voice import NO_RESULT_ACTIONS
 from backend.services.join_events import subscribe as subscribe_joins, unsubscribe as unsubscribe_joins
 from backend.services.join_decision_events import subscribe as subscribe_join_decisions, unsubscribe as unsubscribe_join_decisions
-from backend.services.clock_events import subscribe as subscribe_clock, unsubscribe as unsubscribe_clock, notify as notify_clock
-from backend.services.active_players_events import subscribe as subscribe_active_players, unsubscribe as unsubscribe_active_players, notify as notify_active_players
+from backend.services.clock_events import notify as notify_clock
+from backend.services.active_players_events import notify as notify_active_players
 
 from typing import List
 
@@ -22,10 +28,11 @@ logger = logging.getLogger('uvicorn.error')
 
 
 class PlayerButton(ui.button):
-    def __init__(self, player_id, player_name, active, selected, on_click, *args, **kwargs):
+    def __init__(self, player_id, player_name, active, selected, on_click, *args, editable=True, **kwargs):
         self.player_id = player_id
         self._active = active # player is on the field
         self._selected = selected # player is select for inputting
+        self._editable = editable # current user may enter actions
         self._on_click = on_click
         super().__init__(player_name, *args, **kwargs)
         self.on('click', self.toggle)
@@ -45,17 +52,78 @@ class PlayerButton(ui.button):
         with self.props.suspend_updates():
             if not self._active:
                 self.props(f'color="grey-4"')
-                self.disable()
+            elif self._selected:
+                self.props(f'color="red"')
             else:
+                self.props(f'color="green"')
+            if self._active and self._editable:
                 self.enable()
-                if self._selected:
-                    self.props(f'color="red"')
-                else:
-                    self.props(f'color="green"')
+            else:
+                self.disable()
         super().update()
 
 
 
+class PlayerCard(ui.grid):
+    """
+    Player button, on-field switch and playtime label of one player.
+
+    Cards stay mounted while the roster is unchanged; ``set_state`` and ``set_time`` only
+    touch the parts whose value actually changed.
+    """
+
+    def __init__(self, player, active, selected, editable, time_text, on_select, on_switch):
+        super().__init__()
+        self.classes("grid-cols-[auto_3rem_4rem] items-center gap-2")
+        self.player_id = player["id"]
+        self._on_switch = on_switch
+        self._editable = editable
+        with self:
+            self.button = PlayerButton(
+                player_id=self.player_id,
+                player_name=format_player_label(player),
+                active=active,
+                selected=selected,
+                on_click=on_select,
+                editable=editable,
+            )
+            self.switch = ui.switch(value=active, on_change=self._handle_switch)
+            self.time_label = ui.label(time_text).classes("text-xs text-grey-6")
+        self._apply_editable()
+
+    def _handle_switch(self, e):
+        # programmatic updates from set_state already match the button state
+        if bool(e.value) == self.button._active:
+            return None
+        return self._on_switch(e, self.player_id, self)
+
+    def _apply_editable(self) -> None:
+        if self._editable:
+            self.switch.enable()
+        else:
+            self.switch.disable()
+
+    def set_state(self, active: bool, selected: bool, editable: bool) -> None:
+        if (active, selected, editable) != (self.button._active, self.button._selected, self.button._editable):
+            self.button._active = active
+            self.button._selected = selected
+            self.button._editable = editable
+            self.button.update()
+        if self.switch.value != active:
+            self.switch.value = active
+        if editable != self._editable:
+            self._editable = editable
+            self._apply_editable()
+
+    def set_time(self, text: str) -> None:
+        if self.time_label.text != text:
+            self.time_label.text = text
+
+
+def format_player_label(player) -> str:
+    return f"{player.get('first_name', 'Unknown')} ({player.get('number', '')})"
+
+
 ACTION_LABELS = {
     ActionType.SHOT: "Schot",
     ActionType.KORTE_KANS: "Korte kans",
@@ -109,11 +177,13 @@ def live_page():
         state.api_token = app.storage.user.get("token")
         state.user_id = app.storage.user.get("user_id")
         state.username = app.storage.user.get("username")
+        page_client = ui.context.client
 
         # ---------------------------------------------------------------
         # HELPERS
         # ---------------------------------------------------------------
         LIVE_STATE_KEY = "live_state"
+        LIVE_STATE_WRITE_DELAY = 2.0
 
         async def load_teams():
             teams = await controller.load_teams(token=state.api_token)
@@ -158,156 +228,82 @@ def live_page():
             if not can_edit_match():
                 ui.notify("Match is locked by another user", type="warning")
                 return
-
-            text = command.strip().lower()
-            if not text:
+            if not command.strip():
                 return
 
-            def normalize(text_value: str) -> str:
-                cleaned = "".join(ch if ch.isalnum() or ch.isspace() else " " for ch in text_value.lower())
-                return " ".join(cleaned.split())
-
-            text = normalize(text)
-
             async def confirm_voice_choice(message: str) -> bool:
                 done = asyncio.Event()
                 result = {"value": False}
-                with ui.dialog() as dialog, ui.card():
+                with transient_dialog(dialog_host) as dialog:
                     ui.label(message).classes("text-sm")
                     with ui.row().classes("gap-2 mt-2"):
                         ui.button("OK", on_click=lambda: (result.update(value=True), dialog.close(), done.set()))
                         ui.button("Cancel", on_click=lambda: (dialog.close(), done.set()))
-                dialog.open()
                 await done.wait()
                 return result["value"]
 
             # Strict order: action -> player -> result
-            tokens = text.split()
-            if len(tokens) < 2:
-                ui.notify("Voice format: actie speler resultaat", type="warning")
-                return
-            result_words = {"ok", "oke", "score", "raak", "doelpunt", "goal", "gemist", "mis", "naast"}
-            result_index = None
-            for idx, token in enumerate(tokens):
-                if token in result_words:
-                    result_index = idx
-                    break
-            special_no_result = {ActionType.REBOUND, ActionType.ASSIST, ActionType.STEAL}
-            if result_index is None:
-                action_words = tokens[0]
-                player_words = " ".join(tokens[1:]).strip()
-                result_word = None
-            else:
-                if result_index == 0:
-                    ui.notify("Say result last: ok/score or gemist/mis", type="warning")
-                    return
-                action_words = " ".join(tokens[:max(1, result_index - 1)]).strip()
-                player_words = " ".join(tokens[max(1, result_index - 1):result_index]).strip()
-                result_word = tokens[result_index]
-
-            # Select action
-            action_phrases = {
-                "schot": ActionType.SHOT,
-                "korte kans": ActionType.KORTE_KANS,
-                "kortekans": ActionType.KORTE_KANS,
-                "vrijworp": ActionType.VRIJWORP,
-                "strafworp": ActionType.STRAFWORP,
-                "penalty": ActionType.STRAFWORP,
-                "inloper": ActionType.INLOPER,
-                "rebound": ActionType.REBOUND,
-                "assist": ActionType.ASSIST,
-                "steun": ActionType.ASSIST,
-                "steal": ActionType.STEAL,
-                "stelen": ActionType.STEAL,
-            }
-            def best_match(value: str, candidates: list[str]) -> tuple[str | None, float]:
-                best_score = 0.0
-                best_value = None
-                for candidate in candidates:
-                    score = difflib.SequenceMatcher(None, value, candidate).ratio()
-                    if score > best_score:
-                        best_score = score
-                        best_value = candidate
-                return best_value, best_score
-
-            action_value, action_score = best_match(action_words, list(action_phrases.keys()))
-            if not action_value or action_score < 0.65:
+            parsed = controller.voice_index().parse(command)
+            action = parsed.action
+            if not action or action.score < 0.65:
                 ui.notify("Action not recognized", type="warning")
                 return
-            if action_score < 0.8:
-                if not await confirm_voice_choice(f'Action "{action_value}"?'):
+            if action.score < 0.8:
+                if not await confirm_voice_choice(f'Action "{action.label}"?'):
                     return
-            on_action_button_click(action_phrases[action_value])
-            action_type = action_phrases[action_value]
-            if result_word is None and action_type not in special_no_result:
+            action_type = action.value
+            if parsed.result is None and action_type not in NO_RESULT_ACTIONS:
                 ui.notify("Say result last: ok/score or gemist/mis", type="warning")
                 return
-
-            matched_player_label = None
-
-            # Select player by number
-            player_tokens = [t for t in player_words.split() if t not in {"speler", "nummer"}]
-            for token in player_tokens:
-                if token.isdigit():
-                    number = int(token)
-                    for player in state.players:
-                        if player.get("number") == number:
-                            on_player_button_click(player["id"])
-                            player_words = ""
-                            matched_player_label = f"#{number}"
-                            break
-
-            # Select player by fuzzy name match
-            candidates = []
-            candidate_map = {}
-            for player in state.players:
-                first = (player.get("first_name") or "").lower().strip()
-                last = (player.get("last_name") or "").lower().strip()
-                full = f"{first} {last}".strip()
-                for name in [first, last, full]:
-                    if not name:
-                        continue
-                    candidates.append(name)
-                    candidate_map[name] = player["id"]
-
-            if player_words:
-                best_player, player_score = best_match(player_words, candidates)
-                if not best_player or player_score < 0.65:
+            if state.current_action != action_type:
+                on_action_button_click(action_type)
+
+            # Select player by number or name; without player words the current selection is used
+            player_label = "speler"
+            if parsed.player_text:
+                player = parsed.player
+                if not player or player.score < 0.65:
                     ui.notify("Player not recognized", type="warning")
                     return
-                if player_score < 0.85:
-                    if not await confirm_voice_choice(f'Player "{best_player}"?'):
+                if player.score < 0.85 or parsed.player_is_ambiguous():
+                    if not await confirm_voice_choice(f'Player "{player.label}"?'):
                         return
-                on_player_button_click(candidate_map[best_player])
-                matched_player_label = best_player
+                if player.value not in state.active_player_ids:
+                    ui.notify(f"{player.label} is not on the field", type="warning")
+                    return
+                if state.selected_player_id != player.value:
+                    on_player_button_click(player.value)
+                player_label = player.label
 
             # Submit result
-            player_label = matched_player_label or player_words or "speler"
             action_label = format_action_label(action_type)
-            if action_type in special_no_result:
+            if action_type in NO_RESULT_ACTIONS:
                 await submit(True)
                 ui.notify(f"Voice: {action_label} → {player_label}", type="positive")
-            elif result_word in {"ok", "oke", "score", "raak", "doelpunt", "goal"}:
+            elif parsed.result:
                 await submit(True)
                 ui.notify(f"Voice: {action_label} → {player_label} (score)", type="positive")
-            elif result_word in {"gemist", "mis", "naast"}:
+            else:
                 await submit(False)
                 ui.notify(f"Voice: {action_label} → {player_label} (miss)", type="warning")
 
-        async def poll_voice_queue():
+        voice_lock = asyncio.Lock()
+
+        async def on_voice_event(e: events.GenericEventArguments):
+            # pushed by the browser for every final transcript, see on_voice_toggle
             if not getattr(state, "voice_enabled", False):
                 return
-            text = await ui.run_javascript(
-                "return (window.__voice_queue && window.__voice_queue.shift()) || null"
-            )
-            if text:
+            text = e.args[0] if isinstance(e.args, list) else e.args
+            if not text:
+                return
+            async with voice_lock:  # one command (and its confirmation dialog) at a time
                 await handle_voice_command(str(text))
 
-        def persist_live_state() -> None:
+        def build_live_state() -> dict:
             action_value = None
             if state.current_action is not None:
                 action_value = state.current_action.value if hasattr(state.current_action, "value") else state.current_action
-            app.storage.user[LIVE_STATE_KEY] = {
+            return {
                 "selected_team_id": state.selected_team_id,
                 "selected_match_id": state.selected_match_id,
                 "active_player_ids": sorted(state.active_player_ids),
@@ -317,6 +313,12 @@ def live_page():
                 "total_periods": state.total_periods,
             }
 
+        # clicks only mark the live state dirty; it is written once things settle (and on disconnect)
+        live_state_writer = DebouncedWriter(app.storage.user, LIVE_STATE_KEY, build_live_state, delay=LIVE_STATE_WRITE_DELAY)
+
+        def persist_live_state() -> None:
+            live_state_writer.schedule()
+
         async def restore_live_state() -> None:
             data = app.storage.user.get(LIVE_STATE_KEY) or {}
             team_id = data.get("selected_team_id")
@@ -396,12 +398,43 @@ def live_page():
                 return False
             return is_owner() or state.is_collaborator
 
-        async def on_action_event():
-            await refresh_actions_table()
+        def count_push(payload=None) -> None:
+            # the broadcasts and ticks below are what reaches this client without a click
+            if TRAFFIC_METER_ENABLED:
+                live_traffic.count(page_client.id, payload)
+
+        def on_match_view_event(kind: str, payload: dict):
+            count_push(payload)
+            # the shared match view has already applied the event; only this page's UI is left
+            if kind == match_view.ACTION:
+                on_action_event(payload)
+            elif kind == match_view.CLOCK:
+                on_clock_event(payload)
+            elif kind == match_view.ACTIVE_PLAYERS:
+                on_active_players_event(payload)
+            elif kind == match_view.RELOAD:
+                show_all_actions()
+
+        def on_action_event(payload: dict):
+            action = payload.get("action") or {}
+            if payload.get("type") == "deleted":
+                hide_action(action.get("id"))
+            else:
+                client_id = action.get("client_id")
+                if client_id in state.actions:
+                    # our own queued action reached the server
+                    controller.outbox.discard(client_id)
+                    hide_action(client_id)
+                    update_sync_status()
+                show_action_row(action["id"])
+            if payload.get("score"):
+                controller.apply_match_score(payload["score"])
+                update_score_label()
 
         def on_join_request(requester_username: str):
             ui.notify(f"{requester_username} wants to join this match", type="warning")
-            ui.timer(0, lambda: load_join_requests(requests_table), once=True)
+            if state.requests_table is not None and not state.requests_table.is_deleted:
+                ui.timer(0, lambda: load_join_requests(state.requests_table), once=True)
             collaboration_controls.refresh()
             collaboration_status.refresh()
 
@@ -417,50 +450,30 @@ def live_page():
                 collaboration_status.refresh()
                 render_actions()
                 render_players(state.players)
-                result_buttons.refresh()
+                update_scorer_panels()
             else:
                 ui.notify(f"Join denied by {owner}", type="warning")
                 collaboration_controls.refresh()
                 collaboration_status.refresh()
-                result_buttons.refresh()
+                update_scorer_panels()
             ui.timer(0, refresh_collaboration_state, once=True)
 
         def on_clock_event(payload: dict):
-            if payload.get("period_minutes"):
-                state.period_minutes = payload.get("period_minutes")
-            if payload.get("total_periods"):
-                state.total_periods = payload.get("total_periods")
-            state.clock_running = bool(payload.get("clock_running"))
-            if payload.get("clock_seconds") is not None:
-                state.clock_seconds = int(payload.get("clock_seconds"))
-            if payload.get("remaining_seconds") is not None:
-                state.remaining_seconds = int(payload.get("remaining_seconds"))
-            if payload.get("period") is not None:
-                state.period = int(payload.get("period"))
-            if payload.get("is_finalized") is not None:
-                if state.selected_match_data is None:
-                    state.selected_match_data = {}
-                state.selected_match_data["is_finalized"] = bool(payload.get("is_finalized"))
-                if state.selected_match_data["is_finalized"]:
-                    state.clock_running = False
-                    state.current_action = None
-                    state.selected_player_id = None
-            if payload.get("locked_by_user_id") is not None:
-                if state.selected_match_data is None:
-                    state.selected_match_data = {}
-                state.selected_match_data["locked_by_user_id"] = payload.get("locked_by_user_id")
-                collaboration_controls.refresh()
-                collaboration_status.refresh()
-                ui.timer(0, refresh_collaboration_state, once=True)
-                render_actions()
-                render_players(state.players)
-                result_buttons.refresh()
-            if state.clock_display:
-                state.clock_display.text = state.formatted_remaining_time
-            clock_area.refresh()
-            if payload.get("is_finalized") is not None:
-                render_actions()
-                render_players(state.players)
+            controller.apply_clock_event(payload, clock_area.refresh, on_lock_changed, on_rights_changed)
+            if ("clock_running" in payload and payload.get("clock_seconds") is None
+                    and payload.get("remaining_seconds") is None and is_owner()):
+                # a scoring device started or paused the clock; this page keeps the time and shares it
+                broadcast_clock_state()
+
+        def on_lock_changed():
+            collaboration_controls.refresh()
+            collaboration_status.refresh()
+            ui.timer(0, refresh_collaboration_state, once=True)
+
+        def on_rights_changed():
+            render_actions()
+            render_players(state.players)
+            update_scorer_panels()
 
         def on_active_players_event(payload: dict):
             player_ids = payload.get("player_ids") or []
@@ -508,6 +521,10 @@ def live_page():
             if state.clock_running:
                 ui.notify("Pause the clock before finalizing the match", type="warning")
                 return
+            await sync_outbox()
+            if controller.outbox.actions_for_match(state.selected_match_id):
+                ui.notify("Wait until all actions are synced before finalizing", type="warning")
+                return
             
             try:
                 match_data = await controller.finalize_match(token=state.api_token)
@@ -524,6 +541,7 @@ def live_page():
                 clock_area.refresh()
                 render_actions()
                 render_players(state.players)
+                update_scorer_panels()
                 broadcast_clock_state()
                 
                 ui.notify("Match finalized successfully", type="positive")
@@ -537,27 +555,6 @@ def live_page():
         # ---------------------------------------------------------
 
 
-        # the ui dialog
-        with ui.dialog() as set_time_dialog:
-            with ui.card():
-                ui.label("Match Settings").classes("text-lg font-bold")
-                minutes_input = ui.number(label="Minutes per half", value=state.period_minutes, min=1)
-                halves_input = ui.number(label="Number of halves", value=state.total_periods, min=1)
-
-                def save():
-                    if state.clock_running:
-                        ui.notify("Pause the clock before changing settings", type="warning")
-                        return
-                    controller.apply_match_settings(
-                        int(minutes_input.value),
-                        int(halves_input.value),
-                    )
-                    clock_area.refresh()
-                    set_time_dialog.close()
-                    broadcast_clock_state()
-
-                ui.button("Save", on_click=save)
-
         def toggle_clock():
             if state.is_match_finalized:
                 ui.notify("Cannot modify clock for a finalized match", type="warning")
@@ -572,13 +569,19 @@ def live_page():
             broadcast_clock_state()
 
         def tick():
+            previous_running = state.clock_running
+            if previous_running:
+                count_push()
             controller.tick(
-                update_player_time_labels,
+                controller.update_player_time_labels,
                 lambda message: ui.notify(message, type="warning"),
                 clock_area.refresh,
             )
-            if state.clock_running:
+            # collaborators run their own clock; a periodic broadcast keeps them aligned
+            if state.clock_running and state.clock_seconds % CLOCK_BROADCAST_INTERVAL == 0:
                 broadcast_clock_state()
+            elif previous_running and not state.clock_running:
+                broadcast_clock_state()  # period or match ended
 
 
         def reset_clock():
@@ -599,7 +602,24 @@ def live_page():
             if not is_owner():
                 ui.notify("Only the match owner can change settings", type="warning")
                 return
-            set_time_dialog.open()
+            with transient_dialog(dialog_host) as set_time_dialog:
+                ui.label("Match Settings").classes("text-lg font-bold")
+                minutes_input = ui.number(label="Minutes per half", value=state.period_minutes, min=1)
+                halves_input = ui.number(label="Number of halves", value=state.total_periods, min=1)
+
+                def save():
+                    if state.clock_running:
+                        ui.notify("Pause the clock before changing settings", type="warning")
+                        return
+                    controller.apply_match_settings(
+                        int(minutes_input.value),
+                        int(halves_input.value),
+                    )
+                    clock_area.refresh()
+                    set_time_dialog.close()
+                    broadcast_clock_state()
+
+                ui.button("Save", on_click=save)
         
         # create the timer
         controller.ensure_timer(tick)
@@ -609,6 +629,7 @@ def live_page():
         # UI UPDATE HANDLERS
         # ---------------------------------------------------------------
         async def submit(result: bool):
+            started = action_entry_latency.start()
             if not state.selected_match_id or not state.selected_player_id or not state.current_action:
                 logger.warning("Cannot submit action: missing selection")
                 return
@@ -625,15 +646,12 @@ def live_page():
                 "y": state.y,
                 "period": state.period,
                 "action": state.current_action,
-                "result": result
+                "result": result,
+                "client_id": str(uuid.uuid4()),
             }
 
-            try:
-                await api_post("/actions", action_data, token=state.api_token)
-                logger.info(f"Submitted action: {action_data}")
-            except Exception as e:
-                logger.error(f"Failed to submit action: {e}")
-                ui.notify(f"Failed to submit action: {str(e)}", type="negative")
+            show_outbox_entry(controller.queue_action(action_data))
+            logger.info(f"Queued action: {action_data}")
 
             # Optionally, you could reset the state or provide feedback to the user here
             state.current_action = None
@@ -644,9 +662,91 @@ def live_page():
             # update gui
             render_actions()
             render_players(state.players)
-            ii.content = ""  # Clear the playfield indicator
-            await refresh_actions_table()
+            if state.playfield is not None:
+                state.playfield.content = ""  # Clear the playfield indicator
+            update_score_label()
+            update_sync_status()
             persist_live_state()
+            sync_in_background(started)
+
+        def sync_in_background(started: float | None = None):
+            # the queued action is already on screen; the API call must not hold up the next click
+            async def run():
+                with page_client:
+                    if started is not None:
+                        background_tasks.create(measure_entry_latency(started), name="live-entry-latency")
+                    await sync_outbox()
+            background_tasks.create(run(), name="live-outbox-sync")
+
+        async def measure_entry_latency(started: float):
+            # resolves once the browser painted the frame that contains the updates sent before it
+            try:
+                await page_client.run_javascript(
+                    "new Promise(resolve => requestAnimationFrame(() => resolve(true)))", timeout=5.0
+                )
+            except Exception:
+                return
+            action_entry_latency.stop(started)
+
+        def check_traffic():
+            within_budget, text = live_traffic.report(page_client.id)
+            if not within_budget and not state.traffic_over_budget:
+                logger.warning(f"Live client {page_client.id} exceeds its message budget: {text}")
+            state.traffic_over_budget = not within_budget
+
+        def show_traffic():
+            _, text = live_traffic.report(page_client.id)
+            ui.notify(f"Connection traffic: {text}; {len(page_client.elements)} elements on this page", type="info")
+
+        def show_entry_latency():
+            if not action_entry_latency.samples:
+                ui.notify("No actions entered yet", type="info")
+                return
+            ui.notify(f"Action entry: {action_entry_latency.format_summary()}", type="info")
+
+        async def sync_outbox():
+            report = await controller.sync_outbox(token=state.api_token)
+            for action in report.stored:
+                if action.get("client_id"):
+                    hide_action(action["client_id"])
+                if action.get("id") in stored_actions():  # normally already there through the action event
+                    show_action_row(action["id"])
+            for entry in report.rejected:
+                if entry["kind"] == "action":
+                    ui.notify(f"Action rejected: {entry['error']}", type="negative")
+                    show_outbox_entry(entry)
+                else:
+                    ui.notify(f"Playtime update rejected: {entry['error']}", type="negative")
+            if report.rejected:
+                update_score_label()  # rejected actions no longer count towards the score
+            update_sync_status()
+
+        def update_sync_status():
+            if not state.sync_label:
+                return
+            pending = controller.outbox.pending_count
+            failed = controller.outbox.failed_count
+            if failed:
+                text, color = f"Sync: {pending} pending, {failed} failed", "text-red-600"
+            elif pending:
+                text, color = f"Sync: {pending} pending", "text-orange-600"
+            else:
+                text, color = "Synced", "text-green-700"
+            state.sync_label.text = text
+            state.sync_label.classes(replace=f"text-xs font-bold {color}")
+
+        async def retry_failed_sync():
+            controller.outbox.retry_failed()
+            await sync_outbox()
+
+        async def discard_failed_sync():
+            removed = controller.outbox.discard_failed()
+            if removed:
+                ui.notify(f"Discarded {len(removed)} unsynced entries", type="warning")
+            for entry in removed:
+                hide_action(entry["id"])
+            update_score_label()
+            update_sync_status()
 
 
         async def on_team_change(team_id):
@@ -657,7 +757,13 @@ def live_page():
             await load_matches(team_id)
 
             # Reset selected player & match
+            if controller.flush_lineup():
+                sync_in_background()
+            if state.selected_match_id:
+                release_match_view()
+                unsubscribe_joins(state.selected_match_id, ui.context.client)
             state.selected_match_id = None
+            state.actions = {}
             state.selected_player_id = None
             state.active_player_ids.clear()
             state.players = [] # Clear players            
@@ -669,10 +775,12 @@ def live_page():
             state.owner_username = None
             state.collaborator_usernames = []
 
-            players_column.clear()
+            clear_players()
+            show_all_actions()
             if state.locked_match_id:
                 await unlock_match(state.locked_match_id)
                 state.locked_match_id = None
+            update_scorer_panels()
             clock_area.refresh()
             collaboration_controls.refresh()
             collaboration_status.refresh()
@@ -680,15 +788,15 @@ def live_page():
 
 
         async def on_match_change(match_id):
+            if controller.flush_lineup():
+                sync_in_background()
             # Save playtime for previous match if exists
             if state.selected_match_id and not state.is_match_finalized:
                 await save_playtime_data()
 
             if state.selected_match_id:
-                unsubscribe_actions(state.selected_match_id, ui.context.client)
+                release_match_view()
                 unsubscribe_joins(state.selected_match_id, ui.context.client)
-                unsubscribe_clock(state.selected_match_id, ui.context.client)
-                unsubscribe_active_players(state.selected_match_id, ui.context.client)
 
             if state.locked_match_id:
                 await unlock_match(state.locked_match_id)
@@ -696,7 +804,8 @@ def live_page():
             
             state.selected_match_id = match_id
             state.selected_match_data = None
-            players_column.clear()
+            state.actions = outbox_rows(match_id) if match_id else {}
+            clear_players()
             state.is_collaborator = False
 
             logger.info(f"Switching match to {match_id}")
@@ -713,7 +822,7 @@ def live_page():
                 state.owner_username = None
                 state.collaborator_usernames = []
                 clock_area.refresh()
-                await refresh_actions_table()
+                show_all_actions()
                 collaboration_controls.refresh()
                 collaboration_status.refresh()
                 persist_live_state()
@@ -736,25 +845,42 @@ def live_page():
             # Load playtime data
             await load_playtime_data(match_id)
             
-            # Load players
-            state.players = await load_team_players(state.selected_team_id)
-            state.active_player_ids = set()  # Reset active players
+            # Roster, actions and score are shared with every other client watching this match
+            try:
+                state.match_view = await match_view.acquire(match_id, page_client, on_match_view_event, match_view_loader(match_id))
+                state.players = state.match_view.players
+                if state.match_view.score:
+                    controller.apply_match_score(state.match_view.score)
+            except Exception as exc:
+                logger.warning(f"Failed to load match {match_id}: {exc}")
+                ui.notify("Failed to load players and actions", type="negative")
+                state.players = []
+            if state.voice_enabled:
+                controller.voice_index()  # build the lookup before the first utterance
             state.player_seconds = {}  # Reset current session times
-            period_seconds = max(1, state.period_minutes * 60)
-            elapsed_in_period = state.clock_seconds % period_seconds
-            state.remaining_seconds = max(0, period_seconds - elapsed_in_period)
+            # another live client of this match keeps the lineup and the clock: join them; the
+            # first client starts from the stored match time
+            shared = state.match_view is not None and state.match_view.subscriber_count > 1
+            state.active_player_ids = set(state.match_view.active_player_ids or []) if shared else set()
+            clock = state.match_view.clock if shared else {}
+            if clock.get("clock_seconds") is not None and clock.get("remaining_seconds") is not None:
+                state.clock_running = bool(clock.get("clock_running")) and not state.is_match_finalized
+                state.clock_seconds = int(clock["clock_seconds"])
+                state.remaining_seconds = int(clock["remaining_seconds"])
+                state.period = int(clock.get("period") or state.period)
+            else:
+                period_seconds = max(1, state.period_minutes * 60)
+                elapsed_in_period = state.clock_seconds % period_seconds
+                state.remaining_seconds = max(0, period_seconds - elapsed_in_period)
 
             render_actions()
             render_players(state.players)
             clock_area.refresh()
-            await refresh_actions_table()
+            show_all_actions()
             await refresh_collaboration_state()
-            result_buttons.refresh()
+            update_scorer_panels()
             persist_live_state()
 
-            subscribe_actions(state.selected_match_id, ui.context.client, on_action_event)
-            subscribe_clock(state.selected_match_id, ui.context.client, on_clock_event)
-            subscribe_active_players(state.selected_match_id, ui.context.client, on_active_players_event)
             if state.selected_match_data and state.selected_match_data.get("locked_by_user_id") == state.user_id:
                 subscribe_joins(state.selected_match_id, ui.context.client, on_join_request)
             
@@ -765,17 +891,18 @@ def live_page():
                 state.playtime_save_timer = ui.timer(30.0, lambda: save_playtime_data(), active=True)
 
         async def handle_disconnect():
+            live_state_writer.flush()
+            controller.flush_lineup()  # the outbox keeps it for the next sync
             if state.locked_match_id:
                 await unlock_match(state.locked_match_id)
                 state.locked_match_id = None
             if state.selected_match_id:
-                unsubscribe_actions(state.selected_match_id, ui.context.client)
+                release_match_view()
                 unsubscribe_joins(state.selected_match_id, ui.context.client)
-                unsubscribe_clock(state.selected_match_id, ui.context.client)
-                unsubscribe_active_players(state.selected_match_id, ui.context.client)
             user_id = state.user_id
             if user_id:
                 unsubscribe_join_decisions(user_id, ui.context.client)
+            live_traffic.forget(page_client.id)
 
 
         def on_action_button_click(action_type):
@@ -791,15 +918,6 @@ def live_page():
             # Re-render actions (lightweight refresh)
             render_actions()
 
-        def update_player_time_labels():
-            if not state.players:
-                return
-            labels = getattr(state, "player_time_labels", {})
-            if not labels:
-                return
-            for pid, label in labels.items():
-                label.text = state.formatted_player_time(pid)
-
         # simple handler for clicking a player button (when enabled)
         def on_player_button_click(player_id):
             if not can_edit_match():
@@ -824,35 +942,34 @@ def live_page():
 
 
         # Switch handler
-        async def on_switch_handler(e, pid, button):
+        async def on_switch_handler(e, pid, card):
             if not can_edit_match():
                 ui.notify("Match is locked by another user", type="warning")
-                e.value = not e.value
+                render_players(state.players)  # reset switch to previous state
                 return
             if state.is_match_finalized:
                 ui.notify("Cannot modify active players for a finalized match", type="warning")
-                # Reset switch to previous state
-                e.value = not e.value
+                render_players(state.players)  # reset switch to previous state
                 return
             
             is_active = bool(e.value)
-            button._active = is_active
-
             if is_active:
                 state.active_player_ids.add(pid)
             else:
                 state.active_player_ids.discard(pid)
             
-            button.update()
             render_players(state.players)
             broadcast_active_players()
+            controller.lineup_toggled(sync_in_background)
             persist_live_state()
 
 
         def render_actions():
-            action_column.clear()
+            if state.action_column is None:
+                return
+            state.action_column.clear()
 
-            with action_column:
+            with state.action_column:
                 for action_type in ActionType:
                     if action_type == ActionType.OPPONENT_GOAL:
                         continue
@@ -865,113 +982,174 @@ def live_page():
                         act_btn.disable()
 
 
-        def render_players(players):
+        def clear_players():
             players_column.clear()
-            state.player_time_labels = {}
- 
+            state.player_cards = {}
+            state.player_roster = []
+
+        def player_sort_key(player):
+            return (
+                player["id"] not in state.active_player_ids,
+                player.get("last_name", ""),
+                player.get("first_name", ""),
+            )
+
+        def render_players(players):
+            """Bring the player panel in line with the state, rebuilding only when the roster changed."""
+            editable = not state.is_match_finalized and can_edit_match()
+            roster = [(p["id"], p.get("sex"), format_player_label(p)) for p in players]
+            if roster != state.player_roster or not state.player_cards:
+                build_players(players, editable)
+                state.player_roster = roster
+                return
+
+            for player in players:
+                pid = player["id"]
+                card = state.player_cards[pid]
+                card.set_state(pid in state.active_player_ids, state.selected_player_id == pid, editable)
+                card.set_time(state.formatted_player_time(pid))
+
+            # move only the cards whose position changed, e.g. after a substitution
+            for column, sex in zip(state.player_columns, ("female", "male")):
+                wanted = [state.player_cards[p["id"]] for p in sorted(players, key=player_sort_key) if p.get("sex") == sex]
+                if list(column.default_slot.children) != wanted:
+                    for index, card in enumerate(wanted):
+                        card.move(target_container=column, target_index=index)
+
+        def build_players(players, editable):
+            clear_players()
             with players_column:
                 with ui.grid(columns=2).classes("gap-4"):
-                    def player_sort_key(player):
-                        return (
-                            player["id"] not in state.active_player_ids,
-                            player.get("last_name", ""),
-                            player.get("first_name", ""),
+                    columns = (ui.column().classes("gap-2"), ui.column().classes("gap-2"))
+            state.player_columns = columns
+
+            for column, sex in zip(columns, ("female", "male")):
+                with column:
+                    for player in sorted(players, key=player_sort_key):
+                        if player.get("sex") != sex:
+                            continue
+                        pid = player["id"]
+                        state.player_cards[pid] = PlayerCard(
+                            player,
+                            active=pid in state.active_player_ids,
+                            selected=state.selected_player_id == pid,
+                            editable=editable,
+                            time_text=state.formatted_player_time(pid),
+                            on_select=on_player_button_click,
+                            on_switch=on_switch_handler,
                         )
 
-                    def render_player_card(player):
-                        player_id = player["id"]
-                        player_name = f"{player.get('first_name', 'Unknown')} ({player.get('number', '')})"
-                        is_active = player_id in state.active_player_ids
-                        is_selected = (state.selected_player_id == player_id)
-
-                        with ui.grid().classes("grid-cols-[auto_3rem_4rem] items-center gap-2"):
-                            btn = PlayerButton(
-                                player_id=player_id,
-                                player_name=player_name,
-                                active=is_active,
-                                selected=is_selected,
-                                on_click=on_player_button_click,
-                            )
-                            player_switch = ui.switch(
-                                value=is_active,
-                                on_change=lambda e, pid=player_id, button=btn: on_switch_handler(e, pid, button),
-                            )
-                            if state.is_match_finalized or not can_edit_match():
-                                player_switch.disable()
-                                btn.disable()
-
-                            time_label = ui.label(state.formatted_player_time(player_id)).classes("text-xs text-grey-6")
-                            state.player_time_labels[player_id] = time_label
-
-                    female_players = [p for p in players if p.get("sex") == "female"]
-                    male_players = [p for p in players if p.get("sex") == "male"]
-
-                    with ui.column().classes("gap-2"):
-                        for p in sorted(female_players, key=player_sort_key):
-                            render_player_card(p)
-
-                    with ui.column().classes("gap-2"):
-                        for p in sorted(male_players, key=player_sort_key):
-                            render_player_card(p)
-
-        def update_scores_from_actions(actions):
-            team_score = 0
-            opponent_score = 0
-            goal_actions = {
-                ActionType.SHOT,
-                ActionType.KORTE_KANS,
-                ActionType.VRIJWORP,
-                ActionType.STRAFWORP,
-                ActionType.INLOPER,
+        async def refresh_score():
+            if not state.selected_match_id:
+                return
+            await controller.load_match_score(state.selected_match_id, token=state.api_token)
+            update_score_label()
+
+        def update_score_label():
+            if not state.score_label:
+                return
+            team_score, opponent_score = controller.displayed_score()
+            location = (state.selected_match_data or {}).get("location", "") or ""
+            is_home = location.strip().lower() == "thuis"
+            state.score_label.text = f"{team_score} - {opponent_score}" if is_home else f"{opponent_score} - {team_score}"
+
+        def format_time(seconds: int) -> str:
+            mins, secs = divmod(seconds, 60)
+            return f"{mins:02d}:{secs:02d}"
+
+        def build_action_row(action: dict, row_id, sync: str = "") -> dict:
+            player = next((p for p in state.players if p["id"] == action.get("player_id")), None)
+            player_name = "Opponent" if action.get("is_opponent") else (
+                f'{player.get("first_name", "")} {player.get("last_name", "")}'.strip() if player else str(action.get("player_id"))
+            )
+            x_val = action.get("x")
+            y_val = action.get("y")
+            return {
+                "id": row_id,
+                "action": format_action_label(action.get("action") or ""),
+                "player_name": player_name,
+                "username": action.get("username"),
+                "timestamp": format_time(action.get("timestamp", 0)),
+                "period": action.get("period"),
+                "x": round(x_val, 1) if isinstance(x_val, (int, float)) else x_val,
+                "y": round(y_val, 1) if isinstance(y_val, (int, float)) else y_val,
+                "result": "Score" if action.get("result") else "Miss",
+                "sync": sync,
             }
-            for action in actions:
-                if action.get("is_opponent"):
-                    opponent_score += 1
-                elif action.get("result") and action.get("action") in {a.value for a in goal_actions}:
-                    team_score += 1
-            state.team_score = team_score
-            state.opponent_score = opponent_score
-            clock_area.refresh()
+
+        def action_sort_key(row: dict) -> tuple:
+            # newest first; actions still in the outbox above the stored ones
+            timestamp = row_action(row["id"]).get("timestamp") or 0
+            if row["sync"]:
+                return (0, -timestamp, str(row["id"]))
+            return (1, -timestamp, -row["id"])
+
+        def outbox_sync_label(entry: dict) -> str:
+            return "Pending" if entry["status"] == "pending" else f'Failed: {entry["error"]}'
+
+        # stored actions live in the shared match view, state.actions only holds this page's outbox rows
+        def stored_actions() -> dict:
+            return state.match_view.actions if state.match_view else {}
+
+        def row_action(row_id) -> dict:
+            return state.actions.get(row_id) or stored_actions().get(row_id) or {}
+
+        def outbox_rows(match_id) -> dict:
+            return {
+                entry["id"]: {**entry["payload"], "username": state.username}
+                for entry in controller.outbox.actions_for_match(match_id)
+            }
+
+        def action_rows() -> list:
+            entries = {e["id"]: e for e in controller.outbox.actions_for_match(state.selected_match_id)}
+            rows = [build_action_row(action, action_id) for action_id, action in stored_actions().items()]
+            rows += [
+                build_action_row(action, row_id, outbox_sync_label(entries[row_id]) if row_id in entries else "Pending")
+                for row_id, action in state.actions.items()
+            ]
+            return rows
+
+        # the table only exists while the Events tab is open
+        def show_action_row(row_id, sync: str = "") -> None:
+            if events_panel.is_built:
+                state.actions_table.upsert(build_action_row(row_action(row_id), row_id, sync))
+
+        def show_all_actions() -> None:
+            if events_panel.is_built:
+                state.actions_table.set_rows(action_rows())
+
+        def hide_action(row_id) -> None:
+            state.actions.pop(row_id, None)
+            if events_panel.is_built:
+                state.actions_table.remove(row_id)
+
+        def show_outbox_entry(entry: dict) -> None:
+            state.actions[entry["id"]] = {**entry["payload"], "username": state.username}
+            show_action_row(entry["id"], outbox_sync_label(entry))
+
+        def match_view_loader(match_id: int):
+            async def load():
+                players = await load_team_players(state.selected_team_id)
+                actions = await controller.load_match_actions(match_id, token=state.api_token)
+                return players, actions
+            return load
+
+        def release_match_view() -> None:
+            match_view.release(state.selected_match_id, page_client)
+            state.match_view = None
 
         async def refresh_actions_table():
-            if not state.selected_match_id:
-                actions_table.rows = []
-                actions_table.update()
+            """Reload the shared actions of the match; every page watching it redraws its table."""
+            if not state.match_view:
+                show_all_actions()
                 return
-            actions = await controller.load_match_actions(state.selected_match_id, token=state.api_token)
-            players_by_id = {p["id"]: p for p in state.players}
-
-            def format_time(seconds: int) -> str:
-                mins, secs = divmod(seconds, 60)
-                return f"{mins:02d}:{secs:02d}"
-
-            rows = []
-            for action in sorted(actions, key=lambda a: (a.get("timestamp", 0), a.get("id", 0)), reverse=True):
-                player = players_by_id.get(action.get("player_id"))
-                player_name = "Opponent" if action.get("is_opponent") else (
-                    f'{player.get("first_name", "")} {player.get("last_name", "")}'.strip() if player else str(action.get("player_id"))
-                )
-                action_label = format_action_label(action.get("action") or "")
-                result_label = "Score" if action.get("result") else "Miss"
-                x_val = action.get("x")
-                y_val = action.get("y")
-                x_fmt = round(x_val, 1) if isinstance(x_val, (int, float)) else x_val
-                y_fmt = round(y_val, 1) if isinstance(y_val, (int, float)) else y_val
-                rows.append({
-                    "id": action.get("id"),
-                    "action": action_label,
-                    "player_name": player_name,
-                    "username": action.get("username"),
-                    "timestamp": format_time(action.get("timestamp", 0)),
-                    "period": action.get("period"),
-                    "x": x_fmt,
-                    "y": y_fmt,
-                    "result": result_label,
-                    "_raw": action,
-                })
-            update_scores_from_actions(actions)
-            actions_table.rows = rows
-            actions_table.update()
+            try:
+                await state.match_view.load(match_view_loader(state.selected_match_id), force=True)
+            except Exception as exc:
+                # keep showing the last known actions while the API is unreachable
+                logger.warning(f"Failed to load match actions: {exc}")
+                return
+            await refresh_score()
 
         def open_edit_action_dialog(e):
             if state.is_match_finalized:
@@ -979,63 +1157,120 @@ def live_page():
                 return
 
             row = e.args
-            raw = row.get("_raw", {})
-            with ui.dialog() as dialog:
-                with ui.card():
-                    ui.label("Edit action").classes("text-lg font-bold")
-                    action_select = ui.select(
-                        {a.value: a.name.replace("_", " ").title() for a in ActionType},
-                        value=raw.get("action"),
-                        label="Action type",
-                    )
-                    player_select = ui.select(
-                        {0: "Opponent", **{p["id"]: f'{p.get("first_name", "")} {p.get("last_name", "")}' for p in state.players}},
-                        value=raw.get("player_id") or 0,
-                        label="Player",
-                    )
-                    time_input = ui.number(label="Time (seconds)", value=raw.get("timestamp", 0), min=0)
-                    period_input = ui.number(label="Half", value=raw.get("period", 1), min=1)
-                    x_input = ui.number(label="X coordinate", value=raw.get("x"))
-                    y_input = ui.number(label="Y coordinate", value=raw.get("y"))
-                    result_toggle = ui.switch("Score", value=bool(raw.get("result")))
-                    is_opponent_toggle = ui.switch("Opponent goal", value=bool(raw.get("is_opponent")))
-
-                    async def save():
-                        is_opponent = bool(is_opponent_toggle.value)
-                        player_id = None if is_opponent or player_select.value == 0 else player_select.value
-                        payload = {
-                            "match_id": state.selected_match_id,
-                            "player_id": player_id,
-                            "timestamp": int(time_input.value or 0),
-                            "x": x_input.value,
-                            "y": y_input.value,
-                            "period": int(period_input.value or 1),
-                            "action": action_select.value,
-                            "result": bool(result_toggle.value),
-                            "is_opponent": is_opponent,
-                        }
-                        try:
-                            await controller.update_action(raw.get("id"), payload, token=state.api_token)
-                            dialog.close()
-                            await refresh_actions_table()
-                        except Exception as exc:
+            if row.get("sync"):
+                ui.notify("This action is not synced yet", type="warning")
+                return
+            raw = row_action(row.get("id"))
+            with transient_dialog(dialog_host) as dialog:
+                ui.label("Edit action").classes("text-lg font-bold")
+                action_select = ui.select(
+                    {a.value: a.name.replace("_", " ").title() for a in ActionType},
+                    value=raw.get("action"),
+                    label="Action type",
+                )
+                player_select = ui.select(
+                    {0: "Opponent", **{p["id"]: f'{p.get("first_name", "")} {p.get("last_name", "")}' for p in state.players}},
+                    value=raw.get("player_id") or 0,
+                    label="Player",
+                )
+                time_input = ui.number(label="Time (seconds)", value=raw.get("timestamp", 0), min=0)
+                period_input = ui.number(label="Half", value=raw.get("period", 1), min=1)
+                x_input = ui.number(label="X (m from the left end line)", value=raw.get("x"))
+                y_input = ui.number(label="Y (m from the top side line)", value=raw.get("y"))
+                result_toggle = ui.switch("Score", value=bool(raw.get("result")))
+                is_opponent_toggle = ui.switch("Opponent goal", value=bool(raw.get("is_opponent")))
+
+                async def save():
+                    is_opponent = bool(is_opponent_toggle.value)
+                    player_id = None if is_opponent or player_select.value == 0 else player_select.value
+                    payload = {
+                        "match_id": state.selected_match_id,
+                        "player_id": player_id,
+                        "timestamp": int(time_input.value or 0),
+                        "x": x_input.value,
+                        "y": y_input.value,
+                        "period": int(period_input.value or 1),
+                        "action": action_select.value,
+                        "result": bool(result_toggle.value),
+                        "is_opponent": is_opponent,
+                        "version": raw.get("version"),
+                    }
+                    try:
+                        await controller.update_action(raw.get("id"), payload, token=state.api_token)
+                        dialog.close()
+                    except ApiError as exc:
+                        if exc.status != 409 or not isinstance(exc.args[0], dict):
                             ui.notify(f"Failed to update action: {exc}", type="negative")
+                            return
+                        # the table already shows the other scorer's version through the action events
+                        ui.notify("Someone else changed this action in the meantime; check it and edit again", type="warning")
+                        dialog.close()
+                    except Exception as exc:
+                        ui.notify(f"Failed to update action: {exc}", type="negative")
 
-                    ui.button("Save", on_click=save)
+                ui.button("Save", on_click=save)
+
+        async def withdraw_queued(client_id: str) -> bool:
+            """Drop a queued action before it reaches the server; False when it got stored after all."""
+            while controller.outbox.is_sending(client_id):
+                await controller.outbox.wait_for_flush()  # its outcome is known once the request ends
+            if controller.outbox.withdraw(client_id) is None:
+                return False
+            hide_action(client_id)
+            update_score_label()
+            update_sync_status()
+            return True
 
         async def delete_action(e):
             if state.is_match_finalized:
                 ui.notify("Cannot delete actions for a finalized match", type="warning")
                 return
             row = e.args
-            raw = row.get("_raw", {})
+            action_id, version = row.get("id"), row_action(row.get("id")).get("version")
+            if row.get("sync"):
+                # not stored on the server yet: drop it from the outbox
+                if await withdraw_queued(row.get("id")):
+                    return
+                # stored while it was being sent: delete the stored action instead
+                stored = next((a for a in stored_actions().values() if a.get("client_id") == row.get("id")), None)
+                if stored is None:
+                    return
+                action_id, version = stored["id"], stored.get("version")
             try:
-                await controller.delete_action(raw.get("id"), token=state.api_token)
-                await refresh_actions_table()
+                await controller.delete_action(action_id, version=version, token=state.api_token)
+            except ApiError as exc:
+                if exc.status == 409 and isinstance(exc.args[0], dict):
+                    ui.notify("Someone else changed this action in the meantime; check it before deleting", type="warning")
+                else:
+                    ui.notify(f"Failed to delete action: {exc}", type="negative")
             except Exception as exc:
                 ui.notify(f"Failed to delete action: {exc}", type="negative")
 
+        async def undo_redo(redo: bool = False):
+            if state.is_match_finalized:
+                ui.notify("Cannot change actions of a finalized match", type="warning")
+                return
+            if not state.selected_match_id:
+                return
+            pending = controller.outbox.actions_for_match(state.selected_match_id)
+            if pending and not redo and await withdraw_queued(pending[-1]["id"]):
+                return  # the last tap never reached the server: dropping it from the outbox is the undo
+            step = controller.redo_action if redo else controller.undo_action
+            try:
+                # the table follows through the action event of the change
+                await step(state.selected_match_id, token=state.api_token)
+            except ApiError as exc:
+                if exc.status == 404:
+                    ui.notify(f"Nothing to {'redo' if redo else 'undo'}", type="info")
+                elif exc.status == 409 and isinstance(exc.args[0], dict):
+                    ui.notify(exc.args[0].get("message", str(exc)), type="warning")
+                else:
+                    ui.notify(f"Failed to {'redo' if redo else 'undo'}: {exc}", type="negative")
+            except Exception as exc:
+                ui.notify(f"Failed to {'redo' if redo else 'undo'}: {exc}", type="negative")
+
         async def register_opponent_goal():
+            started = action_entry_latency.start()
             if state.is_match_finalized:
                 ui.notify("Cannot add actions to a finalized match", type="warning")
                 return
@@ -1051,19 +1286,20 @@ def live_page():
                 "action": ActionType.OPPONENT_GOAL,
                 "result": True,
                 "is_opponent": True,
+                "client_id": str(uuid.uuid4()),
             }
-            try:
-                await api_post("/actions", action_data, token=state.api_token)
-            except Exception as exc:
-                ui.notify(f"Failed to add opponent goal: {exc}", type="negative")
-                return
-            await refresh_actions_table()
+            show_outbox_entry(controller.queue_action(action_data))
+            update_score_label()
+            update_sync_status()
+            sync_in_background(started)
 
         # ---------------------------------------------------------
         # UI COMPONENTS (REFRESHABLE)
         # ---------------------------------------------------------
         @ui.refreshable
         def clock_area():
+            state.score_label = None
+            state.sync_label = None
             if not state.selected_match_id:
                 ui.label("No match selected").classes("text-xs font-bold text-grey-6")
                 return
@@ -1114,13 +1350,11 @@ def live_page():
                     
                     if state.is_match_finalized:
                         clock_button.disable()
-                    team_score = getattr(state, "team_score", 0)
-                    opponent_score = getattr(state, "opponent_score", 0)
-                    location = (state.selected_match_data or {}).get("location", "") or ""
-                    is_home = location.strip().lower() == "thuis"
-                    score_text = f"{team_score} - {opponent_score}" if is_home else f"{opponent_score} - {team_score}"
                     ui.separator().props("vertical").classes("mx-4")
-                    ui.label(score_text).classes("text-4xl font-bold")
+                    state.score_label = ui.label("").classes("text-4xl font-bold")
+                    update_score_label()
+                    state.sync_label = ui.label("").classes("text-xs font-bold")
+                    update_sync_status()
                     opp_button = ui.button("Opp Goal", on_click=register_opponent_goal, color="orange").classes("ml-2")
                     if state.is_match_finalized or not can_edit_match():
                         opp_button.disable()
@@ -1131,6 +1365,11 @@ def live_page():
                             ui.menu_item("Reset", on_click=reset_clock)
                             ui.separator()
                             ui.menu_item("Save Playtime", on_click=lambda: save_playtime_data())
+                            ui.menu_item("Retry unsynced", on_click=retry_failed_sync)
+                            ui.menu_item("Discard failed", on_click=discard_failed_sync)
+                            ui.menu_item("Entry latency", on_click=show_entry_latency)
+                            if TRAFFIC_METER_ENABLED:
+                                ui.menu_item("Connection traffic", on_click=show_traffic)
                             finalize_item = ui.menu_item(
                                 "Finalize Match" if not state.is_match_finalized else "Match Finalized",
                                 on_click=lambda: finalize_match() if (state.selected_match_id and not state.is_match_finalized) else None,
@@ -1180,22 +1419,230 @@ def live_page():
             table.update()
 
         def open_join_requests():
+            with transient_dialog(dialog_host) as join_requests_dialog:
+                ui.label("Join requests").classes("text-lg font-bold")
+                requests_table = ui.table(
+                    columns=[
+                        {"name": "username", "label": "User", "field": "username", "align": "left"},
+                        {"name": "actions", "label": "Actions", "field": "id", "classes": "auto-width"},
+                    ],
+                    rows=[],
+                    row_key="id",
+                ).classes("w-full mt-2 q-table--dense")
+
+                async def accept_request(row_id):
+                    await controller.decide_join(state.selected_match_id, row_id, True)
+                    await load_join_requests(requests_table)
+                    broadcast_clock_state()
+                    broadcast_active_players()
+                    await refresh_collaboration_state()
+
+                async def deny_request(row_id):
+                    await controller.decide_join(state.selected_match_id, row_id, False)
+                    await load_join_requests(requests_table)
+                    await refresh_collaboration_state()
+
+                requests_table.add_slot('body-cell', '''
+                <q-td :props="props">
+                    <template v-if="props.col.name === 'actions'">
+                        <q-btn flat dense round icon="check" color="green" @click="() => $parent.$emit('accept', props.row.id)" />
+                        <q-btn flat dense round icon="close" color="red" @click="() => $parent.$emit('deny', props.row.id)" />
+                    </template>
+                    <template v-else>
+                        {{ props.value }}
+                    </template>
+                </q-td>''')
+                requests_table.on("accept", lambda e: accept_request(e.args))
+                requests_table.on("deny", lambda e: deny_request(e.args))
+                ui.button("Close", on_click=join_requests_dialog.close)
+            state.requests_table = requests_table
             ui.timer(0, lambda: load_join_requests(requests_table), once=True)
-            join_requests_dialog.open()
 
                     
 
         def mouse_handler(e: events.MouseEventArguments):
             color = 'Red' 
 #            ii.content += f'<circle cx="{e.image_x}" cy="{e.image_y}" r="5" fill="none" stroke="{color}" stroke-width="2" />'
-            ii.content = f'<circle cx="{e.image_x}" cy="{e.image_y}" r="4" fill="none" stroke="{color}" stroke-width="3" />'
-            #state.x = (e.image_x-50)/700*40
-            #state.y = (e.image_y-50)/300*20
-            state.x = e.image_x
-            state.y = e.image_y
+            e.sender.content = f'<circle cx="{e.image_x}" cy="{e.image_y}" r="4" fill="none" stroke="{color}" stroke-width="3" />'
+            # stored in metres on the field, whatever size the image is shown at
+            state.x, state.y = image_to_field(e.image_x, e.image_y)
 
             print(f'{e.type} at ({state.x:.1f}, {state.y:.1f})')
 
+        # ---------------------------------------------------------------
+        # LAZY PANELS
+        # ---------------------------------------------------------------
+        # Scorer controls, the playfield and the events table are only built while they are
+        # in use; a viewer who only follows the clock, score and players never gets them.
+        def build_scorer_controls():
+            async def on_voice_toggle(e):
+                enabled = bool(e.value)
+                state.voice_enabled = enabled
+                if not enabled:
+                    voice_status.text = "Voice: Off"
+                    await stop_voice_recognition()
+                    return
+
+                supported = await ui.run_javascript(
+                    "return !!(window.SpeechRecognition || window.webkitSpeechRecognition)"
+                )
+                if not supported:
+                    ui.notify("Voice input is not supported in this browser", type="warning")
+                    state.voice_enabled = False
+                    voice_status.text = "Voice: Off"
+                    e.value = False
+                    return
+
+                controller.voice_index()  # build the lookup before the first utterance
+                voice_status.text = "Voice: On"
+                await ui.run_javascript("""
+                    window.__voice_enabled = true;
+                    if (!window.__voice_recognition) {
+                        const SpeechRecognition = window.SpeechRecognition || window.webkitSpeechRecognition;
+                        const rec = new SpeechRecognition();
+                        rec.lang = 'nl-NL';
+                        rec.continuous = true;
+                        rec.interimResults = false;
+                        rec.onresult = (event) => {
+                            for (let i = event.resultIndex; i < event.results.length; i++) {
+                                if (event.results[i].isFinal) {
+                                    emitEvent('voice_command', event.results[i][0].transcript);
+                                }
+                            }
+                        };
+                        rec.onend = () => {
+                            if (window.__voice_enabled) {
+                                try { rec.start(); } catch (e) {}
+                            }
+                        };
+                        rec.onerror = () => {
+                            if (window.__voice_enabled) {
+                                try { rec.stop(); } catch (e) {}
+                            }
+                        };
+                        window.__voice_recognition = rec;
+                    }
+                    try { window.__voice_recognition.start(); } catch (e) {}
+                """)
+
+            with ui.row().classes("items-center gap-3"):
+                ui.switch("Voice input", value=state.voice_enabled, on_change=on_voice_toggle)
+                voice_status = ui.label("Voice: On" if state.voice_enabled else "Voice: Off").classes("text-xs text-grey-6")
+                ui.label(
+                    "Zeg: actie speler resultaat (bv. 'schot jan ok'). "
+                    "Acties: schot, korte kans, vrije worp, strafworp, inloper, rebound, assist/steun, steal. "
+                    "Resultaat: ok/score of gemist/mis."
+                ).classes("text-xs text-grey-6")
+
+            with ui.row().classes("items-start gap-4"):
+                with ui.card():
+                    ui.label("Actions").classes("text-xs font-bold text-grey-6")
+                    state.action_column = ui.row().classes("items-center gap-2 flex-wrap")
+                with ui.card():
+                    ui.label("Result").classes("text-xs font-bold text-grey-6")
+                    result_buttons()
+            render_actions()
+
+        def build_playfield():
+            src = 'korfball_field.svg'
+            #src = 'korfball.svg'
+            #ii = ui.interactive_image(src, on_mouse=mouse_handler, events=['mousedown', 'mouseup'], cross=True)
+            with ui.card():
+                ui.label("Playfield").classes("text-xs font-bold text-grey-6")
+                state.playfield = ui.interactive_image(
+                    src,
+                    on_mouse=mouse_handler,
+                    events=['mousedown'],
+                    sanitize=False,
+                ).style('width: 600px; height: auto')
+
+        def build_events_table():
+            with ui.card().classes("w-full"):
+                with ui.row().classes("items-center justify-between w-full"):
+                    ui.label("Match events").classes("text-xs font-bold text-grey-6")
+                    with ui.row().classes("gap-1"):
+                        ui.button(icon="undo", on_click=lambda: undo_redo()).props("flat dense").tooltip("Undo my last change")
+                        ui.button(icon="redo", on_click=lambda: undo_redo(redo=True)).props("flat dense").tooltip("Redo")
+                        ui.button("Refresh", on_click=lambda: refresh_actions_table()).props("flat")
+                actions_table = ActionsTable(
+                    columns=[
+                        {'name': 'actions', 'label': 'Actions', 'field': 'id', 'classes': 'auto-width no-wrap'},
+                        {"name": "action", "label": "Action", "field": "action", "align": 'left'},
+                        {"name": "player_name", "label": "Player", "field": "player_name", "align": 'left'},
+                        {"name": "username", "label": "User", "field": "username", "align": 'left'},
+                        {"name": "timestamp", "label": "Time", "field": "timestamp", "align": 'right'},
+                        {"name": "period", "label": "Half", "field": "period", "align": 'right'},
+                        {"name": "x", "label": "X (m)", "field": "x", "align": 'right'},
+                        {"name": "y", "label": "Y (m)", "field": "y", "align": 'right'},
+                        {"name": "result", "label": "Result", "field": "result", "align": 'left'},
+                        {"name": "sync", "label": "Sync", "field": "sync", "align": 'left'},
+                    ],
+                    sort_key=action_sort_key,
+                    row_key="id",
+                    column_defaults={'align': 'left', 'headerClasses': 'text-primary'},
+                ).classes("w-full mt-2 q-table--dense").style("height: 32rem")
+                actions_table.add_slot('body-cell', '''
+                <q-td :props="props">
+                    <template v-if="props.col.name === 'actions'">
+                        <q-btn flat dense round icon="edit" @click="() => $parent.$emit('edit', props.row)" />
+                        <q-btn flat dense round icon="delete" color="red" @click="() => $parent.$emit('delete', props.row)" />
+                    </template>
+                    <template v-else>
+                        {{ props.value }}
+                    </template>
+                </q-td>''')
+                actions_table.on("edit", open_edit_action_dialog)
+                actions_table.on("delete", delete_action)
+                actions_table.set_rows(action_rows())
+            state.actions_table = actions_table
+
+        async def stop_voice_recognition():
+            with page_client:
+                await ui.run_javascript("""
+                    window.__voice_enabled = false;
+                    if (window.__voice_recognition) {
+                        try { window.__voice_recognition.stop(); } catch (e) {}
+                    }
+                """)
+
+        def update_scorer_panels():
+            """Show the scorer controls only while this user may enter actions for the selected match."""
+            scoring = bool(state.selected_match_id) and can_edit_match()
+            if not scoring and state.voice_enabled:
+                state.voice_enabled = False
+                background_tasks.create(stop_voice_recognition(), name="live-voice-stop")
+            if scoring and scorer_panel.is_built:
+                result_buttons.refresh()
+                render_actions()
+            scorer_panel.set_visibility(scoring)
+            playfield_panel.set_visibility(scoring)
+            if not playfield_panel.is_built:
+                state.playfield = None
+            if not scorer_panel.is_built:
+                state.action_column = None
+
+        def on_tab_change(e):
+            events_panel.set_visibility(e.value == "Events")
+            if not events_panel.is_built:
+                state.actions_table = None
+
+        @ui.refreshable
+        def result_buttons():
+            with ui.row().classes("items-center gap-2"):
+                ok_button = ui.button(
+                    "Ok / Score",
+                    on_click=lambda x: submit(True),
+                    icon="thumb_up"
+                )
+                miss_button = ui.button(
+                    "Gemist",
+                    on_click=lambda x: submit(False),
+                    icon="thumb_down"
+                )
+                if state.is_match_finalized or not can_edit_match():
+                    ok_button.disable()
+                    miss_button.disable()
+
 
         # ---------------------------------------------------------------
         # UI LAYOUT
@@ -1228,191 +1675,22 @@ def live_page():
 
         with ui.row():
             clock_area()
-        with ui.dialog() as join_requests_dialog:
-            with ui.card():
-                ui.label("Join requests").classes("text-lg font-bold")
-                requests_table = ui.table(
-                    columns=[
-                        {"name": "username", "label": "User", "field": "username", "align": "left"},
-                        {"name": "actions", "label": "Actions", "field": "id", "classes": "auto-width"},
-                    ],
-                    rows=[],
-                    row_key="id",
-                ).classes("w-full mt-2 q-table--dense")
-
-                async def accept_request(row_id):
-                    await controller.decide_join(state.selected_match_id, row_id, True)
-                    await load_join_requests(requests_table)
-                    broadcast_clock_state()
-                    broadcast_active_players()
-                    await refresh_collaboration_state()
-
-                async def deny_request(row_id):
-                    await controller.decide_join(state.selected_match_id, row_id, False)
-                    await load_join_requests(requests_table)
-                    await refresh_collaboration_state()
-
-                requests_table.add_slot('body-cell', '''
-                <q-td :props="props">
-                    <template v-if="props.col.name === 'actions'">
-                        <q-btn flat dense round icon="check" color="green" @click="() => $parent.$emit('accept', props.row.id)" />
-                        <q-btn flat dense round icon="close" color="red" @click="() => $parent.$emit('deny', props.row.id)" />
-                    </template>
-                    <template v-else>
-                        {{ props.value }}
-                    </template>
-                </q-td>''')
-                requests_table.on("accept", lambda e: accept_request(e.args))
-                requests_table.on("deny", lambda e: deny_request(e.args))
-                ui.button("Close", on_click=join_requests_dialog.close)
+        dialog_host = ui.element()
 
         with ui.tab_panels(tabs, value="Live").classes("w-full"):
             with ui.tab_panel("Live"):
-                state.voice_enabled = False
-
-                async def on_voice_toggle(e):
-                    enabled = bool(e.value)
-                    state.voice_enabled = enabled
-                    if not enabled:
-                        voice_status.text = "Voice: Off"
-                        voice_timer.active = False
-                        await ui.run_javascript("""
-                            window.__voice_enabled = false;
-                            if (window.__voice_recognition) {
-                                try { window.__voice_recognition.stop(); } catch (e) {}
-                            }
-                        """)
-                        return
-
-                    supported = await ui.run_javascript(
-                        "return !!(window.SpeechRecognition || window.webkitSpeechRecognition)"
-                    )
-                    if not supported:
-                        ui.notify("Voice input is not supported in this browser", type="warning")
-                        state.voice_enabled = False
-                        voice_status.text = "Voice: Off"
-                        e.value = False
-                        return
-
-                    voice_status.text = "Voice: On"
-                    voice_timer.active = True
-                    await ui.run_javascript("""
-                        window.__voice_queue = window.__voice_queue || [];
-                        window.__voice_enabled = true;
-                        if (!window.__voice_recognition) {
-                            const SpeechRecognition = window.SpeechRecognition || window.webkitSpeechRecognition;
-                            const rec = new SpeechRecognition();
-                            rec.lang = 'nl-NL';
-                            rec.continuous = true;
-                            rec.interimResults = false;
-                            rec.onresult = (event) => {
-                                for (let i = event.resultIndex; i < event.results.length; i++) {
-                                    if (event.results[i].isFinal) {
-                                        window.__voice_queue.push(event.results[i][0].transcript);
-                                    }
-                                }
-                            };
-                            rec.onend = () => {
-                                if (window.__voice_enabled) {
-                                    try { rec.start(); } catch (e) {}
-                                }
-                            };
-                            rec.onerror = () => {
-                                if (window.__voice_enabled) {
-                                    try { rec.stop(); } catch (e) {}
-                                }
-                            };
-                            window.__voice_recognition = rec;
-                        }
-                        try { window.__voice_recognition.start(); } catch (e) {}
-                    """)
-
-                with ui.row().classes("items-center gap-3"):
-                    ui.switch("Voice input", on_change=on_voice_toggle)
-                    voice_status = ui.label("Voice: Off").classes("text-xs text-grey-6")
-                    ui.label(
-                        "Zeg: actie speler resultaat (bv. 'schot jan ok'). "
-                        "Acties: schot, korte kans, vrije worp, strafworp, inloper, rebound, assist/steun, steal. "
-                        "Resultaat: ok/score of gemist/mis."
-                    ).classes("text-xs text-grey-6")
-                voice_timer = ui.timer(0.5, poll_voice_queue, active=False)
+                ui.on("voice_command", on_voice_event)
+                scorer_panel = LazyPanel(ui.column().classes("w-full gap-4"), build_scorer_controls)
 
                 with ui.row().classes("items-start gap-4"):
-                    with ui.card():
-                        ui.label("Actions").classes("text-xs font-bold text-grey-6")
-                        action_column = ui.row().classes("items-center gap-2 flex-wrap")
-                    with ui.card():
-                        ui.label("Result").classes("text-xs font-bold text-grey-6")
-                        @ui.refreshable
-                        def result_buttons():
-                            with ui.row().classes("items-center gap-2"):
-                                ok_button = ui.button(
-                                    "Ok / Score",
-                                    on_click=lambda x: submit(True),
-                                    icon="thumb_up"
-                                )
-                                miss_button = ui.button(
-                                    "Gemist",
-                                    on_click=lambda x: submit(False),
-                                    icon="thumb_down"
-                                )
-                                if state.is_match_finalized or not can_edit_match():
-                                    ok_button.disable()
-                                    miss_button.disable()
-                        result_buttons()
-
-                with ui.row().classes("items-start gap-4"):
-                    src = 'korfball_field.svg'
-                    #src = 'korfball.svg'
-                    #ii = ui.interactive_image(src, on_mouse=mouse_handler, events=['mousedown', 'mouseup'], cross=True)
-                    with ui.card():
-                        ui.label("Playfield").classes("text-xs font-bold text-grey-6")
-                        ii = ui.interactive_image(
-                            src,
-                            on_mouse=mouse_handler,
-                            events=['mousedown'],
-                            sanitize=False,
-                        ).style('width: 600px; height: auto')
+                    playfield_panel = LazyPanel(ui.element(), build_playfield)
                     with ui.card():
                         ui.label("Players").classes("text-xs font-bold text-grey-6")
                         players_column = ui.column()
 
             with ui.tab_panel("Events"):
-                with ui.card().classes("w-full"):
-                    with ui.row().classes("items-center justify-between w-full"):
-                        ui.label("Match events").classes("text-xs font-bold text-grey-6")
-                        ui.button("Refresh", on_click=refresh_actions_table).props("flat")
-                    actions_table = ui.table(
-                        columns=[
-                            {'name': 'actions', 'label': 'Actions', 'field': 'id', 'classes': 'auto-width no-wrap'},
-                            {"name": "action", "label": "Action", "field": "action", "align": 'left'},
-                            {"name": "player_name", "label": "Player", "field": "player_name", "align": 'left'},
-                            {"name": "username", "label": "User", "field": "username", "align": 'left'},
-                            {"name": "timestamp", "label": "Time", "field": "timestamp", "align": 'right'},
-                            {"name": "period", "label": "Half", "field": "period", "align": 'right'},
-                            {"name": "x", "label": "X", "field": "x", "align": 'right'},
-                            {"name": "y", "label": "Y", "field": "y", "align": 'right'},
-                            {"name": "result", "label": "Result", "field": "result", "align": 'left'},
-                        ],
-                        rows=[],
-                        row_key="id",
-                        column_defaults={'align': 'left', 'headerClasses': 'text-primary'},
-                        pagination={'rowsPerPage': 12},
-                    ).classes("w-full mt-2 q-table--dense")
-                    actions_table.add_slot('body-cell', '''
-                    <q-td :props="props">
-                        <template v-if="props.col.name === 'actions'">
-                            <q-btn flat dense round icon="edit" @click="() => $parent.$emit('edit', props.row)" />
-                            <q-btn flat dense round icon="delete" color="red" @click="() => $parent.$emit('delete', props.row)" />
-                        </template>
-                        <template v-else>
-                            {{ props.value }}
-                        </template>
-                    </q-td>''')
-                    actions_table.on("edit", open_edit_action_dialog)
-                    actions_table.on("delete", delete_action)
-
-
+                events_panel = LazyPanel(ui.element().classes("w-full"), build_events_table)
+        tabs.on_value_change(on_tab_change)
 
 
         # ---------------------------------------------------------------
@@ -1423,5 +1701,8 @@ def live_page():
             await restore_live_state()
 
         ui.timer(0, refresh_all, once=True)
+        ui.timer(2.0, sync_outbox)
+        if TRAFFIC_METER_ENABLED:
+            ui.timer(10.0, check_traffic)
 
     apply_layout(content, page_title="Match Actions")
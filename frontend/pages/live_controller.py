@@ -1,12 +1,23 @@
+import asyncio
 import logging
+from types import SimpleNamespace
 from typing import Dict, List, Optional, Callable, Awaitable
 
 from nicegui import app, ui
 
 from frontend.api import api_delete, api_get, api_post, api_put
+from backend.services.score_service import score_delta
+from frontend.outbox import PENDING, Outbox
+from frontend.voice import VoiceIndex
 
 logger = logging.getLogger('uvicorn.error')
 
+# seconds between clock broadcasts from the match owner while the clock runs
+CLOCK_BROADCAST_INTERVAL = 5
+# switch toggles less than this many seconds apart are one lineup change: the starting eight being
+# set up, or the out and in of a substitution
+LINEUP_SETTLE_SECONDS = 5.0
+
 
 class LiveState:
     """
@@ -25,9 +36,18 @@ class LiveState:
         self.is_collaborator: bool = False
 
         # Game Data
-        self.actions: List = []
+        self.actions: Dict = {}  # outbox client id -> queued action; stored ones are in match_view
+        self.match_view = None  # shared MatchView of the selected match
         self.active_player_ids: set = set()
 
+        # Mounted player cards, keyed by player id (see render_players on the live page)
+        self.player_cards: Dict = {}
+        self.player_roster: List = []
+        self.player_columns = ()
+        self.team_score: int = 0
+        self.opponent_score: int = 0
+        self.score_label = None
+
         # Clock State
         self.clock_running: bool = False
         self.clock_seconds: int = 0
@@ -50,6 +70,15 @@ class LiveState:
         # Auto-save timer
         self.playtime_save_timer = None
         self.clock_display = None
+        self.sync_label = None
+        self.traffic_over_budget = False
+
+        # Lazily built panels of the live page; None while not shown
+        self.action_column = None
+        self.playfield = None
+        self.actions_table = None
+        self.requests_table = None
+        self.voice_enabled: bool = False
 
     @property
     def formatted_time(self):
@@ -77,6 +106,20 @@ class LiveState:
 class LiveController:
     def __init__(self):
         self.state = LiveState()
+        self.outbox = Outbox(app.storage.user)
+        self._voice_index: Optional[VoiceIndex] = None
+        # (period, clock seconds) of the first switch toggle not queued as a lineup yet
+        self._lineup_moment: Optional[tuple] = None
+        self._lineup_handle: Optional[asyncio.TimerHandle] = None
+
+    def voice_index(self) -> VoiceIndex:
+        """Voice command lookup for the current roster; rebuilt only when the roster changes."""
+        if self.state.match_view is not None:
+            return self.state.match_view.voice_index()
+        key = VoiceIndex.roster_key(self.state.players)
+        if self._voice_index is None or self._voice_index.key != key:
+            self._voice_index = VoiceIndex(self.state.players)
+        return self._voice_index
 
     def ensure_timer(self, tick_cb: Callable[[], None]) -> None:
         if self.state.timer is None:
@@ -103,11 +146,44 @@ class LiveController:
             self.state.period = match_data.get("current_period", self.state.period)
             self.state.period_minutes = match_data.get("period_minutes", self.state.period_minutes)
             self.state.total_periods = match_data.get("total_periods", self.state.total_periods)
+            self.apply_match_score(match_data)
             return match_data
         except Exception as e:
             logger.error(f"Failed to load match data: {e}")
             return None
 
+    async def load_match_score(self, match_id: int, token: Optional[str] = None):
+        try:
+            match_data = await api_get(f"/matches/{match_id}", token=token)
+        except Exception as e:
+            logger.error(f"Failed to load match score: {e}")
+            return None
+        self.apply_match_score(match_data)
+        return match_data
+
+    def apply_match_score(self, match_data: Dict) -> None:
+        self.state.team_score = match_data.get("team_score", 0) or 0
+        self.state.opponent_score = match_data.get("opponent_score", 0) or 0
+
+    def pending_score_delta(self, match_id: int) -> tuple[int, int]:
+        """Score contribution of actions that are queued but not stored yet; failed ones don't count."""
+        team = opponent = 0
+        for entry in self.outbox.actions_for_match(match_id):
+            if entry["status"] != PENDING:
+                continue
+            team_delta, opponent_delta = score_delta(SimpleNamespace(**entry["payload"]))
+            team += team_delta
+            opponent += opponent_delta
+        return team, opponent
+
+    def displayed_score(self) -> tuple[int, int]:
+        team, opponent = self.state.team_score, self.state.opponent_score
+        if self.state.selected_match_id:
+            team_delta, opponent_delta = self.pending_score_delta(self.state.selected_match_id)
+            team += team_delta
+            opponent += opponent_delta
+        return team, opponent
+
     async def load_playtime_data(self, match_id: int, token: Optional[str] = None):
         try:
             playtime_data = await api_get(f"/playtime/{match_id}", token=token)
@@ -144,14 +220,67 @@ class LiveController:
                 "total_periods": self.state.total_periods,
             }
 
-            await api_put(f"/playtime/{self.state.selected_match_id}", time_update, token=token)
-            logger.info(f"Saved playtime data: {time_update}")
-
+            # queued first, so the totals are not lost while the API is unreachable
+            self.outbox.enqueue_playtime(self.state.selected_match_id, time_update)
             self.state.saved_player_seconds = total_player_times
             self.state.player_seconds = {}
+
+            report = await self.outbox.flush(token=token, force=True)
+            if not report.offline:
+                logger.info(f"Saved playtime data: {time_update}")
         except Exception as e:
             logger.error(f"Failed to save playtime data: {e}")
 
+    def queue_action(self, payload: Dict) -> Dict:
+        return self.outbox.enqueue_action(payload)
+
+    def queue_lineup(self) -> Optional[Dict]:
+        """Queue the players on the field as a lineup change at the clock of the first pending toggle."""
+        period, timestamp = self._lineup_moment or (self.state.period, self.state.clock_seconds)
+        self._lineup_moment = None
+        if self._lineup_handle is not None:
+            self._lineup_handle.cancel()
+            self._lineup_handle = None
+        if not self.state.selected_match_id or self.state.is_match_finalized:
+            return None
+        return self.outbox.enqueue_lineup(self.state.selected_match_id, {
+            "period": period,
+            "timestamp": timestamp,
+            "player_ids": sorted(self.state.active_player_ids),
+        })
+
+    def lineup_toggled(self, on_queued: Callable[[], None]) -> None:
+        """
+        Queue the lineup once the switches have settled for ``LINEUP_SETTLE_SECONDS``.
+
+        Each toggle restarts the wait, so the lineups in between (1 to 7 players while the start is
+        set up, 7 or 9 during a substitution) are never stored; the change takes effect at the clock
+        of its first toggle. ``on_queued`` runs after the lineup was queued, e.g. to sync it.
+        """
+        if self._lineup_moment is None:
+            self._lineup_moment = (self.state.period, self.state.clock_seconds)
+        if self._lineup_handle is not None:
+            self._lineup_handle.cancel()
+        try:
+            self._lineup_handle = asyncio.get_running_loop().call_later(
+                LINEUP_SETTLE_SECONDS, self._settle_lineup, on_queued)
+        except RuntimeError:
+            self._settle_lineup(on_queued)
+
+    def _settle_lineup(self, on_queued: Callable[[], None]) -> None:
+        self._lineup_handle = None
+        if self.queue_lineup() is not None:
+            on_queued()
+
+    def flush_lineup(self) -> Optional[Dict]:
+        """Queue a lineup that is still settling right away, e.g. before leaving the match."""
+        if self._lineup_moment is None:
+            return None
+        return self.queue_lineup()
+
+    async def sync_outbox(self, token: Optional[str] = None):
+        return await self.outbox.flush(token=token)
+
     async def lock_match(self, match_id: int, token: Optional[str] = None):
         try:
             response = await api_post(f"/matches/{match_id}/lock", {}, token=token)
@@ -192,8 +321,15 @@ class LiveController:
     async def update_action(self, action_id: int, payload: dict, token: Optional[str] = None):
         return await api_put(f"/actions/{action_id}", payload, token=token)
 
-    async def delete_action(self, action_id: int, token: Optional[str] = None):
-        await api_delete(f"/actions/{action_id}", token=token)
+    async def delete_action(self, action_id: int, version: Optional[int] = None, token: Optional[str] = None):
+        query = f"?version={version}" if version is not None else ""
+        await api_delete(f"/actions/{action_id}{query}", token=token)
+
+    async def undo_action(self, match_id: int, token: Optional[str] = None):
+        return await api_post(f"/matches/{match_id}/undo", {}, token=token)
+
+    async def redo_action(self, match_id: int, token: Optional[str] = None):
+        return await api_post(f"/matches/{match_id}/redo", {}, token=token)
 
     async def request_join(self, match_id: int, token: Optional[str] = None):
         return await api_post(f"/matches/{match_id}/join_request", {}, token=token)
@@ -234,6 +370,69 @@ class LiveController:
         self.state.remaining_seconds = self.state.period_minutes * 60
         return True
 
+    def update_player_time_labels(self) -> None:
+        for pid, card in self.state.player_cards.items():
+            card.set_time(self.state.formatted_player_time(pid))
+
+    def apply_clock_event(
+        self,
+        payload: dict,
+        refresh_clock: Callable[[], None],
+        lock_changed: Callable[[], None],
+        rights_changed: Callable[[], None],
+    ) -> None:
+        """
+        Take over a clock broadcast; only what actually changed is redrawn.
+
+        The owner re-broadcasts the running clock every few seconds, so usually only the clock and
+        player time labels get new texts. ``lock_changed`` runs when another user took the lock,
+        ``rights_changed`` when the lock or the finalized flag changed what this page may edit, and
+        ``refresh_clock`` rebuilds the clock area when it started, stopped or moved to another period.
+        """
+        state = self.state
+        previous = (
+            state.clock_running,
+            state.period,
+            bool(state.is_match_finalized),
+            (state.selected_match_data or {}).get("locked_by_user_id"),
+        )
+        if payload.get("period_minutes"):
+            state.period_minutes = payload.get("period_minutes")
+        if payload.get("total_periods"):
+            state.total_periods = payload.get("total_periods")
+        state.clock_running = bool(payload.get("clock_running"))
+        if payload.get("clock_seconds") is not None:
+            state.clock_seconds = int(payload.get("clock_seconds"))
+        if payload.get("remaining_seconds") is not None:
+            state.remaining_seconds = int(payload.get("remaining_seconds"))
+        if payload.get("period") is not None:
+            state.period = int(payload.get("period"))
+        if payload.get("is_finalized") is not None:
+            if state.selected_match_data is None:
+                state.selected_match_data = {}
+            state.selected_match_data["is_finalized"] = bool(payload.get("is_finalized"))
+            if state.selected_match_data["is_finalized"]:
+                state.clock_running = False
+                state.current_action = None
+                state.selected_player_id = None
+        lock_moved = False
+        if payload.get("locked_by_user_id") is not None:
+            if state.selected_match_data is None:
+                state.selected_match_data = {}
+            lock_moved = payload.get("locked_by_user_id") != previous[3]
+            state.selected_match_data["locked_by_user_id"] = payload.get("locked_by_user_id")
+        finalized_changed = bool(state.is_match_finalized) != previous[2]
+
+        if lock_moved:
+            lock_changed()
+        if lock_moved or finalized_changed:
+            rights_changed()
+        if lock_moved or finalized_changed or (state.clock_running, state.period) != previous[:2]:
+            refresh_clock()
+        elif state.clock_display and state.clock_display.text != state.formatted_remaining_time:
+            state.clock_display.text = state.formatted_remaining_time
+        self.update_player_time_labels()
+
     def tick(
         self,
         update_players: Callable[[], None],
@@ -243,6 +442,7 @@ class LiveController:
         if self.state.clock_running and self.state.remaining_seconds > 0:
             self.state.remaining_seconds -= 1
             self.state.clock_seconds += 1
+            # all label changes of one tick leave in a single NiceGUI update message
             if self.state.clock_display:
                 self.state.clock_display.text = self.state.formatted_remaining_time
 
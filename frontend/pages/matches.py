@@ -3,7 +3,7 @@ import logging
 import httpx
 from nicegui import ui
 from frontend.layout import apply_layout
-from frontend.api import api_get, api_post, api_put, api_delete
+from frontend.api import ApiError, api_get, api_post, api_put, api_delete
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -25,18 +25,26 @@ def matches_page():
 
         async def refresh_matches_table():
             team_id = team_select.value
-            matches = await api_get(f"/teams/{team_id}/matches") if team_id else []
-            # flatten team name for the table
+            matches = await api_get(f"/teams/{team_id}/matches/summary") if team_id else []
+            team_name = team_select.options.get(team_id, "N/A") if team_id else "N/A"
             for m in matches:
-                m["team_name"] = m["team"]["name"] if m.get("team") else "N/A"
+                m["team_name"] = team_name
                 m["date"] = m["date"][:10]  # show only date part
+                is_home = (m.get("location") or "").strip().lower() == "thuis"
+                team_score = m.get("team_score", 0)
+                opponent_score = m.get("opponent_score", 0)
+                m["score"] = f"{team_score} - {opponent_score}" if is_home else f"{opponent_score} - {team_score}"
+                m["shots"] = f'{m["goals"]}/{m["attempts"]}'
+                m["efficiency_label"] = f'{m["efficiency"]}%' if m.get("efficiency") is not None else "-"
+                m["finalized"] = "Yes" if m.get("is_finalized") else "No"
+                m["scorers"] = ", ".join(m.get("usernames") or [])
 
             matches_table.rows = matches
 
         # ----------------------------------------------------------------------
         # ACTION HANDLERS
         # ----------------------------------------------------------------------
-        async def create_new_match(team_id, date, opponent_name, location, dialog):
+        async def create_new_match(team_id, date, opponent_name, location, shared_scoring, dialog):
             try:
                 if team_id and opponent_name.strip():
                     logger.info(f"Match date: {date}")
@@ -46,7 +54,8 @@ def matches_page():
                             "team_id": team_id,
                             "date": date,
                             "opponent_name": opponent_name,
-                            "location": location
+                            "location": location,
+                            "shared_scoring": shared_scoring,
                         },
                     )
                     dialog.close()
@@ -77,8 +86,9 @@ def matches_page():
                     ).classes('w-full')
                     opponent_input_diag = ui.input('Opponent Name').classes('w-full')
                     location_input_diag = ui.select(options=['Thuis', 'Uit'], label='Location').classes('w-full')
+                    shared_switch_diag = ui.switch('Shared scoring (no lock, every scorer can register)')
                 with ui.row():
-                    ui.button('Save', on_click=lambda: create_new_match(team_select.value, match_date_diag.value, opponent_input_diag.value, location_input_diag.value, dialog))
+                    ui.button('Save', on_click=lambda: create_new_match(team_select.value, match_date_diag.value, opponent_input_diag.value, location_input_diag.value, shared_switch_diag.value, dialog))
                     ui.button('Cancel', on_click=dialog.close)
             dialog.open()
 
@@ -94,7 +104,7 @@ def matches_page():
                 with ui.column().classes('w-full gap-4'):
                     team_options = {team['id']: team['name'] for team in await api_get("/teams")}
                     team_select_diag = ui.select(team_options, label="Team", with_input=False).classes("w-full")
-                    team_select_diag.set_value(match['team']['id'] if match.get('team') else None)
+                    team_select_diag.set_value(match.get('team_id'))
                     match_date_diag = ui.date_input(
                         'Match Date',
                         on_change=lambda e: match_date_diag.menu.close(),
@@ -104,17 +114,25 @@ def matches_page():
                     opponent_input_diag.set_value(match['opponent_name'])
                     location_input_diag = ui.select(options=['Thuis', 'Uit'], label='Location').classes('w-full')
                     location_input_diag.set_value(match['location'])
+                    shared_switch_diag = ui.switch('Shared scoring (no lock, every scorer can register)', value=bool(match.get('shared_scoring')))
                 with ui.row():
-                    ui.button('Save', on_click=lambda: save_edited_match(match['id'], team_select_diag.value, match_date_diag.value, opponent_input_diag.value, location_input_diag.value, dialog))
+                    ui.button('Save', on_click=lambda: save_edited_match(match['id'], match.get('version'), team_select_diag.value, match_date_diag.value, opponent_input_diag.value, location_input_diag.value, shared_switch_diag.value, dialog))
                     ui.button('Cancel', on_click=dialog.close)
             dialog.open()
 
-        async def save_edited_match(match_id, team_id, date, opponent_name, location, dialog):
+        async def save_edited_match(match_id, version, team_id, date, opponent_name, location, shared_scoring, dialog):
             try:
                 if opponent_name.strip():
-                    await api_put(f"/matches/{match_id}", {"team_id": team_id, "date": date, "opponent_name": opponent_name, "location": location})
+                    await api_put(f"/matches/{match_id}", {"team_id": team_id, "date": date, "opponent_name": opponent_name, "location": location, "shared_scoring": shared_scoring, "version": version})
                     dialog.close()
                     await refresh_all()
+            except ApiError as e:
+                if e.status == 409:
+                    ui.notify("Someone else changed this match in the meantime; reopen it to see their changes", color='warning')
+                    dialog.close()
+                    await refresh_all()
+                else:
+                    ui.notify(f"Failed to update match: {e}", color='negative')
             except httpx.HTTPStatusError as e:
                 # Show error message from response, if available
                 try:
@@ -171,7 +189,14 @@ def matches_page():
                         {"name": "team", "label": "Team", "field": "team_name", "sortable": True, "align": 'left'},
                         {"name": "date", "label": "Date", "field": "date", "sortable": True,  "align": 'left'},
                         {"name": "opponent_name", "label": "Opponent", "field": "opponent_name", "sortable": True,  "align": 'left'},
-                        {"name": "location", "label": "Location", "field": "location",  "align": 'left'}
+                        {"name": "location", "label": "Location", "field": "location",  "align": 'left'},
+                        {"name": "score", "label": "Score", "field": "score",  "align": 'left'},
+                        {"name": "shots", "label": "Goals/Attempts", "field": "shots",  "align": 'left'},
+                        {"name": "efficiency", "label": "Efficiency", "field": "efficiency_label",  "align": 'left'},
+                        {"name": "actions_count", "label": "Events", "field": "action_count", "sortable": True, "align": 'left'},
+                        {"name": "minutes", "label": "Minutes", "field": "minutes_registered", "sortable": True, "align": 'left'},
+                        {"name": "finalized", "label": "Finalized", "field": "finalized",  "align": 'left'},
+                        {"name": "scorers", "label": "Registered by", "field": "scorers",  "align": 'left'}
                     ],
                     rows=[],
                     row_key="id",
@@ -186,6 +211,7 @@ def matches_page():
                         <template v-if="props.col.name === 'actions'">
                             <q-btn flat dense round icon="edit" @click="() => $parent.$emit('edit', props.row)" />
                             <q-btn flat dense round icon="delete" color="red" @click="() => $parent.$emit('delete', props.row)" />
+                            <q-btn flat dense round icon="visibility" :href="'/spectate/' + props.row.id" target="_blank" title="Spectator view" />
                         </template>
                         <template v-else>
                             {{ props.value }}
@@ -0,0 +1,86 @@
+from typing import Dict
+
+from nicegui import ui
+
+from frontend import spectators
+from frontend.api import ApiError
+from frontend.pages.live import format_action_label
+
+
+def format_seconds(seconds: int) -> str:
+    mins, secs = divmod(max(0, int(seconds)), 60)
+    return f"{mins:02d}:{secs:02d}"
+
+
+def format_clock(snapshot: dict) -> str:
+    clock = snapshot.get("clock") or {}
+    if snapshot.get("is_finalized"):
+        return "Final"
+    text = f"Half {clock.get('period', 1)}/{clock.get('total_periods', 2)}"
+    if clock.get("remaining_seconds") is not None:
+        text += f" · {format_seconds(clock['remaining_seconds'])}"
+    if not clock.get("clock_running"):
+        text += " (paused)"
+    return text
+
+
+def format_spectator_action(action: dict) -> str:
+    if action.get("is_opponent"):
+        label = "Opponent goal"
+    else:
+        label = format_action_label(action.get("action"))
+        if action.get("result"):
+            label += " ✓"
+        if action.get("player"):
+            label += f" · {action['player']}"
+    return f"H{action.get('period')} {format_seconds(action.get('timestamp') or 0)}  {label}"
+
+
+def render_spectator_texts(snapshot: dict) -> Dict[str, str]:
+    """All texts of a spectator board; rendered once per change for every spectator of the match."""
+    return {
+        "score": (
+            f"{snapshot.get('team_name')} {snapshot.get('team_score', 0)} - "
+            f"{snapshot.get('opponent_score', 0)} {snapshot.get('opponent_name') or 'Opponent'}"
+        ),
+        "clock": format_clock(snapshot),
+        "lineup": ", ".join(player["name"] for player in snapshot.get("lineup") or []) or "-",
+        "actions": "\n".join(format_spectator_action(a) for a in snapshot.get("recent_actions") or []) or "-",
+    }
+
+
+class SpectatorBoard(ui.column):
+    """A handful of labels; the shared feed pushes new texts into them."""
+
+    def __init__(self):
+        super().__init__()
+        self.classes("w-full items-center gap-2 p-4")
+        with self:
+            self.score = ui.label().classes("text-3xl font-bold text-center")
+            self.clock = ui.label().classes("text-xl")
+            ui.label("On the field").classes("text-sm text-gray-500 mt-4")
+            self.lineup = ui.label().classes("text-center")
+            ui.label("Latest actions").classes("text-sm text-gray-500 mt-4")
+            self.actions = ui.label().classes("font-mono text-sm").style("white-space: pre-line")
+
+    def show(self, texts: Dict[str, str]) -> None:
+        for key, text in texts.items():
+            getattr(self, key).set_text(text)
+
+
+@ui.page("/spectate/{match_id}")
+async def spectate_page(match_id: int):
+    # no login and no live controller: spectators only hold the elements of this board
+    with ui.header().classes(replace='row items-center').style('height: 50px;'):
+        ui.label("Ganda Korfball · Live").style('margin-left: 16px; font-weight: bold; font-size: 18px; color: white;')
+    board = SpectatorBoard()
+    try:
+        await spectators.watch(match_id, ui.context.client, board, render_spectator_texts)
+    except ApiError as exc:
+        board.clear()
+        with board:
+            ui.label("Match not found" if exc.status == 404 else f"Match unavailable: {exc}")
+    except Exception:
+        board.clear()
+        with board:
+            ui.label("The live feed is not available right now")
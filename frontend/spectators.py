@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import os
+from typing import Callable, Dict, Optional, Protocol
+
+from nicegui import background_tasks
+
+from backend.services import spectator_service
+from frontend.api import api_get_public
+
+logger = logging.getLogger('uvicorn.error')
+
+# how often the snapshot of a watched match is fetched again, on top of the pushed deltas
+SPECTATOR_REFRESH_SECONDS = float(os.getenv("KORFBALL_SPECTATOR_REFRESH_SECONDS", "30"))
+# deltas are shown this long after they arrive, so the fan-out to every board happens after the
+# scoring request has been answered and a burst of deltas is rendered once
+FLUSH_SECONDS = 0.05
+
+Render = Callable[[dict], Dict[str, str]]
+
+
+class Board(Protocol):
+    """The few elements of one spectator page; ``show`` sets the given texts."""
+
+    @property
+    def is_deleted(self) -> bool: ...
+
+    def show(self, texts: Dict[str, str]) -> None: ...
+
+
+class SpectatorFeed:
+    """
+    One match as seen by all spectators in this process.
+
+    The snapshot is fetched once per match and kept current with the deltas of the spectator
+    service. Texts are rendered once per change and handed to every board; a spectator only
+    owns its page elements.
+    """
+
+    def __init__(self, match_id: int, render: Render):
+        self.match_id = match_id
+        self.render = render
+        self.snapshot: Optional[dict] = None
+        self.texts: Dict[str, str] = {}
+        self._boards: Dict[str, Board] = {}
+        self._load_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._flush: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def board_count(self) -> int:
+        return len(self._boards)
+
+    async def load(self) -> None:
+        async with self._load_lock:
+            if self.snapshot is None:
+                self.replace(await api_get_public(f"/spectate/{self.match_id}"))
+
+    def attach(self, client, board: Board) -> None:
+        self._boards[client.id] = board
+        board.show(self.texts)
+        if self._refresh_task is None:
+            self._refresh_task = background_tasks.create(self._refresh_loop(), name=f"spectators {self.match_id}")
+
+    def replace(self, snapshot: dict) -> None:
+        if self.snapshot is not None and snapshot.get("version", 0) < self.snapshot.get("version", 0):
+            return  # a newer delta arrived while this snapshot was in flight
+        self.snapshot = dict(snapshot)
+        self._show_changes()
+
+    def apply(self, delta: dict) -> None:
+        if self.snapshot is None:
+            return
+        self.snapshot.update(delta)
+        if self._flush is not None:
+            return
+        try:
+            self._flush = asyncio.get_running_loop().call_later(FLUSH_SECONDS, self._flush_changes)
+        except RuntimeError:
+            self._show_changes()
+
+    def _flush_changes(self) -> None:
+        self._flush = None
+        self._show_changes()
+
+    def prune(self) -> None:
+        for client_id, board in list(self._boards.items()):
+            if board.is_deleted:
+                del self._boards[client_id]
+
+    def _show_changes(self) -> None:
+        texts = self.render(self.snapshot)
+        changed = {key: text for key, text in texts.items() if self.texts.get(key) != text}
+        self.texts = texts
+        if not changed:
+            return
+        self.prune()
+        # only texts of existing labels change, so no client context is needed; entering one per
+        # spectator doubled the cost of a fan-out
+        for board in list(self._boards.values()):
+            board.show(changed)
+
+    async def _refresh_loop(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(SPECTATOR_REFRESH_SECONDS)
+                self.prune()
+                if not self._boards:
+                    break
+                try:
+                    self.replace(await api_get_public(f"/spectate/{self.match_id}"))
+                except Exception as exc:
+                    logger.warning(f"Refreshing spectator snapshot of match {self.match_id} failed: {exc}")
+        finally:
+            self._refresh_task = None
+            if not self._boards and _feeds.get(self.match_id) is self:
+                _feeds.pop(self.match_id, None)
+
+
+_feeds: Dict[int, SpectatorFeed] = {}
+
+
+async def watch(match_id: int, client, board: Board, render: Render) -> SpectatorFeed:
+    """Show the feed of a match on ``board``; the first spectator of a match loads its snapshot."""
+    feed = _feeds.get(match_id)
+    if feed is None:
+        feed = _feeds[match_id] = SpectatorFeed(match_id, render)
+    try:
+        await feed.load()
+    except Exception:
+        if not feed.board_count:
+            _feeds.pop(match_id, None)
+        raise
+    feed.attach(client, board)
+    return feed
+
+
+def stats() -> Dict[str, int]:
+    return {
+        "matches": len(_feeds),
+        "spectators": sum(feed.board_count for feed in _feeds.values()),
+    }
+
+
+def _on_delta(match_id: int, delta: dict) -> None:
+    feed = _feeds.get(match_id)
+    if feed is not None:
+        feed.apply(delta)
+
+
+spectator_service.add_listener(_on_delta)
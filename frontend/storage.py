@@ -0,0 +1,234 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, MutableMapping, Optional
+
+import nicegui
+from nicegui import background_tasks, core
+from nicegui.persistence import PersistentDict
+from nicegui.storage import Storage
+
+logger = logging.getLogger('uvicorn.error')
+
+STORAGE_DB_PATH = Path(os.getenv("KORFBALL_STORAGE_DB", "korfball_storage.db"))
+# how long changes to one storage dict are collected before they are written
+STORAGE_WRITE_DELAY = float(os.getenv("KORFBALL_STORAGE_WRITE_DELAY", "0.5"))
+# storage rows not written for this many days are deleted at startup, like an expired session
+STORAGE_MAX_AGE_DAYS = float(os.getenv("KORFBALL_STORAGE_MAX_AGE_DAYS", "30"))
+# NiceGUI has no public hook for a storage backend; the SQLite one replaces Storage internals
+# that were checked against these major versions only
+SUPPORTED_NICEGUI_MAJOR = (3,)
+
+
+class DebouncedWriter:
+    """
+    Write a computed value to a storage mapping at most once per ``delay`` seconds.
+
+    ``schedule`` only marks the value dirty; the value is built and written when the delay
+    expires (or on ``flush``), and skipped entirely when it equals the last written value.
+    """
+
+    def __init__(self, storage: MutableMapping, key: str, build: Callable[[], Any], delay: float = 2.0):
+        self.storage = storage
+        self.key = key
+        self.build = build
+        self.delay = delay
+        self.writes = 0
+        self._last = storage.get(key)
+        self._dirty = False
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def schedule(self) -> None:
+        self._dirty = True
+        if self._handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._handle = loop.call_later(self.delay, self.flush)
+
+    def flush(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._dirty:
+            return
+        self._dirty = False
+        value = self.build()
+        if value == self._last:
+            return
+        self.storage[self.key] = value
+        self._last = value
+        self.writes += 1
+
+
+class _SqliteStore:
+    """One shared connection per database file; rows are (id, JSON data)."""
+
+    _stores: Dict[Path, "_SqliteStore"] = {}
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS nicegui_storage ("
+            "id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+        self.writes = 0
+
+    @classmethod
+    def get(cls, path: Path) -> "_SqliteStore":
+        path = Path(path)
+        if path not in cls._stores:
+            cls._stores[path] = cls(path)
+        return cls._stores[path]
+
+    def load(self, id: str) -> Dict:
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM nicegui_storage WHERE id = ?", (id,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save(self, id: str, data: Optional[str]) -> None:
+        with self.lock:
+            if data is None:
+                self.conn.execute("DELETE FROM nicegui_storage WHERE id = ?", (id,))
+            else:
+                self.conn.execute(
+                    "INSERT INTO nicegui_storage (id, data, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                    (id, data, time.time()),
+                )
+            self.conn.commit()
+            self.writes += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM nicegui_storage")
+            self.conn.commit()
+
+    def purge(self, max_age: float) -> int:
+        """Delete the rows not written for ``max_age`` seconds; returns how many."""
+        with self.lock:
+            deleted = self.conn.execute(
+                "DELETE FROM nicegui_storage WHERE updated_at < ?", (time.time() - max_age,)
+            ).rowcount
+            self.conn.commit()
+        return deleted
+
+
+class SqlitePersistentDict(PersistentDict):
+    """
+    NiceGUI persistent dict kept as one row of a shared SQLite table.
+
+    Replaces the ``storage-<id>.json`` file per session; changes made within
+    ``STORAGE_WRITE_DELAY`` seconds are written together.
+    """
+
+    def __init__(self, path: Path, id: str, delay: float = STORAGE_WRITE_DELAY):  # pylint: disable=redefined-builtin
+        self.store = _SqliteStore.get(path)
+        self.id = id
+        self.delay = delay
+        self._loading = False
+        self._dirty = False
+        self._pending: Optional[asyncio.Task] = None
+        super().__init__(data={}, on_change=self._schedule)
+
+    async def initialize(self) -> None:
+        self._apply(await asyncio.to_thread(self.store.load, self.id))
+
+    def initialize_sync(self) -> None:
+        self._apply(self.store.load(self.id))
+
+    def _apply(self, data: Dict) -> None:
+        self._loading = True
+        try:
+            self.update(data)
+        finally:
+            self._loading = False
+
+    def _serialize(self) -> Optional[str]:
+        return json.dumps(self, default=str) if self else None
+
+    def _schedule(self) -> None:
+        if self._loading:
+            return
+        self._dirty = True
+        if self._pending is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._dirty = False
+            self.store.save(self.id, self._serialize())
+            return
+        name = f"storage {self.id}"
+        if core.is_loop_running():
+            self._pending = background_tasks.create(self._write_later(), name=name)
+        else:  # scripts and tests run their own loop
+            self._pending = loop.create_task(self._write_later(), name=name)
+
+    async def _write_later(self) -> None:
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self._pending = None
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._dirty:
+            return
+        self._dirty = False
+        await asyncio.to_thread(self.store.save, self.id, self._serialize())
+
+    async def close(self) -> None:
+        await self.flush()
+
+
+def _supports_sqlite_storage() -> bool:
+    major = int(nicegui.__version__.split(".")[0])
+    return major in SUPPORTED_NICEGUI_MAJOR and callable(getattr(Storage, "_create_persistent_dict", None))
+
+
+def install_sqlite_storage(path: Path = STORAGE_DB_PATH, max_age_days: float = STORAGE_MAX_AGE_DAYS) -> bool:
+    """
+    Keep user and tab storage in SQLite; must run before ``ui.run_with``.
+
+    Returns False, keeping NiceGUI's file storage, when the installed NiceGUI is not a version this
+    backend was checked against. ``app.storage.clear()`` deletes the rows as well, and rows older
+    than ``max_age_days`` are removed right away.
+    """
+    if not _supports_sqlite_storage():
+        logger.warning(f"SQLite user storage does not support NiceGUI {nicegui.__version__}; using file storage")
+        return False
+    store = _SqliteStore.get(path)
+    purged = store.purge(max_age_days * 86400)
+    if purged:
+        logger.info(f"Deleted {purged} expired user storage rows")
+
+    create_default = Storage._create_persistent_dict
+    clear_default = Storage.clear
+
+    def create_persistent_dict(id: str) -> PersistentDict:  # pylint: disable=redefined-builtin
+        if Storage.redis_url:
+            return create_default(id)
+        return SqlitePersistentDict(path, id)
+
+    def clear(storage: Storage) -> None:
+        clear_default(storage)
+        store.clear()
+
+    Storage._create_persistent_dict = staticmethod(create_persistent_dict)
+    Storage.clear = clear
+    logger.info(f"User storage is kept in {path}")
+    return True
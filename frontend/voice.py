@@ -0,0 +1,242 @@
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.schema import ActionType
+
+
+ACTION_SYNONYMS = {
+    "schot": ActionType.SHOT,
+    "korte kans": ActionType.KORTE_KANS,
+    "kortekans": ActionType.KORTE_KANS,
+    "vrije worp": ActionType.VRIJWORP,
+    "vrijworp": ActionType.VRIJWORP,
+    "strafworp": ActionType.STRAFWORP,
+    "penalty": ActionType.STRAFWORP,
+    "inloper": ActionType.INLOPER,
+    "rebound": ActionType.REBOUND,
+    "assist": ActionType.ASSIST,
+    "steun": ActionType.ASSIST,
+    "steal": ActionType.STEAL,
+    "stelen": ActionType.STEAL,
+}
+
+RESULT_SCORE_WORDS = {"ok", "oke", "okay", "score", "raak", "doelpunt", "goal"}
+RESULT_MISS_WORDS = {"gemist", "mis", "naast"}
+
+# actions that are registered without a result word
+NO_RESULT_ACTIONS = {ActionType.REBOUND, ActionType.ASSIST, ActionType.STEAL}
+
+FILLER_WORDS = {"speler", "nummer", "de", "het"}
+
+# keys are in normalize() form: "één" is looked up as "een"
+NUMBER_WORDS = {
+    "nul": 0, "een": 1, "twee": 2, "drie": 3, "vier": 4, "vijf": 5, "zes": 6, "zeven": 7,
+    "acht": 8, "negen": 9, "tien": 10, "elf": 11, "twaalf": 12, "dertien": 13, "veertien": 14,
+    "vijftien": 15, "zestien": 16, "zeventien": 17, "achttien": 18, "negentien": 19, "twintig": 20,
+}
+
+# (pattern, replacement) applied in order; folds spellings that sound alike in Dutch
+_PHONETIC_RULES = [
+    (re.compile(r"sch"), "s"),
+    (re.compile(r"ch|g"), "g"),
+    (re.compile(r"h$"), ""),
+    (re.compile(r"ij|ei|y"), "Y"),
+    (re.compile(r"au|ou"), "A"),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"th"), "t"),
+    (re.compile(r"ck|c|q"), "k"),
+    (re.compile(r"dt|d$"), "t"),
+    (re.compile(r"v"), "f"),
+    (re.compile(r"z"), "s"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"x"), "ks"),
+    (re.compile(r"ie"), "i"),
+    (re.compile(r"oe"), "u"),
+]
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    cleaned = "".join(ch if ch.isalnum() or ch.isspace() else " " for ch in text)
+    return " ".join(cleaned.split())
+
+
+def phonetic_key(word: str) -> str:
+    """Coarse Dutch-aware sound key: alike-sounding spellings map to the same key."""
+    key = normalize(word).replace(" ", "")
+    for pattern, replacement in _PHONETIC_RULES:
+        key = pattern.sub(replacement, key)
+    # long and short vowels sound alike in names ("Peeters" / "Peters"), so collapse repeats
+    collapsed: List[str] = []
+    for ch in key:
+        if not collapsed or ch != collapsed[-1]:
+            collapsed.append(ch)
+    return "".join(collapsed)
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    """Dice coefficient of two trigram sets."""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def parse_number(token: str) -> Optional[int]:
+    if token.isdigit():
+        return int(token)
+    return NUMBER_WORDS.get(token)
+
+
+@dataclass
+class Candidate:
+    value: object  # player id or ActionType
+    label: str
+    score: float
+
+
+@dataclass
+class VoiceCommand:
+    actions: List[Candidate] = field(default_factory=list)
+    players: List[Candidate] = field(default_factory=list)
+    result: Optional[bool] = None  # True for a score, False for a miss, None when not said
+    player_text: str = ""
+
+    @property
+    def action(self) -> Optional[Candidate]:
+        return self.actions[0] if self.actions else None
+
+    @property
+    def player(self) -> Optional[Candidate]:
+        return self.players[0] if self.players else None
+
+    def player_is_ambiguous(self, margin: float = 0.05) -> bool:
+        """True when the runner-up is a different player scoring almost as high."""
+        return len(self.players) > 1 and self.players[0].score - self.players[1].score < margin
+
+
+class _TermIndex:
+    """Exact, phonetic and trigram lookup over a set of (term, value) pairs."""
+
+    def __init__(self, terms: Iterable[Tuple[str, object, str]]):
+        self.entries: List[Tuple[str, object, str, Set[str], str]] = []
+        self.exact: Dict[str, Set[int]] = defaultdict(set)
+        self.phonetic: Dict[str, Set[int]] = defaultdict(set)
+        self.grams: Dict[str, Set[int]] = defaultdict(set)
+        for term, value, label in terms:
+            term = normalize(term)
+            if not term:
+                continue
+            idx = len(self.entries)
+            grams = trigrams(term)
+            key = phonetic_key(term)
+            self.entries.append((term, value, label, grams, key))
+            self.exact[term].add(idx)
+            if key:
+                self.phonetic[key].add(idx)
+            for gram in grams:
+                self.grams[gram].add(idx)
+
+    def lookup(self, text: str, limit: int = 5) -> List[Candidate]:
+        text = normalize(text)
+        if not text:
+            return []
+        scores: Dict[int, float] = {}
+        for idx in self.exact.get(text, ()):
+            scores[idx] = 1.0
+
+        grams = trigrams(text)
+        shared: Set[int] = set()
+        for gram in grams:
+            shared |= self.grams.get(gram, set())
+        for idx in shared:
+            if idx not in scores:
+                scores[idx] = similarity(grams, self.entries[idx][3])
+
+        # same sound, different spelling ("Kees" / "Cees", "Thijs" / "Tijs")
+        for idx in self.phonetic.get(phonetic_key(text), ()):
+            if scores.get(idx, 0.0) < 0.85:
+                scores[idx] = 0.85
+
+        best: Dict[object, Candidate] = {}
+        for idx, score in scores.items():
+            _, value, label, _, _ = self.entries[idx]
+            if value not in best or score > best[value].score:
+                best[value] = Candidate(value, label, round(score, 3))
+        ranked = sorted(best.values(), key=lambda c: (-c.score, c.label))
+        return ranked[:limit]
+
+
+class VoiceIndex:
+    """
+    Lookup structures for voice commands, built once per roster.
+
+    Player names are indexed by first name, last name and full name, each exactly, by trigram
+    and by phonetic key; shirt numbers are matched directly (digits or Dutch number words).
+    """
+
+    def __init__(self, players: List[Dict]):
+        self.key = self.roster_key(players)
+        self.numbers: Dict[int, Tuple[int, str]] = {}
+        terms = []
+        for player in players:
+            first = (player.get("first_name") or "").strip()
+            last = (player.get("last_name") or "").strip()
+            full = f"{first} {last}".strip()
+            for name in {first, last, full}:
+                if name:
+                    terms.append((name, player["id"], full))
+            if player.get("number") is not None:
+                self.numbers[int(player["number"])] = (player["id"], full)
+        self.players = _TermIndex(terms)
+        self.actions = _TermIndex((phrase, action, phrase) for phrase, action in ACTION_SYNONYMS.items())
+
+    @staticmethod
+    def roster_key(players: List[Dict]) -> Tuple:
+        return tuple(
+            (p.get("id"), p.get("first_name"), p.get("last_name"), p.get("number")) for p in players
+        )
+
+    def match_players(self, text: str) -> List[Candidate]:
+        tokens = [t for t in normalize(text).split() if t not in FILLER_WORDS]
+        for token in tokens:
+            number = parse_number(token)
+            if number is not None and number in self.numbers:
+                player_id, label = self.numbers[number]
+                return [Candidate(player_id, f"#{number} {label}".strip(), 1.0)]
+        return self.players.lookup(" ".join(tokens))
+
+    def parse(self, command: str) -> VoiceCommand:
+        """Parse "action player [result]" into ranked action and player candidates."""
+        tokens = normalize(command).split()
+        parsed = VoiceCommand()
+
+        # result word comes last
+        for idx in range(len(tokens) - 1, -1, -1):
+            if tokens[idx] in RESULT_SCORE_WORDS or tokens[idx] in RESULT_MISS_WORDS:
+                parsed.result = tokens[idx] in RESULT_SCORE_WORDS
+                tokens = tokens[:idx]
+                break
+
+        # action phrases are one or two words; take the best scoring prefix
+        best_used, best_actions = 0, []
+        for used in (2, 1):
+            if len(tokens) < used:
+                continue
+            candidates = self.actions.lookup(" ".join(tokens[:used]))
+            if candidates and (not best_actions or candidates[0].score > best_actions[0].score):
+                best_used, best_actions = used, candidates
+        parsed.actions = best_actions
+        parsed.player_text = " ".join(tokens[best_used:])
+        if parsed.player_text:
+            parsed.players = self.match_players(parsed.player_text)
+        return parsed
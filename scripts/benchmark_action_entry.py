@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import uvicorn
+from fastapi import FastAPI
+
+API_PORT = 8855  # the frontend talks to the API on this port
+
+
+async def seed(players: int, actions: int) -> str:
+    """Create a user, a team with players and one match with ``actions`` stored; return a token of the user."""
+    from backend.auth import create_access_token, hash_password
+    from backend.db import async_session_maker
+    from backend.models import Action, Match, Player, Team, User, init_db
+    from backend.schema import ActionType, SexType
+
+    await init_db()
+    async with async_session_maker() as session:
+        team = Team(name="Ganda 1")
+        team.players = [
+            Player(number=i + 1, first_name=f"Player{i + 1}", last_name="Test", sex=SexType.MALE if i % 2 else SexType.FEMALE)
+            for i in range(players)
+        ]
+        user = User(username="scorer", hashed_password=hash_password("Benchmark1!"))
+        session.add_all([team, user])
+        await session.flush()
+        match = Match(team_id=team.id, opponent_name="Opponent")
+        session.add(match)
+        await session.flush()
+        session.add_all([
+            Action(match_id=match.id, player_id=team.players[i % players].id, timestamp=i, period=1,
+                   action=ActionType.SHOT, result=False, user_id=user.id)
+            for i in range(actions)
+        ])
+        await session.commit()
+    return create_access_token("scorer")
+
+
+def api_app() -> FastAPI:
+    from backend.routers.action import router as actions_router
+    from backend.routers.match import router as matches_router
+
+    app = FastAPI()
+    for router in (actions_router, matches_router):
+        app.include_router(router, prefix="/api/v1")
+    return app
+
+
+def median_ms(timings) -> float:
+    return sorted(timings)[len(timings) // 2] * 1000
+
+
+async def run(entries: int, stored: int) -> None:
+    token = await seed(players=10, actions=stored)
+    server = uvicorn.Server(uvicorn.Config(api_app(), port=API_PORT, lifespan="off", log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        await enter_actions(entries, stored, token)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+async def enter_actions(entries: int, stored: int, token: str) -> None:
+    from types import SimpleNamespace
+
+    from backend.services.score_service import score_delta
+    from frontend.api import api_get
+    from frontend.outbox import PENDING, Outbox
+
+    def action(i: int) -> dict:
+        return {"match_id": 1, "player_id": 1 + i % 8, "timestamp": i, "period": 1,
+                "action": "shot", "result": i % 3 == 0, "x": 10.0, "y": 5.0}
+
+    outbox = Outbox({})
+    team_score = 0
+
+    # before: the handler sent the action and reloaded the score before the scorer saw the result
+    waited = []
+    for i in range(entries):
+        started = time.perf_counter()
+        outbox.enqueue_action(action(i))
+        await outbox.flush(token=token)
+        match = await api_get("/matches/1", token=token)
+        team_score = match["team_score"]
+        waited.append(time.perf_counter() - started)
+
+    # after: the score is the stored one plus what is still queued (LiveController.displayed_score),
+    # the send follows in the background
+    drawn, sent = [], []
+    for i in range(entries):
+        started = time.perf_counter()
+        entry = outbox.enqueue_action(action(entries + i))
+        shown = team_score + sum(
+            score_delta(SimpleNamespace(**e["payload"]))[0]
+            for e in outbox.actions_for_match(1) if e["status"] == PENDING
+        )
+        drawn.append(time.perf_counter() - started)
+        assert shown == team_score + ((entries + i) % 3 == 0)
+        await outbox.flush(token=token)
+        sent.append(time.perf_counter() - started)
+        assert entry["id"] not in {e["id"] for e in outbox.entries}
+        team_score = shown
+
+    print(f"{entries} actions entered on a match with {stored} stored actions")
+    print(f"before: {median_ms(waited):.2f} ms median, {max(waited) * 1000:.2f} ms max until the score is shown")
+    print(f"after:  {median_ms(drawn):.3f} ms median, {max(drawn) * 1000:.3f} ms max until the score is shown")
+    print(f"        the background send still takes {median_ms(sent):.2f} ms median")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the live page's action entry up to the moment the new score is shown.")
+    parser.add_argument("--entries", type=int, default=200, help="Actions entered per variant (default: 200)")
+    parser.add_argument("--stored", type=int, default=400, help="Actions already stored for the match (default: 400)")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # the database is created in the working directory
+        asyncio.run(run(args.entries, args.stored))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+API_PORT = 8855  # the frontend talks to the API on this port
+
+
+async def seed(players: int) -> str:
+    """Create a user, a team with players and one match; return a token of the user."""
+    from backend.auth import create_access_token, hash_password
+    from backend.db import async_session_maker
+    from backend.models import Match, Player, Team, User, init_db
+    from backend.schema import SexType
+
+    await init_db()
+    async with async_session_maker() as session:
+        team = Team(name="Ganda 1")
+        team.players = [
+            Player(number=i + 1, first_name=f"Player{i + 1}", last_name="Test", sex=SexType.MALE if i % 2 else SexType.FEMALE)
+            for i in range(players)
+        ]
+        session.add_all([team, User(username="scorer", hashed_password=hash_password("Benchmark1!"))])
+        await session.flush()
+        session.add(Match(team_id=team.id, opponent_name="Opponent"))
+        await session.commit()
+    return create_access_token("scorer")
+
+
+def api_app() -> FastAPI:
+    from backend.routers.action import router as actions_router
+    from backend.routers.match import router as matches_router
+    from backend.routers.spectate import router as spectate_router
+
+    app = FastAPI()
+    for router in (actions_router, matches_router, spectate_router):
+        app.include_router(router, prefix="/api/v1")
+    return app
+
+
+async def run(spectators: int, events: int) -> None:
+    from nicegui.testing.user_simulation import user_simulation
+
+    token = await seed(players=10)
+    async with user_simulation(main_file=PROJECT_ROOT / "app.py") as first:
+        server = uvicorn.Server(uvicorn.Config(api_app(), port=API_PORT, lifespan="off", log_level="warning"))
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+
+        try:
+            # a task of its own keeps the page contexts of the simulated users out of the teardown
+            await asyncio.create_task(watch_match(first, spectators, events, token))
+        finally:
+            server.should_exit = True
+            await serving
+
+
+async def watch_match(first, spectators: int, events: int, token: str) -> None:
+    from nicegui import core
+    from nicegui.testing.user import User
+    from backend.services import active_players_events, clock_events
+    from frontend import api, spectators as feeds
+    from frontend.pages.spectate import SpectatorBoard
+
+    snapshot_calls = 0
+    get_public = api.api_get_public
+
+    async def counting_get_public(path):
+        nonlocal snapshot_calls
+        snapshot_calls += 1
+        return await get_public(path)
+    feeds.api_get_public = counting_get_public
+
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(core.app), base_url="http://test")
+    users = [first] + [User(http) for _ in range(spectators - 1)]
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    for user in users:
+        await user.open("/spectate/1")
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{spectators} spectators opened in {elapsed:.1f} s ({elapsed / spectators * 1000:.1f} ms per page)")
+    print(f"server memory: {memory / 1024 / spectators:.1f} KiB per spectator")
+    print(f"snapshot requests from the frontend: {snapshot_calls}")
+    print(f"feeds: {feeds.stats()}")
+
+    async with httpx.AsyncClient(base_url=f"http://localhost:{API_PORT}/api/v1",
+                                 headers={"Authorization": f"Bearer {token}"}) as scorer:
+        await scorer.post("/matches/1/lock")
+        active_players_events.notify(1, {"player_ids": [1, 2, 3, 4, 5, 6, 7, 8]})
+        timings = []
+        for i in range(events):
+            clock_events.notify(1, {"clock_running": True, "remaining_seconds": 1500 - i, "period": 1})
+            started = time.perf_counter()
+            response = await scorer.post("/actions", json={
+                "match_id": 1, "player_id": 1 + i % 8, "timestamp": i, "period": 1,
+                "action": "shot", "result": i % 3 == 0, "x": 10.0, "y": 5.0,
+            })
+            response.raise_for_status()
+            timings.append(time.perf_counter() - started)
+    await asyncio.sleep(0.1)
+
+    goals = (events + 2) // 3
+    boards = [user.find(kind=SpectatorBoard).elements.pop() for user in users]
+    up_to_date = sum(1 for board in boards if board.score.text.endswith(f" {goals} - 0 Opponent"))
+    timings.sort()
+    print(
+        f"{events} actions posted: median {timings[len(timings) // 2] * 1000:.1f} ms, "
+        f"max {timings[-1] * 1000:.1f} ms per request (the fan-out follows the response)"
+    )
+    print(f"spectators showing the final score: {up_to_date}/{spectators}")
+    print(f"snapshot requests from the frontend after the events: {snapshot_calls}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Open many spectator pages on one match and push actions to them.")
+    parser.add_argument("--spectators", type=int, default=500, help="Simulated spectators (default: 500)")
+    parser.add_argument("--events", type=int, default=20, help="Actions posted while they watch (default: 20)")
+    args = parser.parse_args()
+
+    # NiceGUI's user simulation is made for pytest and checks this variable when it resets its globals
+    os.environ.setdefault("PYTEST_CURRENT_TEST", "benchmark_spectators")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # the database and NiceGUI storage are created in the working directory
+        asyncio.run(run(args.spectators, args.events))
+
+
+if __name__ == "__main__":
+    main()
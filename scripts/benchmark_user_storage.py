@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from nicegui.persistence import FilePersistentDict
+
+from frontend.storage import DebouncedWriter, SqlitePersistentDict
+
+LIVE_STATE_KEY = "live_state"
+
+
+class WriteCounter:
+    """Counts the storage files NiceGUI writes by wrapping ``Path.write_text``."""
+
+    def __init__(self):
+        self.writes = 0
+        self._write_text = Path.write_text
+
+    def __enter__(self):
+        counter = self
+
+        def write_text(path, *args, **kwargs):
+            counter.writes += 1
+            return counter._write_text(path, *args, **kwargs)
+
+        Path.write_text = write_text
+        return self
+
+    def __exit__(self, *exc):
+        Path.write_text = self._write_text
+
+
+def random_live_state(rng: random.Random, state: dict) -> dict:
+    """One scorer interaction: toggle a player, pick an action, or change the period."""
+    state = dict(state)
+    roll = rng.random()
+    if roll < 0.5:
+        active = set(state["active_player_ids"])
+        active ^= {rng.randint(1, 12)}
+        state["active_player_ids"] = sorted(active)
+    elif roll < 0.95:
+        state["current_action"] = rng.choice([None, "shot", "korte_kans", "rebound", "steal"])
+    else:
+        state["period"] = state["period"] % 2 + 1
+    return state
+
+
+async def simulate_user(storage, rng: random.Random, seconds: float, clicks_per_second: float, debounce: float | None):
+    state = {
+        "selected_team_id": 1, "selected_match_id": 1, "active_player_ids": [],
+        "current_action": None, "period": 1, "period_minutes": 25, "total_periods": 2,
+    }
+    if debounce is None:
+        persist = lambda: storage.__setitem__(LIVE_STATE_KEY, state)
+    else:
+        writer = DebouncedWriter(storage, LIVE_STATE_KEY, lambda: state, delay=debounce)
+        persist = writer.schedule
+
+    clicks = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        await asyncio.sleep(rng.expovariate(clicks_per_second))
+        state = random_live_state(rng, state)
+        persist()
+        clicks += 1
+    if debounce is not None:
+        writer.flush()
+    return clicks
+
+
+async def run(backend: str, users: int, seconds: float, clicks_per_second: float, debounce: float | None, seed: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        if backend == "file":
+            storages = [FilePersistentDict(Path(tmp) / f"storage-user-{i}.json", encoding="utf-8") for i in range(users)]
+        else:
+            storages = [SqlitePersistentDict(Path(tmp) / "storage.db", f"user-{i}") for i in range(users)]
+        for storage in storages:
+            await storage.initialize()
+
+        with WriteCounter() as counter:
+            started = time.perf_counter()
+            clicks = await asyncio.gather(*[
+                simulate_user(storage, random.Random(seed + i), seconds, clicks_per_second, debounce)
+                for i, storage in enumerate(storages)
+            ])
+            for storage in storages:
+                await storage.close()
+            await asyncio.sleep(0.1)  # let pending file writes finish
+            elapsed = time.perf_counter() - started
+
+        writes = counter.writes if backend == "file" else storages[0].store.writes
+        files = len(list(Path(tmp).iterdir()))
+    return {"clicks": sum(clicks), "writes": writes, "elapsed": elapsed, "files": files}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare live-state write rates of the user storage backends.")
+    parser.add_argument("--users", type=int, default=30, help="Concurrent scorers (default: 30)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Simulated session length (default: 10)")
+    parser.add_argument("--clicks", type=float, default=3.0, help="Interactions per user per second (default: 3)")
+    parser.add_argument("--debounce", type=float, default=2.0, help="Live state debounce in seconds (default: 2)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("file, write per click", "file", None),
+        ("file, debounced", "file", args.debounce),
+        ("sqlite, debounced", "sqlite", args.debounce),
+    ]
+    print(f"{args.users} users, {args.clicks:g} clicks/s each, {args.seconds:g} s")
+    for label, backend, debounce in scenarios:
+        r = asyncio.run(run(backend, args.users, args.seconds, args.clicks, debounce, args.seed))
+        print(
+            f"{label:24s} {r['clicks']:6d} clicks  {r['writes']:6d} writes  "
+            f"{r['writes'] / r['elapsed']:8.1f} writes/s  {r['files']:4d} files"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.db import async_session_maker
+from backend.services.score_service import recompute_match_scores
+
+
+async def repair_scores(match_ids: list[int] | None) -> dict[int, tuple[int, int]]:
+    async with async_session_maker() as session:
+        totals = await recompute_match_scores(session, match_ids)
+        await session.commit()
+        return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute the denormalized match scores from the action table.")
+    parser.add_argument("match_ids", nargs="*", type=int, help="Match ids to repair (default: all matches)")
+    args = parser.parse_args()
+
+    totals = asyncio.run(repair_scores(args.match_ids or None))
+    for match_id, (team_score, opponent_score) in sorted(totals.items()):
+        print(f"match {match_id}: {team_score} - {opponent_score}")
+    print(f"Repaired {len(totals)} matches.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.models import Action, Base, Match, Team, User
+from backend.routers import journal
+from backend.schema import ActionType
+from backend.services import action_journal
+from backend.services.action_journal import _columns, row_state, replay
+from backend.services.score_service import apply_action_score
+
+
+def _entry(action_id, after):
+    return SimpleNamespace(action_id=action_id, after=after)
+
+
+def test_row_state_is_json_ready():
+    row = {column: None for column in (
+        "id", "match_id", "player_id", "is_opponent", "user_id", "client_id",
+        "timestamp", "x", "y", "period", "action", "result", "version")}
+    row.update(id=1, action=ActionType.SHOT, version=2)
+    state = row_state(row)
+    assert state["action"] == "shot"
+    assert _columns(state)["action"] is ActionType.SHOT
+
+
+def test_replay_applies_entries_on_top_of_a_snapshot():
+    snapshot = {1: {"id": 1, "timestamp": 10}, 2: {"id": 2, "timestamp": 20}}
+    entries = [
+        _entry(3, {"id": 3, "timestamp": 30}),  # created
+        _entry(1, {"id": 1, "timestamp": 11}),  # edited
+        _entry(2, None),                        # deleted
+        _entry(2, {"id": 2, "timestamp": 20}),  # delete undone
+    ]
+    assert replay(snapshot, entries) == {
+        1: {"id": 1, "timestamp": 11},
+        2: {"id": 2, "timestamp": 20},
+        3: {"id": 3, "timestamp": 30},
+    }
+
+
+def _run_in_db(tmp_path, scenario):
+    """Run ``scenario(session, user, match)`` against a fresh database."""
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'journal.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                team, user = Team(name="T"), User(username="scorer", hashed_password="x")
+                session.add_all([team, user])
+                await session.flush()
+                match = Match(team_id=team.id, opponent_name="O")
+                session.add(match)
+                await session.commit()
+                return await scenario(session, user, match)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+async def _create(session, user, match, timestamp):
+    action = Action(match_id=match.id, timestamp=timestamp, period=1, action=ActionType.SHOT, result=True)
+    session.add(action)
+    await apply_action_score(session, action)
+    await session.flush()
+    await action_journal.record(session, "create", match.id, action.id, user, None, row_state(action))
+    await session.commit()
+    return action
+
+
+async def _edit(session, user, action, timestamp):
+    before = row_state(action)
+    action.timestamp = timestamp
+    await session.flush()
+    await action_journal.record(session, "update", action.match_id, action.id, user, before, row_state(action))
+    await session.commit()
+
+
+async def _step(session, user, match, step):
+    """The timestamp the step left the action at (None when deleted) and the event type."""
+    entry, action, event_type = await step(session, match.id, user)
+    await session.commit()
+    return (action.timestamp if event_type != "deleted" else None), event_type
+
+
+def test_undo_and_redo_of_an_edit(tmp_path):
+    async def scenario(session, user, match):
+        action = await _create(session, user, match, 10)
+        await _edit(session, user, action, 20)
+        return [await _step(session, user, match, step)
+                for step in (action_journal.undo, action_journal.redo, action_journal.undo)]
+
+    assert _run_in_db(tmp_path, scenario) == [(10, "updated"), (20, "updated"), (10, "updated")]
+
+
+def test_undo_twice_then_redo_twice(tmp_path):
+    async def scenario(session, user, match):
+        action = await _create(session, user, match, 10)
+        await _edit(session, user, action, 20)
+        steps = [await _step(session, user, match, step) for step in (
+            action_journal.undo, action_journal.undo, action_journal.redo, action_journal.redo)]
+        await session.refresh(match)
+        return steps, match.team_score
+
+    assert _run_in_db(tmp_path, scenario) == (
+        [(10, "updated"), (None, "deleted"), (10, "created"), (20, "updated")], 1)
+
+
+def test_undo_refuses_to_overwrite_another_users_edit(tmp_path):
+    async def scenario(session, user, match):
+        action = await _create(session, user, match, 10)
+        other = User(username="other", hashed_password="x")
+        session.add(other)
+        await session.flush()
+        await _edit(session, other, action, 30)
+        with pytest.raises(HTTPException) as exc:
+            await action_journal.undo(session, match.id, user)
+        return exc.value.status_code
+
+    assert _run_in_db(tmp_path, scenario) == 409
+
+
+def test_rebuild_restores_the_rows_and_publishes_what_changed(tmp_path, monkeypatch):
+    published = []
+    monkeypatch.setattr(journal, "notify", lambda match_id, payload: published.append(payload))
+
+    async def scenario(session, user, match):
+        kept = await _create(session, user, match, 10)
+        lost = await _create(session, user, match, 20)
+        drifted = await _create(session, user, match, 30)
+        # the projection drifted from the journal
+        await session.execute(delete(Action).where(Action.id == lost.id))
+        await session.execute(update(Action).where(Action.id == drifted.id).values(timestamp=99))
+        await session.execute(insert(Action).values(match_id=match.id, timestamp=40, period=1, action=ActionType.SHOT))
+        await session.commit()
+
+        result = await journal.rebuild_actions(match.id, session, user)
+        rows = (await session.execute(select(Action.id, Action.timestamp).order_by(Action.id))).all()
+        await session.refresh(match)
+
+        match.is_finalized = True
+        await session.commit()
+        with pytest.raises(HTTPException) as exc:
+            await journal.rebuild_actions(match.id, session, user)
+        return result, [tuple(row) for row in rows], match.team_score, exc.value.status_code, (kept.id, lost.id, drifted.id)
+
+    result, rows, team_score, finalized_status, (kept, lost, drifted) = _run_in_db(tmp_path, scenario)
+    assert result["actions"] == 3 and rows == [(kept, 10), (lost, 20), (drifted, 30)]
+    assert team_score == 3 and finalized_status == 400
+    events = sorted((p["type"], p["action"]["id"], p["action"]["timestamp"]) for p in published)
+    assert events == [("created", lost, 20), ("deleted", drifted + 1, 40), ("updated", drifted, 30)]
+    assert published[-1]["score"] == {"team_score": 3, "opponent_score": 0}
@@ -0,0 +1,35 @@
+from frontend.components.actions_table import OrderedRows
+
+
+def newest_first(row):
+    return (-row["t"], -row["id"])
+
+
+def test_ordered_rows_insert_keeps_order():
+    rows = OrderedRows(newest_first)
+    rows.reset([{"id": 1, "t": 10}, {"id": 2, "t": 30}])
+    assert rows.insert({"id": 3, "t": 20}) == 1
+    assert [r["id"] for r in rows.rows] == [2, 3, 1]
+
+
+def test_ordered_rows_upsert_replaces_in_place_or_moves():
+    rows = OrderedRows(newest_first)
+    rows.reset([{"id": 1, "t": 10}, {"id": 2, "t": 20}, {"id": 3, "t": 30}])
+
+    assert rows.upsert({"id": 2, "t": 20, "label": "edited"}) == [("replace", 1)]
+    assert rows.rows[1]["label"] == "edited"
+
+    # a changed timestamp moves the row
+    assert rows.upsert({"id": 1, "t": 40}) == [("remove", 2), ("insert", 0)]
+    assert [r["id"] for r in rows.rows] == [1, 3, 2]
+
+    assert rows.upsert({"id": 4, "t": 0}) == [("insert", 3)]
+
+
+def test_ordered_rows_remove():
+    rows = OrderedRows(newest_first)
+    rows.reset([{"id": 1, "t": 10}, {"id": 2, "t": 10}, {"id": 3, "t": 10}])
+    assert rows.remove(2) == 1
+    assert rows.remove(2) is None
+    assert 2 not in rows
+    assert [r["id"] for r in rows.rows] == [3, 1]
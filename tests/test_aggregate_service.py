@@ -0,0 +1,32 @@
+from backend.schema import MatchType
+from backend.services.aggregate_service import _counts_query, combine
+from backend.services.match_service import matches_query
+
+
+def test_totals_per_action_and_player_from_grouped_counts():
+    totals = combine([
+        (7, "shot", False, 2, 5),
+        (7, "rebound", False, 3, 4),
+        (8, "shot", False, 1, 1),
+        (None, "kk", False, 1, 2),
+        (None, "opponent_goal", True, 0, 6),
+    ])
+    assert (totals["goals"], totals["attempts"], totals["efficiency"]) == (4, 8, 50.0)
+    assert totals["opponent_goals"] == 6
+    assert [a["action"] for a in totals["actions"]] == ["kk", "rebound", "shot"]
+    player = totals["players"][0]
+    assert player["player_id"] == 7 and (player["goals"], player["attempts"]) == (2, 5)
+    assert {a["action"]: a["efficiency"] for a in player["actions"]} == {"rebound": 75.0, "shot": 40.0}
+
+
+def test_no_attempts_gives_no_efficiency():
+    totals = combine([])
+    assert totals["efficiency"] is None and totals["players"] == [] and totals["actions"] == []
+
+
+def test_counts_are_one_grouped_query_over_the_filtered_matches():
+    query = matches_query(1, match_type=MatchType.BEACH, opponent="50%", match_ids=[3, 4])
+    sql = str(_counts_query(query).compile(compile_kwargs={"literal_binds": True}))
+    assert sql.count("SELECT") == 2 and "GROUP BY" in sql
+    assert "match.team_id = 1" in sql and "'BEACH'" in sql
+    assert "50/%" in sql  # the wildcard in a name filter is escaped
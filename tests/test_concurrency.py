@@ -0,0 +1,73 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.models import Base, Match, Team, User
+from backend.routers.match import finalize_match, unlock_match
+from backend.schema import ActionCreate, MatchUpdate
+from backend.services.action_service import create_action
+from backend.services.concurrency import is_outdated, version_conflict
+
+
+def test_edits_without_a_version_are_not_checked():
+    assert not is_outdated(None, 7)
+
+
+def test_edit_of_an_older_version_is_outdated():
+    assert is_outdated(1, 2)
+    assert not is_outdated(2, 2)
+    assert not is_outdated(1, None)  # rows from before the version column start at 1
+
+
+def test_conflict_carries_the_current_row():
+    exc = version_conflict({"id": 3, "version": 4})
+    assert exc.status_code == 409
+    assert exc.detail["current"] == {"id": 3, "version": 4}
+
+
+def test_schemas_take_the_edited_version():
+    action = ActionCreate(match_id=1, timestamp=0, period=1, action="shot", version=2)
+    assert action.version == 2
+    assert MatchUpdate(team_id=1, opponent_name="O").version is None
+
+
+def _run_in_db(tmp_path, scenario):
+    """Run ``scenario(session, owner, other, match)`` on a shared scoring match locked by ``owner``."""
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'locks.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                team = Team(name="T")
+                owner, other = User(username="owner", hashed_password="x"), User(username="other", hashed_password="x")
+                session.add_all([team, owner, other])
+                await session.flush()
+                match = Match(team_id=team.id, opponent_name="O", shared_scoring=True,
+                              locked_by_user_id=owner.id, locked_at=datetime.now(timezone.utc))
+                session.add(match)
+                await session.commit()
+                return await scenario(session, owner, other, match)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+def test_shared_scoring_lets_others_write_actions_but_not_finalize_or_unlock(tmp_path):
+    async def scenario(session, owner, other, match):
+        action = ActionCreate(match_id=match.id, timestamp=5, period=1, action="shot", result=True)
+        stored, replayed = await create_action(session, action, other)
+        assert not replayed and stored.user_id == other.id
+
+        for endpoint in (finalize_match, unlock_match):
+            with pytest.raises(HTTPException) as exc:
+                await endpoint(match.id, session, other)
+            assert exc.value.status_code == 409
+        await session.refresh(match)
+        return match
+
+    match = _run_in_db(tmp_path, scenario)
+    assert not match.is_finalized and match.locked_by_user_id is not None
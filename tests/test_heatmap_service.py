@@ -0,0 +1,34 @@
+import numpy as np
+
+from backend.field import FIELD_LENGTH, FIELD_WIDTH
+from backend.services import heatmap_service
+from backend.services.heatmap_service import BINS_X, BINS_Y, MatchShots, bin_shots
+
+
+def test_made_and_missed_shots_are_binned_separately():
+    x = np.array([0.5, 0.5, FIELD_LENGTH - 0.5])
+    y = np.array([0.5, 0.5, FIELD_WIDTH - 0.5])
+    made, missed = bin_shots(x, y, np.array([True, False, True]))
+    assert made.shape == missed.shape == (BINS_Y, BINS_X)
+    assert made[0, 0] == 1 and missed[0, 0] == 1
+    assert made[BINS_Y - 1, BINS_X - 1] == 1
+    assert made.sum() == 2 and missed.sum() == 1
+
+
+def test_rows_follow_the_y_axis_and_clicks_outside_the_field_land_on_the_edge():
+    made, _ = bin_shots(np.array([0.5, -50.0]), np.array([FIELD_WIDTH - 0.5, FIELD_WIDTH + 50]), np.array([True, True]))
+    assert made[BINS_Y - 1, 0] == 2
+
+
+def test_player_grids_are_a_subset_of_the_match_grid():
+    shots = MatchShots.from_rows([(1, 5.0, 5.0, True), (2, 5.0, 5.0, False), (None, 20.0, 10.0, True)])
+    made, missed = shots.grids()
+    player_made, player_missed = shots.grids(1)
+    assert made.sum() == 2 and missed.sum() == 1
+    assert player_made.sum() == 1 and player_missed.sum() == 0
+
+
+def test_an_action_change_drops_the_cached_match():
+    heatmap_service._matches.put(906, MatchShots.from_rows([]))
+    heatmap_service._on_action(906, {"type": "deleted"})
+    assert 906 not in heatmap_service._matches
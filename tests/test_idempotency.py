@@ -0,0 +1,95 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.models import Action, Base, Match, Team, User
+from backend.routers.action import edit_action, remove_action
+from backend.schema import ActionCreate
+from backend.services.action_service import create_action
+from backend.services.idempotency import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_discard():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.discard("a")
+    cache.discard("missing")
+    assert cache.get("a") is None
+
+
+def _run_in_db(tmp_path, scenario):
+    """Run ``scenario(session, user, match)`` against a fresh database."""
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'idempotency.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                team, user = Team(name="T"), User(username="scorer", hashed_password="x")
+                session.add_all([team, user])
+                await session.flush()
+                match = Match(team_id=team.id, opponent_name="O")
+                session.add(match)
+                await session.commit()
+                return await scenario(session, user, match)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+def _shot(match, client_id, **fields):
+    return ActionCreate(**{"match_id": match.id, "timestamp": 5, "period": 1, "action": "shot",
+                           "result": False, "client_id": client_id, **fields})
+
+
+def test_a_replay_after_an_edit_returns_the_edited_row(tmp_path):
+    async def scenario(session, user, match):
+        client_id = str(uuid.uuid4())
+        stored, _ = await create_action(session, _shot(match, client_id), user)
+        await edit_action(stored.id, _shot(match, client_id, result=True, version=1), session, user)
+        return await create_action(session, _shot(match, client_id), user)
+
+    replay, replayed = _run_in_db(tmp_path, scenario)
+    assert replayed and replay.result is True and replay.version == 2
+
+
+def test_a_replay_is_checked_like_a_create(tmp_path):
+    async def scenario(session, user, match):
+        client_id = str(uuid.uuid4())
+        await create_action(session, _shot(match, client_id), user)
+        match.is_finalized = True
+        await session.commit()
+        with pytest.raises(HTTPException) as exc:
+            await create_action(session, _shot(match, client_id), user)
+        return exc.value.status_code
+
+    assert _run_in_db(tmp_path, scenario) == 400
+
+
+def test_a_late_retry_does_not_bring_back_a_deleted_action(tmp_path):
+    async def scenario(session, user, match):
+        client_id = str(uuid.uuid4())
+        stored, _ = await create_action(session, _shot(match, client_id), user)
+        await remove_action(stored.id, None, session, user)
+        with pytest.raises(HTTPException) as exc:
+            await create_action(session, _shot(match, client_id), user)
+        remaining = (await session.execute(select(func.count(Action.id)))).scalar_one()
+        return exc.value.status_code, remaining
+
+    assert _run_in_db(tmp_path, scenario) == (410, 0)
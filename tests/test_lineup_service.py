@@ -0,0 +1,59 @@
+import random
+
+from backend.services.lineup_service import (
+    GOAL_AGAINST, GOAL_FOR, MISS, attribute, merge_lineups, on_field_intervals,
+)
+
+
+def test_events_are_attributed_to_the_lineup_on_the_field():
+    changes = [(1, 0, (1, 2, 3)), (1, 100, (1, 2, 4))]
+    events = [(1, 10, GOAL_FOR), (1, 20, MISS), (1, 100, GOAL_AGAINST), (1, 150, GOAL_FOR)]
+    intervals, unattributed = on_field_intervals(changes, events, end=200)
+    # seconds, goals for, goals against, attempts
+    assert intervals == [[(1, 2, 3), [100, 1, 0, 2]], [(1, 2, 4), [100, 1, 1, 1]]]
+    assert unattributed == [0, 0]
+
+    players, combos = attribute(intervals, size=2)
+    assert players[1] == [200, 2, 1, 3] and players[3] == [100, 1, 0, 2] and players[4] == [100, 1, 1, 1]
+    assert combos[(1, 2)] == [200, 2, 1, 3]
+    assert combos[(2, 4)] == [100, 1, 1, 1]
+
+
+def test_a_lineup_that_returns_is_merged_before_its_combinations_are_expanded():
+    intervals = [[(1, 2), [60, 1, 0, 1]], [(1, 3), [30, 0, 1, 0]], [(1, 2), [40, 2, 0, 3]]]
+    assert dict(merge_lineups(intervals)) == {(1, 2): [100, 3, 0, 4], (1, 3): [30, 0, 1, 0]}
+
+
+def test_goals_before_the_first_lineup_are_unattributed():
+    intervals, unattributed = on_field_intervals([(1, 50, (1,))], [(1, 5, GOAL_FOR), (1, 6, GOAL_AGAINST)], end=60)
+    assert unattributed == [1, 1] and intervals[0][1] == [10, 0, 0, 0]
+
+
+def test_the_sweep_matches_a_pairwise_scan():
+    rng = random.Random(5)
+    changes = sorted({(1, rng.randrange(0, 3000)) for _ in range(40)})
+    changes = [(p, t, tuple(sorted(rng.sample(range(1, 13), 8)))) for p, t in changes]
+    events = [(1, rng.randrange(0, 3000), rng.choice([GOAL_FOR, GOAL_AGAINST, MISS])) for _ in range(300)]
+    intervals, _ = on_field_intervals(changes, events, end=3000)
+    players, combos = attribute(intervals, size=4)
+
+    starts = [t for _, t, _ in changes]
+    for player in range(1, 13):
+        plus_minus = 0
+        for _, t, kind in events:
+            on = [c for c, start in zip(changes, starts) if start <= t]
+            if on and player in on[-1][2] and kind != MISS:
+                plus_minus += 1 if kind == GOAL_FOR else -1
+        stats = players.get(player, [0, 0, 0, 0])
+        assert stats[1] - stats[2] == plus_minus
+
+
+def test_partial_and_instant_lineups_add_no_combinations():
+    # the start set up switch by switch at second 0, then a substitution as out and in
+    changes = [(1, 0, tuple(range(1, n + 1))) for n in range(1, 9)]
+    changes += [(1, 300, (2, 3, 4, 5, 6, 7, 8)), (1, 302, (2, 3, 4, 5, 6, 7, 8, 9))]
+    intervals, _ = on_field_intervals(changes, [(1, 10, GOAL_FOR)], end=600)
+    players, combos = attribute(merge_lineups(intervals).items(), size=4)
+    assert {len(combo) for combo in combos} == {4}
+    assert players[1] == [300, 1, 0, 1] and players[9] == [298, 0, 0, 0]
+    assert combos[(1, 2, 3, 4)] == [300, 1, 0, 1]
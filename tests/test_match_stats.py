@@ -0,0 +1,56 @@
+import random
+
+from backend.schema import ActionType
+from frontend.match_stats import MatchStats
+
+
+def _action(action_id, player_id, action_type, result):
+    return {"id": action_id, "player_id": player_id, "action": action_type, "result": result, "x": None}
+
+
+def test_counts_per_player_type_and_shots():
+    stats = MatchStats([
+        _action(1, 7, "shot", True),
+        _action(2, 7, "shot", False),
+        _action(3, 7, "rebound", True),
+        _action(4, None, "opponent_goal", True),
+    ])
+    assert stats.players[7]["shot"] == [1, 2]
+    assert stats.player_shots[7] == [1, 2]
+    assert stats.totals["rebound"] == [1, 1] and stats.totals["opponent_goal"] == [1, 1]
+    assert stats.shots == [1, 2]
+
+
+def test_events_keep_the_counters_equal_to_a_recount():
+    rng = random.Random(9)
+    types = [a.value for a in ActionType]
+    actions = {}
+    stats = MatchStats()
+    for step in range(500):
+        if actions and rng.random() < 0.3:
+            action_id = rng.choice(list(actions))
+            if rng.random() < 0.5:
+                event = {"type": "deleted", "action": actions.pop(action_id)}
+            else:
+                actions[action_id] = _action(action_id, rng.randint(1, 4), rng.choice(types), rng.random() < 0.5)
+                event = {"type": "updated", "action": actions[action_id]}
+        else:
+            action_id = step + 1
+            actions[action_id] = _action(action_id, rng.randint(1, 4), rng.choice(types), rng.random() < 0.5)
+            event = {"type": "created", "action": actions[action_id]}
+        stats.apply(event)
+
+    recount = MatchStats(actions.values())
+    assert stats.totals == recount.totals and stats.shots == recount.shots
+    for player_id, counts in recount.players.items():
+        assert stats.players[player_id] == counts
+        assert stats.player_shots[player_id] == recount.player_shots[player_id]
+    assert len(stats) == len(actions)
+
+
+def test_repeated_and_irrelevant_events_change_nothing():
+    stats = MatchStats([_action(1, 7, "shot", True)])
+    assert not stats.apply({"type": "created", "action": _action(1, 7, "shot", True)})
+    assert not stats.apply({"type": "updated", "action": {**_action(1, 7, "shot", True), "x": 3.0}})
+    assert not stats.apply({"type": "deleted", "action": _action(2, 7, "shot", True)})
+    assert stats.shots == [1, 1]
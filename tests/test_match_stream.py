@@ -0,0 +1,68 @@
+import asyncio
+
+from backend.services import clock_events, match_stream
+from backend.services.match_stream import MatchStream
+
+
+def event_names(messages):
+    return [line.split(": ", 1)[1] for text in messages for line in text.splitlines() if line.startswith("event: ")]
+
+
+def test_resume_from_last_event_id():
+    stream = MatchStream(1)
+    for i in range(5):
+        stream.publish("action", {"n": i})
+    last_event_id = f"{match_stream._BOOT}-3"
+
+    cursor = stream.resume_cursor(last_event_id)
+    messages = stream.after(cursor)
+
+    assert cursor == 3
+    assert [text.split("\n", 1)[0] for text in messages] == [f"id: {match_stream._BOOT}-4", f"id: {match_stream._BOOT}-5"]
+    assert stream.resume_cursor(None) == 5
+    assert stream.resume_cursor("other-boot-3") is None
+    assert stream.resume_cursor(f"{match_stream._BOOT}-9") is None
+
+
+def test_dropped_events_cannot_be_replayed(monkeypatch):
+    monkeypatch.setattr(match_stream, "EVENT_BUFFER", 3)
+    stream = MatchStream(1)
+    for i in range(5):
+        stream.publish("action", {"n": i})
+
+    assert stream.after(1) is None
+    assert len(stream.after(2)) == 3
+
+
+def test_clock_events_become_clock_and_lock_events():
+    stream = match_stream.open_stream(902)
+    try:
+        clock_events.notify(902, {"clock_running": True, "remaining_seconds": 1200, "locked_by_user_id": 4})
+        clock_events.notify(902, {"clock_running": True, "remaining_seconds": 1195, "locked_by_user_id": 4})
+        clock_events.notify(902, {"locked_by_user_id": None})
+        assert event_names(stream.after(0)) == ["clock", "lock", "clock", "lock"]
+    finally:
+        match_stream.close_stream(stream)
+        match_stream._streams.pop(902)
+
+
+def test_stream_sends_missed_events_then_heartbeats(monkeypatch):
+    monkeypatch.setattr(match_stream, "HEARTBEAT_SECONDS", 0.01)
+
+    async def scenario():
+        stream = match_stream.open_stream(903)
+        stream.publish("lineup", {"player_ids": [1]})
+        stream.publish("lineup", {"player_ids": [1, 2]})
+        messages = match_stream.event_messages(stream, f"{match_stream._BOOT}-1")
+        received = [await messages.__anext__() for _ in range(3)]
+        await messages.aclose()
+        return stream, received
+
+    try:
+        stream, received = asyncio.run(scenario())
+    finally:
+        match_stream._streams.pop(903)
+    assert received[0].startswith("retry:")
+    assert event_names(received[1:2]) == ["lineup"]
+    assert received[2] == match_stream.HEARTBEAT
+    assert stream.listeners == 0
@@ -0,0 +1,105 @@
+import asyncio
+
+from frontend import match_view
+from backend.services import action_events
+
+
+class FakeClient:
+    def __init__(self, id):
+        self.id = id
+
+    def safe_invoke(self, func):
+        func()
+
+
+def test_match_view_loads_once_and_is_evicted_with_last_subscriber():
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0)
+        return [{"id": 1, "first_name": "Jan"}], [{"id": 10, "action": "shot"}]
+
+    async def scenario():
+        a, b = FakeClient("a"), FakeClient("b")
+        views = await asyncio.gather(
+            match_view.acquire(7, a, lambda kind, payload: None, loader),
+            match_view.acquire(7, b, lambda kind, payload: None, loader),
+        )
+        assert views[0] is views[1]
+        assert match_view.stats() == {"matches": 1, "subscribers": 2, "actions": 1}
+        match_view.release(7, a)
+        assert match_view.get(7) is views[0]
+        match_view.release(7, b)
+        assert match_view.get(7) is None
+
+    asyncio.run(scenario())
+    assert len(loads) == 1
+
+
+def test_match_view_applies_event_once_and_fans_out():
+    seen = []
+
+    async def loader():
+        return [], [{"id": 10, "action": "shot"}]
+
+    async def scenario():
+        clients = [FakeClient(str(i)) for i in range(3)]
+        for client in clients:
+            view = await match_view.acquire(8, client, lambda kind, payload, c=client.id: seen.append((c, kind)), loader)
+        action_events.notify(8, {
+            "type": "created",
+            "action": {"id": 11, "action": "rebound"},
+            "score": {"team_score": 0, "opponent_score": 0},
+        })
+        action_events.notify(8, {"type": "deleted", "action": {"id": 10}})
+        assert sorted(view.actions) == [11]
+        assert view.score == {"team_score": 0, "opponent_score": 0}
+        for client in clients:
+            match_view.release(8, client)
+
+    asyncio.run(scenario())
+    assert len(seen) == 6
+    assert {kind for _, kind in seen} == {match_view.ACTION}
+
+
+def test_match_view_shares_score_lineup_and_clock(monkeypatch):
+    from backend.services import active_players_events, clock_events
+
+    async def loader():
+        return [], [
+            {"id": 1, "action": "shot", "result": True, "is_opponent": False},
+            {"id": 2, "action": "rebound", "result": True, "is_opponent": False},
+            {"id": 3, "action": "opponent_goal", "result": True, "is_opponent": True},
+        ]
+
+    async def scenario():
+        client = FakeClient("a")
+        view = await match_view.acquire(9, client, lambda kind, payload: None, loader)
+        active_players_events.notify(9, {"player_ids": [4, 2]})
+        clock_events.notify(9, {"clock_running": False, "clock_seconds": 90, "remaining_seconds": 1410})
+        try:
+            return view.score, view.active_player_ids, view.clock["clock_seconds"]
+        finally:
+            match_view.release(9, client)
+            active_players_events._last.pop(9)
+            clock_events._last.pop(9)
+            clock_events._at.pop(9)
+
+    assert asyncio.run(scenario()) == ({"team_score": 1, "opponent_score": 1}, [4, 2], 90)
+
+
+def test_a_failing_listener_does_not_fail_the_publisher(monkeypatch):
+    seen = []
+
+    def broken(match_id, payload):
+        raise RuntimeError("listener bug")
+
+    monkeypatch.setattr(action_events, "_listeners", [broken, lambda match_id, payload: seen.append(match_id)])
+    client = FakeClient("a")
+    action_events.subscribe(9, client, seen.append)
+    try:
+        action_events.notify(9, {"type": "created", "action": {"id": 1}})
+    finally:
+        action_events.unsubscribe(9, client)
+    assert seen == [9, {"type": "created", "action": {"id": 1}}]
@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+from nicegui import ui
+from nicegui.client import Client
+from nicegui.page import page
+
+from frontend.metrics import MAX_MESSAGES_PER_SECOND, LatencyTracker, TrafficMeter
+from frontend.pages import live_controller
+from frontend.pages.live import PlayerCard
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_latency_tracker_percentiles():
+    tracker = LatencyTracker("test", report_every=0)
+    for ms in range(1, 101):
+        tracker.record(ms / 1000)
+    summary = tracker.summary()
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == 50.0
+    assert summary["p95_ms"] == 95.0
+    assert summary["max_ms"] == 100.0
+
+
+def test_latency_tracker_window_and_timing():
+    clock = FakeClock()
+    tracker = LatencyTracker("test", window=2, report_every=0, clock=clock)
+    for elapsed in (0.5, 0.125, 0.25):
+        started = tracker.start()
+        clock.now += elapsed
+        assert tracker.stop(started) == elapsed
+    assert list(tracker.samples) == [0.125, 0.25]
+    assert tracker.count == 3
+    assert LatencyTracker("empty").percentile(95) == 0.0
+
+
+def test_traffic_meter_rates_and_budget():
+    clock = FakeClock()
+    meter = TrafficMeter(window=10, budget=2, clock=clock)
+    for second in range(10):
+        clock.now = second
+        meter.record("c1", 100)
+    assert meter.rates("c1") == {"messages_per_s": 1.0, "bytes_per_s": 100.0, "peak_messages_per_s": 1}
+    assert meter.within_budget("c1")
+
+    for _ in range(2):
+        meter.record("c1", 50)
+    assert meter.rates("c1")["peak_messages_per_s"] == 3
+    assert not meter.within_budget("c1")
+
+    # old buckets fall out of the window
+    clock.now = 30
+    assert meter.rates("c1")["peak_messages_per_s"] == 0
+    assert meter.within_budget("unknown")
+
+
+def test_clock_broadcasts_fit_message_budget(monkeypatch):
+    # a collaborator's page follows the owner's clock broadcasts with 16 players on the roster
+    monkeypatch.setattr(live_controller, "app", SimpleNamespace(storage=SimpleNamespace(user={})))
+    clock = FakeClock()
+    meter = TrafficMeter(window=10, clock=clock)
+    redraws = []
+    with Client(page("/")) as client:
+        controller = live_controller.LiveController()
+        state = controller.state
+        state.selected_match_data = {"locked_by_user_id": 1, "is_finalized": False}
+        state.clock_display = ui.label(state.formatted_remaining_time)
+        state.active_player_ids = set(range(8))
+        for pid in range(16):
+            state.player_cards[pid] = PlayerCard(
+                {"id": pid, "first_name": "P", "number": pid}, pid < 8, False, True, "00:00", print, print)
+
+        for second in range(1, 31):
+            clock.now = second
+            payload = {"clock_running": True, "clock_seconds": second, "remaining_seconds": 1500 - second,
+                       "period": 1, "locked_by_user_id": 1}
+            if second > 1:
+                state.player_seconds = {pid: second for pid in range(8)}
+            meter.count(client.id, payload)
+            controller.apply_clock_event(payload, lambda: redraws.append("clock"),
+                                         lambda: redraws.append("lock"), lambda: redraws.append("rights"))
+
+    assert redraws == ["clock"]  # only the start rebuilds the clock area, later broadcasts set texts
+    assert state.clock_display.text == "24:30"
+    assert state.player_cards[0].time_label.text == "00:30" and state.player_cards[8].time_label.text == "00:00"
+    assert meter.rates(client.id)["peak_messages_per_s"] <= MAX_MESSAGES_PER_SECOND
+    assert meter.within_budget(client.id)
+
+
+def test_counted_pushes_are_sized_by_their_payload():
+    meter = TrafficMeter(window=1, clock=FakeClock())
+    meter.count("c1", {"clock_seconds": 1})
+    meter.count("c1")
+    assert meter.rates("c1") == {"messages_per_s": 2.0, "bytes_per_s": 24.0, "peak_messages_per_s": 2}
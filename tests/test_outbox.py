@@ -0,0 +1,156 @@
+import asyncio
+
+import frontend.outbox as outbox_module
+from frontend.api import ApiError
+from frontend.outbox import OUTBOX_KEY, Outbox
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_outbox_persists_entries_in_storage():
+    storage = {}
+    outbox = Outbox(storage)
+    entry = outbox.enqueue_action({"match_id": 1, "action": "shot"})
+    assert entry["payload"]["client_id"] == entry["id"]
+
+    restored = Outbox(storage)
+    assert [e["id"] for e in restored.actions_for_match(1)] == [entry["id"]]
+    assert restored.pending_count == 1
+
+
+def test_outbox_keeps_only_latest_playtime_per_match():
+    outbox = Outbox({})
+    outbox.enqueue_playtime(1, {"time_registered_s": 10, "player_time_registered_s": {}})
+    outbox.enqueue_playtime(1, {"time_registered_s": 20, "player_time_registered_s": {}})
+    outbox.enqueue_playtime(2, {"time_registered_s": 5, "player_time_registered_s": {}})
+    assert outbox.pending_count == 2
+
+
+def test_outbox_sends_every_lineup_change_in_order(monkeypatch):
+    outbox = Outbox({})
+    first = outbox.enqueue_lineup(1, {"period": 1, "timestamp": 0, "player_ids": [1, 2]})
+    second = outbox.enqueue_lineup(1, {"period": 1, "timestamp": 90, "player_ids": [1, 3]})
+    sent = []
+
+    async def fake_post(path, payload, token=None):
+        sent.append((path, payload["client_id"]))
+        return {}
+
+    monkeypatch.setattr(outbox_module, "api_post", fake_post)
+    assert asyncio.run(outbox.flush()).sent == 2
+    assert sent == [("/matches/1/lineup", first["id"]), ("/matches/1/lineup", second["id"])]
+    assert outbox.pending_count == 0
+
+
+def test_outbox_flush_removes_stored_and_marks_rejected(monkeypatch):
+    outbox = Outbox({})
+    ok = outbox.enqueue_action({"match_id": 1})
+    bad = outbox.enqueue_action({"match_id": 1})
+
+    async def fake_post(path, payload, token=None):
+        return [
+            {"client_id": ok["id"], "status": 200, "action": {"id": 7}},
+            {"client_id": bad["id"], "status": 403, "detail": "Match is finalized"},
+        ]
+
+    monkeypatch.setattr(outbox_module, "api_post", fake_post)
+    report = asyncio.run(outbox.flush())
+    assert report.sent == 1
+    assert report.stored == [{"id": 7}]
+    assert [e["id"] for e in report.rejected] == [bad["id"]]
+    assert outbox.pending_count == 0
+    assert outbox.failed_count == 1
+
+
+def test_outbox_backs_off_while_offline(monkeypatch):
+    clock = FakeClock()
+    outbox = Outbox({}, base_delay=1.0, max_delay=4.0, clock=clock)
+    outbox.enqueue_action({"match_id": 1})
+    calls = []
+
+    async def failing_post(path, payload, token=None):
+        calls.append(path)
+        raise ApiError("Service unavailable", 503)
+
+    monkeypatch.setattr(outbox_module, "api_post", failing_post)
+    assert asyncio.run(outbox.flush()).offline
+    assert asyncio.run(outbox.flush()).offline  # still inside the backoff window
+    assert len(calls) == 1
+
+    for expected_delay in (2.0, 4.0, 4.0):
+        clock.now = outbox.next_attempt_at
+        asyncio.run(outbox.flush())
+        assert outbox.next_attempt_at - clock.now == expected_delay
+    assert outbox.pending_count == 1
+
+
+def test_switch_toggles_are_queued_as_one_lineup(monkeypatch):
+    from types import SimpleNamespace
+    from frontend.pages import live_controller
+
+    monkeypatch.setattr(live_controller, "app", SimpleNamespace(storage=SimpleNamespace(user={})))
+    monkeypatch.setattr(live_controller, "LINEUP_SETTLE_SECONDS", 0.02)
+    controller = live_controller.LiveController()
+    controller.state.selected_match_id = 1
+    synced = []
+
+    async def scenario():
+        for player_id in range(1, 9):
+            controller.state.active_player_ids.add(player_id)
+            controller.lineup_toggled(lambda: synced.append(True))
+            controller.state.clock_seconds += 1  # the later toggles do not move the change
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    [entry] = controller.outbox.entries
+    assert entry["payload"]["timestamp"] == 0 and entry["payload"]["player_ids"] == list(range(1, 9))
+    assert synced == [True]
+    assert controller.flush_lineup() is None  # nothing left settling
+
+
+def test_tabs_sharing_the_storage_keep_each_others_entries():
+    storage = {}
+    first, second = Outbox(storage), Outbox(storage)
+    a = first.enqueue_action({"match_id": 1, "action": "shot"})
+    b = second.enqueue_action({"match_id": 1, "action": "rebound"})
+    assert [e["id"] for e in storage[OUTBOX_KEY]] == [a["id"], b["id"]]
+
+    first.discard(a["id"])
+    assert [e["id"] for e in storage[OUTBOX_KEY]] == [b["id"]]
+
+    # a tab opened later holds both tabs' entries; what another tab finished is dropped on save
+    third = Outbox(storage)
+    second.discard(b["id"])
+    third.enqueue_playtime(1, {"time_registered_s": 10, "player_time_registered_s": {}})
+    assert [e["kind"] for e in storage[OUTBOX_KEY]] == ["playtime"]
+    assert [e["kind"] for e in third.entries] == ["playtime"]
+
+
+def test_an_entry_in_flight_cannot_be_withdrawn(monkeypatch):
+    outbox = Outbox({})
+    entry = outbox.enqueue_action({"match_id": 1, "action": "shot"})
+    seen = {}
+
+    async def fake_post(path, payload, token=None):
+        seen["withdrawn"] = outbox.withdraw(entry["id"])
+        seen["sending"] = outbox.is_sending(entry["id"])
+        await asyncio.sleep(0.01)
+        return [{"client_id": entry["id"], "status": 200, "action": {"id": 5}}]
+
+    monkeypatch.setattr(outbox_module, "api_post", fake_post)
+
+    async def scenario():
+        flush = asyncio.create_task(outbox.flush())
+        await asyncio.sleep(0)
+        await outbox.wait_for_flush()
+        return (await flush).sent
+
+    assert asyncio.run(scenario()) == 1
+    assert seen == {"withdrawn": None, "sending": True}
+    assert not outbox.is_sending(entry["id"]) and outbox.withdraw(entry["id"]) is None  # it was stored
@@ -0,0 +1,16 @@
+from backend.services.player_rates import _rates_query, per_minutes
+
+
+def test_totals_are_scaled_to_25_minutes_played():
+    rates = per_minutes({"goals": 2, "attempts": 8}, seconds=10 * 60)
+    assert rates == {"goals": 5.0, "attempts": 20.0}
+
+
+def test_no_registered_time_gives_no_rate():
+    assert per_minutes({"goals": 3}, seconds=0) == {"goals": None}
+
+
+def test_rates_are_one_query_joining_action_counts_to_playtime():
+    sql = str(_rates_query([1, 2]))
+    assert sql.count("SELECT") == 2
+    assert "LEFT OUTER JOIN" in sql and "match_player_link" in sql
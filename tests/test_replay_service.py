@@ -0,0 +1,74 @@
+import random
+
+from backend.schema import ActionType
+from backend.services import replay_service
+from backend.services.replay_service import MatchTimeline
+
+
+def _actions(n: int, seed: int = 3) -> list[dict]:
+    rng = random.Random(seed)
+    types = [a.value for a in ActionType]
+    actions = []
+    for i in range(n):
+        is_opponent = rng.random() < 0.1
+        actions.append({
+            "id": i + 1,
+            "period": 1 if i < n // 2 else 2,
+            "timestamp": i * 3,
+            "player_id": None if is_opponent else rng.randint(1, 8),
+            "action": "opponent_goal" if is_opponent else rng.choice(types),
+            "result": rng.random() < 0.4,
+            "is_opponent": is_opponent,
+            "x": None,
+            "y": None,
+        })
+    rng.shuffle(actions)
+    return actions
+
+
+def _naive(actions: list[dict], period: int, t: int) -> tuple[int, dict]:
+    seen = [a for a in actions if (a["period"], a["timestamp"]) <= (period, t)]
+    goals = {}
+    for a in seen:
+        if not a["is_opponent"] and a["result"] and ActionType(a["action"]) in replay_service.GOAL_ACTIONS:
+            goals[a["player_id"]] = goals.get(a["player_id"], 0) + 1
+    return len(seen), goals
+
+
+def test_state_at_matches_a_full_recount_at_every_position():
+    actions = _actions(150)
+    timeline = MatchTimeline(1, actions)
+    for period, t in [(1, -1), (1, 0), (1, 100), (1, 1000), (2, 0), (2, 225), (2, 300), (2, 10_000)]:
+        state = timeline.state_at(period, t)
+        count, goals = _naive(actions, period, t)
+        assert state["position"] == count
+        assert {p["player_id"]: p["goals"] for p in state["players"] if p["goals"]} == goals
+        assert state["team_score"] == sum(goals.values())
+        assert state["opponent_score"] == sum(
+            1 for a in actions if a["is_opponent"] and (a["period"], a["timestamp"]) <= (period, t))
+
+
+def test_recent_actions_are_newest_first():
+    timeline = MatchTimeline(1, _actions(20))
+    recent = timeline.state_at(2, 10_000)["recent_actions"]
+    assert [a["timestamp"] for a in recent] == [57, 54, 51, 48, 45]
+
+
+def test_empty_match():
+    state = MatchTimeline(1, []).state_at(1, 100)
+    assert state["position"] == 0 and state["players"] == [] and state["last_t"] is None
+
+
+def test_the_lineup_is_the_latest_change_up_to_the_moment():
+    timeline = MatchTimeline(1, [], [(2, 1600, [5, 6]), (1, 0, [3, 1, 2]), (1, 300, [1, 2, 4])])
+    assert timeline.state_at(1, 0)["lineup"] == [1, 2, 3]
+    assert timeline.lineup_at(1, 299) == [1, 2, 3]
+    assert timeline.lineup_at(1, 300) == [1, 2, 4]
+    assert timeline.lineup_at(2, 1600) == [5, 6]
+    assert MatchTimeline(1, []).lineup_at(1, 10) == []
+
+
+def test_an_action_change_drops_the_cached_timeline():
+    replay_service._timelines.put(905, MatchTimeline(905, []))
+    replay_service._on_action(905, {"type": "created"})
+    assert 905 not in replay_service._timelines
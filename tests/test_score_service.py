@@ -0,0 +1,113 @@
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.models import Action, Base, Match, Team, User
+from backend.routers.action import edit_action, remove_action
+from backend.schema import ActionCreate, ActionType
+from backend.services.action_service import create_action
+from backend.services.score_service import apply_action_score, efficiency, recompute_match_scores, score_delta
+
+
+def test_score_delta_team_goal():
+    action = SimpleNamespace(is_opponent=False, action=ActionType.SHOT, result=True)
+    assert score_delta(action) == (1, 0)
+
+
+def test_score_delta_missed_or_non_scoring_action():
+    assert score_delta(SimpleNamespace(is_opponent=False, action=ActionType.SHOT, result=False)) == (0, 0)
+    assert score_delta(SimpleNamespace(is_opponent=False, action=ActionType.REBOUND, result=True)) == (0, 0)
+
+
+def test_score_delta_opponent_goal():
+    action = SimpleNamespace(is_opponent=True, action=ActionType.OPPONENT_GOAL, result=True)
+    assert score_delta(action) == (0, 1)
+
+
+def test_efficiency_is_a_rounded_percentage_of_attempts():
+    assert efficiency(1, 3) == 33.3
+    assert efficiency(0, 0) is None
+
+
+def _run_in_db(tmp_path, scenario):
+    """Run ``scenario(engine, session, user, match)`` against a fresh database."""
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'scores.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                team, user = Team(name="T"), User(username="scorer", hashed_password="x")
+                session.add_all([team, user])
+                await session.flush()
+                match = Match(team_id=team.id, opponent_name="O")
+                session.add(match)
+                await session.commit()
+                return await scenario(engine, session, user, match)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+async def _scores(session, match):
+    await session.refresh(match)
+    return match.team_score, match.opponent_score, match.period_scores
+
+
+def _action(match, period=1, **fields):
+    return ActionCreate(**{"match_id": match.id, "timestamp": 5, "period": period, "action": "shot",
+                           "result": True, **fields})
+
+
+def test_create_edit_and_delete_keep_the_counters(tmp_path):
+    async def scenario(engine, session, user, match):
+        seen = []
+        goal, _ = await create_action(session, _action(match), user)
+        await create_action(session, _action(match, period=2, is_opponent=True, action="opponent_goal"), user)
+        seen.append(await _scores(session, match))
+        await edit_action(goal.id, _action(match, result=False), session, user)
+        seen.append(await _scores(session, match))
+        await edit_action(goal.id, _action(match, period=2), session, user)
+        seen.append(await _scores(session, match))
+        await remove_action(goal.id, None, session, user)
+        seen.append(await _scores(session, match))
+        return seen
+
+    assert _run_in_db(tmp_path, scenario) == [
+        (1, 1, {"1": {"team": 1, "opponent": 0}, "2": {"team": 0, "opponent": 1}}),
+        (0, 1, {"1": {"team": 0, "opponent": 0}, "2": {"team": 0, "opponent": 1}}),
+        (1, 1, {"1": {"team": 0, "opponent": 0}, "2": {"team": 1, "opponent": 1}}),
+        (0, 1, {"1": {"team": 0, "opponent": 0}, "2": {"team": 0, "opponent": 1}}),
+    ]
+
+
+def test_a_rolled_back_action_leaves_the_counters_unchanged(tmp_path):
+    async def scenario(engine, session, user, match):
+        await create_action(session, _action(match), user)
+        action = Action(match_id=match.id, timestamp=9, period=1, action=ActionType.SHOT, result=True)
+        session.add(action)
+        await apply_action_score(session, action)
+        await session.rollback()
+        return await _scores(session, match)
+
+    assert _run_in_db(tmp_path, scenario) == (1, 0, {"1": {"team": 1, "opponent": 0}})
+
+
+def test_repair_rebuilds_drifted_counters(tmp_path):
+    async def scenario(engine, session, user, match):
+        await create_action(session, _action(match), user)
+        await create_action(session, _action(match, period=2), user)
+        await create_action(session, _action(match, is_opponent=True, action="opponent_goal"), user)
+        await session.execute(update(Match).values(team_score=7, opponent_score=0, period_scores={}))
+        await session.commit()
+
+        # the startup migration and scripts/repair_scores.py run it on a connection
+        async with engine.begin() as conn:
+            totals = await recompute_match_scores(conn)
+        return totals, await _scores(session, match)
+
+    totals, scores = _run_in_db(tmp_path, scenario)
+    assert list(totals.values()) == [(2, 1)]
+    assert scores == (2, 1, {"1": {"team": 1, "opponent": 1}, "2": {"team": 1, "opponent": 0}})
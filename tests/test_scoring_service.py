@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.services import clock_events
+from backend.services.scoring_service import _int_list, run_command
+
+
+def test_unknown_command_is_rejected_before_touching_the_database():
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(run_command(None, None, 1, {"seq": 1, "type": "undo"}))
+    assert exc.value.status_code == 400
+
+
+def test_player_lists_must_hold_ids():
+    assert _int_list([1, 2], "in") == [1, 2]
+    with pytest.raises(HTTPException):
+        _int_list(["1"], "in")
+    with pytest.raises(HTTPException):
+        _int_list(3, "out")
+
+
+def test_clock_events_remember_the_last_clock_per_match():
+    clock_events.notify(904, {"clock_running": True, "remaining_seconds": 600, "locked_by_user_id": 1})
+    clock_events.notify(904, {"locked_by_user_id": 2})
+    try:
+        assert clock_events.last(904) == {"clock_running": True, "remaining_seconds": 600, "locked_by_user_id": 2}
+    finally:
+        clock_events._last.pop(904)
+
+
+def test_current_clock_advances_the_last_broadcast_while_running(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(clock_events.time, "monotonic", lambda: now[0])
+    try:
+        clock_events.notify(905, {"clock_running": True, "clock_seconds": 60, "remaining_seconds": 1440})
+        now[0] = 103.0
+        assert clock_events.current(905)["clock_seconds"] == 63
+        assert clock_events.last(905)["clock_seconds"] == 60
+
+        # a device pause carries no clock values: the stored ones are frozen at this moment
+        clock_events.notify(905, {"clock_running": False})
+        now[0] = 110.0
+        paused = clock_events.current(905)
+        assert (paused["clock_seconds"], paused["remaining_seconds"]) == (63, 1437)
+
+        clock_events.notify(905, {"clock_running": True})
+        now[0] = 112.0
+        assert clock_events.current(905)["clock_seconds"] == 65
+    finally:
+        clock_events._last.pop(905)
+        clock_events._at.pop(905)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from backend.field import IMAGE_HEIGHT, IMAGE_WIDTH, POSTS, field_to_image, image_to_field, shot_geometry
+from backend.services.shot_zones import RING_LABELS, SECTORS, zone_table
+
+
+def test_the_image_outline_maps_onto_the_field_in_metres():
+    x, y = image_to_field(IMAGE_WIDTH, IMAGE_HEIGHT)
+    assert x == pytest.approx(40, abs=0.01) and y == pytest.approx(20, abs=0.01)
+    assert field_to_image(*image_to_field(500.0, 300.0)) == pytest.approx((500.0, 300.0), abs=0.05)
+
+
+def test_distance_and_angle_are_to_the_nearest_post():
+    (left_x, left_y), (right_x, right_y) = POSTS
+    x = np.array([left_x + 3, left_x - 2, right_x - 4, left_x])
+    y = np.array([left_y, left_y, right_y, left_y + 5])
+    distance, angle = shot_geometry(x, y)
+    assert distance == pytest.approx([3, 2, 4, 5])
+    # in front of either post is towards the centre of the field
+    assert angle == pytest.approx([0, 180, 0, 90])
+
+
+def test_zones_are_counted_per_group_in_one_pass():
+    keys = np.array([7, 7, 7, 9])
+    distance = np.array([1.0, 5.0, 9.0, 1.5])
+    angle = np.array([10.0, 90.0, 170.0, 10.0])
+    made = np.array([True, False, True, True])
+    table = zone_table(keys, distance, angle, made)
+
+    assert set(table) == {7, 9}
+    player = table[7]
+    assert (player["made"], player["attempts"], player["efficiency"]) == (2, 3, 66.7)
+    assert [cell["attempts"] for cell in player["rings"]] == [1, 0, 1, 0, 1]
+    assert [cell["made"] for cell in player["rings"]] == [1, 0, 0, 0, 1]
+    assert [cell["attempts"] for cell in player["sectors"]] == [1, 1, 1]
+    assert len(player["rings"]) == len(RING_LABELS) and len(player["sectors"]) == len(SECTORS)
+    assert table[9]["rings"][0] == {"label": RING_LABELS[0], "made": 1, "attempts": 1, "efficiency": 100.0}
@@ -0,0 +1,104 @@
+import asyncio
+
+from backend.services import action_events, active_players_events, clock_events, spectator_service
+from backend.services.spectator_service import MatchSnapshot
+from frontend import spectators
+from frontend.spectators import SpectatorFeed
+
+
+class FakeBoard:
+    is_deleted = False
+
+    def __init__(self):
+        self.shown = []
+
+    def show(self, texts):
+        self.shown.append(dict(texts))
+
+
+class FakeClient:
+    def __init__(self, id):
+        self.id = id
+
+
+def make_snapshot(match_id):
+    snapshot = MatchSnapshot(match_id)
+    snapshot.players = {1: "Anna Peeters", 2: "Bert Claes"}
+    snapshot.data = {
+        "match_id": match_id, "version": 1, "team_name": "Ganda", "opponent_name": "Boeckenberg",
+        "team_score": 0, "opponent_score": 0, "is_finalized": False,
+        "clock": {"clock_running": False, "remaining_seconds": None, "period": 1, "period_minutes": 25, "total_periods": 2},
+        "lineup": [], "recent_actions": [],
+    }
+    snapshot.built_at = float("inf")
+    spectator_service._snapshots[match_id] = snapshot
+    return snapshot
+
+
+def test_events_become_snapshot_deltas():
+    snapshot = make_snapshot(901)
+    deltas = []
+    spectator_service.add_listener(lambda match_id, delta: deltas.append(delta) if match_id == 901 else None)
+    try:
+        action_events.notify(901, {
+            "type": "created",
+            "action": {"id": 5, "player_id": 1, "period": 1, "timestamp": 60, "action": "shot", "result": True},
+            "score": {"team_score": 1, "opponent_score": 0},
+        })
+        clock_events.notify(901, {"clock_running": True, "remaining_seconds": 1400, "period": 1})
+        clock_events.notify(901, {"locked_by_user_id": 3})  # nothing public changed
+        active_players_events.notify(901, {"player_ids": [2]})
+    finally:
+        spectator_service._listeners.pop()
+        spectator_service._snapshots.pop(901)
+
+    assert [sorted(delta) for delta in deltas] == [
+        ["opponent_score", "recent_actions", "team_score", "version"],
+        ["clock", "version"],
+        ["lineup", "version"],
+    ]
+    assert snapshot.data["recent_actions"][0]["player"] == "Anna Peeters"
+    assert snapshot.data["lineup"] == [{"id": 2, "name": "Bert Claes"}]
+    assert snapshot.data["version"] == deltas[-1]["version"] > 1
+
+
+def test_feed_pushes_only_changed_texts_to_every_board():
+    renders = []
+
+    def render(snapshot):
+        renders.append(snapshot["version"])
+        return {"score": str(snapshot["team_score"]), "clock": str(snapshot["clock"])}
+
+    feed = SpectatorFeed(1, render)
+    feed._refresh_task = object()  # no refresh loop outside of the app
+    feed.replace({"version": 4, "team_score": 0, "clock": "1"})
+    boards = [FakeBoard() for _ in range(3)]
+    for i, board in enumerate(boards):
+        feed.attach(FakeClient(str(i)), board)
+    boards[2].is_deleted = True
+
+    feed.apply({"version": 5, "team_score": 1})
+    feed.replace({"version": 3, "team_score": 0, "clock": "1"})  # older than what was pushed
+
+    assert renders == [4, 5]
+    assert boards[0].shown == [{"score": "0", "clock": "1"}, {"score": "1"}]
+    assert boards[1].shown == boards[0].shown
+    assert feed.board_count == 2
+
+
+def test_feed_shows_deltas_after_the_publishing_call_returns():
+    feed = SpectatorFeed(1, lambda snapshot: {"score": str(snapshot["team_score"])})
+    feed._refresh_task = object()
+    feed.replace({"version": 1, "team_score": 0})
+    board = FakeBoard()
+    feed.attach(FakeClient("a"), board)
+
+    async def scenario():
+        feed.apply({"version": 2, "team_score": 1})
+        feed.apply({"version": 3, "team_score": 2})
+        shown_during_publish = list(board.shown)
+        await asyncio.sleep(spectators.FLUSH_SECONDS * 2)
+        return shown_during_publish
+
+    assert asyncio.run(scenario()) == [{"score": "0"}]
+    assert board.shown == [{"score": "0"}, {"score": "2"}]  # the burst is rendered once
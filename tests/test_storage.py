@@ -0,0 +1,101 @@
+import asyncio
+
+from nicegui.storage import Storage
+
+from frontend import storage
+from frontend.storage import DebouncedWriter, SqlitePersistentDict, _SqliteStore, install_sqlite_storage
+
+
+class CountingDict(dict):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def __setitem__(self, key, value):
+        self.writes += 1
+        super().__setitem__(key, value)
+
+
+def test_debounced_writer_coalesces_changes_within_delay():
+    storage = CountingDict()
+    state = {"period": 1}
+
+    async def scenario():
+        writer = DebouncedWriter(storage, "live_state", lambda: dict(state), delay=0.05)
+        for period in range(1, 6):
+            state["period"] = period
+            writer.schedule()
+        await asyncio.sleep(0.1)
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert storage.writes == 1
+    assert storage["live_state"] == {"period": 5}
+    assert writer.writes == 1
+
+
+def test_debounced_writer_skips_unchanged_values():
+    storage = CountingDict()
+    storage["live_state"] = {"period": 1}
+    storage.writes = 0
+    writer = DebouncedWriter(storage, "live_state", lambda: {"period": 1})
+    writer.schedule()  # outside an event loop the write happens right away
+    writer.flush()
+    assert storage.writes == 0
+
+
+def test_sqlite_persistent_dict_round_trip(tmp_path):
+    path = tmp_path / "storage.db"
+
+    async def write():
+        data = SqlitePersistentDict(path, "user-1", delay=0.01)
+        await data.initialize()
+        data["live_state"] = {"period": 1}
+        data["live_state"] = {"period": 2}
+        data["token"] = "abc"
+        await data.close()
+        return data.store.writes
+
+    assert asyncio.run(write()) == 1
+
+    restored = SqlitePersistentDict(path, "user-1")
+    restored.initialize_sync()
+    assert restored == {"live_state": {"period": 2}, "token": "abc"}
+
+    other = SqlitePersistentDict(path, "user-2")
+    other.initialize_sync()
+    assert other == {}
+
+
+def test_cleared_and_expired_storage_leaves_no_rows(tmp_path, monkeypatch):
+    path = tmp_path / "storage.db"
+    monkeypatch.chdir(tmp_path)
+    # install_sqlite_storage patches the Storage class; restore it after the test
+    monkeypatch.setattr(Storage, "_create_persistent_dict", Storage._create_persistent_dict)
+    monkeypatch.setattr(Storage, "clear", Storage.clear)
+
+    def rows():
+        return [row[0] for row in _SqliteStore.get(path).conn.execute("SELECT id FROM nicegui_storage ORDER BY id")]
+
+    for session_id in ("user-logged-out", "user-kept", "user-stale"):
+        data = SqlitePersistentDict(path, session_id)
+        data["token"] = "abc"  # outside a loop the row is written right away
+    _SqliteStore.get(path).conn.execute("UPDATE nicegui_storage SET updated_at = 0 WHERE id = 'user-stale'")
+    logged_out = SqlitePersistentDict(path, "user-logged-out")
+    logged_out.initialize_sync()
+    logged_out.clear()  # logging out clears the user storage
+    assert rows() == ["user-kept", "user-stale"]
+
+    assert install_sqlite_storage(path, max_age_days=30)
+    assert rows() == ["user-kept"]
+
+    Storage().clear()
+    assert rows() == []
+
+
+def test_sqlite_storage_is_not_installed_on_an_unchecked_nicegui(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage.nicegui, "__version__", "99.0.0")
+    monkeypatch.setattr(Storage, "_create_persistent_dict", Storage._create_persistent_dict)
+    create_default = Storage._create_persistent_dict
+    assert not install_sqlite_storage(tmp_path / "storage.db")
+    assert Storage._create_persistent_dict is create_default
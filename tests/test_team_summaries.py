@@ -0,0 +1,35 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.models import Action, Base, Match, Team, User
+from backend.routers.team import read_team_match_summaries
+from backend.schema import ActionType
+
+
+def test_usernames_with_a_comma_are_kept_whole(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'teams.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                team = Team(name="T")
+                users = [User(username="Peeters, Jan", hashed_password="x"), User(username="an", hashed_password="x")]
+                session.add_all([team, *users])
+                await session.flush()
+                scored, empty = Match(team_id=team.id, opponent_name="O"), Match(team_id=team.id, opponent_name="P")
+                session.add_all([scored, empty])
+                await session.flush()
+                session.add_all([
+                    Action(match_id=scored.id, timestamp=t, period=1, action=ActionType.SHOT, result=False, user_id=user.id)
+                    for t, user in enumerate(users + users)
+                ])
+                await session.commit()
+                return await read_team_match_summaries(team.id, session)
+        finally:
+            await engine.dispose()
+
+    summaries = {s.opponent_name: s for s in asyncio.run(run())}
+    assert summaries["O"].usernames == ["Peeters, Jan", "an"] and summaries["O"].action_count == 4
+    assert summaries["P"].usernames == []
@@ -0,0 +1,58 @@
+from backend.schema import ActionType
+from frontend.voice import VoiceIndex, phonetic_key
+
+PLAYERS = [
+    {"id": 1, "first_name": "Jan", "last_name": "Peeters", "number": 3},
+    {"id": 2, "first_name": "Jens", "last_name": "Pieters", "number": 7},
+    {"id": 3, "first_name": "Kees", "last_name": "Smet", "number": 9},
+    {"id": 4, "first_name": "Thijs", "last_name": "de Vries", "number": 11},
+    {"id": 5, "first_name": "An", "last_name": "Smets", "number": 4},
+]
+
+
+def test_phonetic_key_folds_dutch_spellings():
+    assert phonetic_key("Kees") == phonetic_key("Cees")
+    assert phonetic_key("Thijs") == phonetic_key("Tijs")
+    assert phonetic_key("Peeters") == phonetic_key("Peters")
+    assert phonetic_key("Jan") != phonetic_key("Jen")
+
+
+def test_parse_action_player_result():
+    index = VoiceIndex(PLAYERS)
+    parsed = index.parse("Vrije worp, Pieters: raak!")
+    assert parsed.action.value == ActionType.VRIJWORP
+    assert parsed.result is True
+    assert parsed.player.value == 2
+    assert parsed.player.score == 1.0
+
+    parsed = index.parse("schot jan gemist")
+    assert (parsed.action.value, parsed.player.value, parsed.result) == (ActionType.SHOT, 1, False)
+
+
+def test_similar_names_are_ranked_apart():
+    index = VoiceIndex(PLAYERS)
+    assert [c.value for c in index.match_players("smet")][:2] == [3, 5]
+    assert [c.value for c in index.match_players("smets")][:2] == [5, 3]
+    assert index.match_players("jens")[0].value == 2
+    assert index.match_players("cees")[0].value == 3
+
+
+def test_numbers_and_ambiguity():
+    index = VoiceIndex(PLAYERS)
+    assert index.match_players("nummer zeven")[0].value == 2
+    assert index.match_players("11")[0].value == 4
+    assert VoiceIndex(PLAYERS + [{"id": 6, "first_name": "Bo", "number": 1}]).match_players("één")[0].value == 6
+
+    parsed = index.parse("rebound")
+    assert parsed.action.value == ActionType.REBOUND
+    assert parsed.result is None and not parsed.players
+
+    twins = VoiceIndex(PLAYERS + [{"id": 6, "first_name": "Jan", "last_name": "Smet", "number": 12}])
+    assert twins.parse("schot jan ok").player_is_ambiguous()
+
+
+def test_roster_key_tracks_roster_changes():
+    renamed = [dict(p) for p in PLAYERS]
+    renamed[0]["first_name"] = "Johan"
+    assert VoiceIndex.roster_key(PLAYERS) == VoiceIndex.roster_key([dict(p) for p in PLAYERS])
+    assert VoiceIndex.roster_key(PLAYERS) != VoiceIndex.roster_key(renamed)